@@ -0,0 +1,103 @@
+"""Recall and latency of exact and IVF top-k search over a vector collection.
+
+The corpus is synthetic: unit vectors drawn around random cluster centres,
+shaped like sentence embeddings (384 dimensions by default). Exact search is
+the ground truth; IVF recall@k is reported for a range of ``nprobe`` values,
+along with build time and per-query latency. Collections are saved to a
+temporary directory, or ``--directory``, and searched through their memmapped
+files as the service does.
+
+Usage: python -m benchmarks.index [--items 200000] [--nprobe 4 8 16 32]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from src.models.embedding import ModelName
+from src.services.index import VectorCollection, exact_search, normalize_rows
+
+
+def clustered(n: int, dim: int, centres: np.ndarray, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(len(centres), size=n)
+    return normalize_rows(centres[labels] + 0.08 * rng.standard_normal((n, dim)))
+
+
+def recall(hits: List[List[tuple]], truth: np.ndarray) -> float:
+    return float(
+        np.mean(
+            [
+                len({int(hit[0]) for hit in row} & set(expected)) / len(expected)
+                for row, expected in zip(hits, truth.tolist())
+            ]
+        )
+    )
+
+
+def timed_search(
+    collection: VectorCollection,
+    queries: np.ndarray,
+    k: int,
+    nprobe: Optional[int] = None,
+):
+    # One query per call, as the search route serves them
+    started = time.perf_counter()
+    hits = [collection.search(query[np.newaxis], k, nprobe)[0] for query in queries]
+    return hits, (time.perf_counter() - started) / len(queries) * 1000
+
+
+def run(args: argparse.Namespace, directory: str) -> None:
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((args.clusters, args.dim)) / np.sqrt(args.dim)
+    vectors = clustered(args.items, args.dim, centres, seed=1)
+    queries = clustered(args.queries, args.dim, centres, seed=2)
+    ids = [str(i) for i in range(args.items)]
+    _, truth = exact_search(queries, vectors, args.k)
+
+    for label, ivf_min_size in (("exact", args.items + 1), ("ivf", 0)):
+        collection = VectorCollection(
+            label,
+            ModelName.MINI_L6,
+            Path(directory) / label,
+            ivf_min_size=ivf_min_size,
+        )
+        started = time.perf_counter()
+        collection.add(ids, ids, vectors)
+        collection.train()
+        built = time.perf_counter() - started
+        print(f"{label}: built in {built:.2f}s")
+
+        for nprobe in args.nprobe if label == "ivf" else [None]:
+            hits, latency = timed_search(collection, queries, args.k, nprobe)
+            setting = f"nprobe={nprobe}" if nprobe else "brute force"
+            print(
+                f"  {setting:>12}  recall@{args.k} {recall(hits, truth):.3f}  "
+                f"{latency:7.2f} ms/query"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--directory", default=None)
+    args = parser.parse_args()
+
+    if args.directory:
+        run(args, args.directory)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        run(args, directory)
+
+
+if __name__ == "__main__":
+    main()
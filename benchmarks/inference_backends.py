@@ -0,0 +1,82 @@
+"""Latency and memory of each CPU inference backend.
+
+Every backend is measured in a fresh process so RSS numbers do not bleed into
+each other.
+
+Usage: python -m benchmarks.inference_backends [--model all-MiniLM-L6-v2]
+       python -m benchmarks.inference_backends --stand-in
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from typing import Dict
+
+from src.services.inference import INFERENCE_BACKENDS
+
+BATCH_SIZES = (1, 16, 100)
+
+
+def measure(model: str, backend: str, repeat: int) -> Dict:
+    from src.services.inference import load_model
+    from src.services.metrics import rss_bytes
+
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    encoder = load_model(model, backend)
+    result = {
+        "backend": backend,
+        "load_s": time.perf_counter() - started,
+        "rss_mb": rss_bytes() / 2**20,
+        "load_rss_mb": (rss_bytes() - rss_before) / 2**20,
+    }
+    for batch_size in BATCH_SIZES:
+        texts = [f"keyword number {i}" for i in range(batch_size)]
+        encoder.encode(texts)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            encoder.encode(texts)
+            timings.append(time.perf_counter() - started)
+        result[f"p50_ms@{batch_size}"] = statistics.median(timings) * 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--stand-in", action="store_true", help="use the tiny model")
+    parser.add_argument("--backends", default=",".join(INFERENCE_BACKENDS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    model = args.model
+    if args.stand_in:
+        from benchmarks.stand_in import build_stand_in_model
+
+        model = build_stand_in_model(tempfile.mkdtemp())
+
+    context = multiprocessing.get_context("spawn")
+    columns = None
+    for backend in args.backends.split(","):
+        with context.Pool(1) as pool:
+            try:
+                result = pool.apply(measure, (model, backend, args.repeat))
+            except Exception as e:
+                print(f"{backend:>6} unavailable: {e}")
+                continue
+        if columns is None:
+            columns = list(result)
+            print(" ".join(f"{column:>13}" for column in columns))
+        print(
+            " ".join(
+                f"{value:>13.1f}" if isinstance(value, float) else f"{value:>13}"
+                for value in result.values()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
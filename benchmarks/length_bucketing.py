@@ -0,0 +1,86 @@
+"""Encoding time of mixed-length requests, with and without length bucketing.
+
+Each request holds mostly one to four word keywords plus a few sentences,
+the case where padding every batch to its longest member hurts most.
+
+Usage: python -m benchmarks.length_bucketing [--model all-MiniLM-L6-v2]
+       python -m benchmarks.length_bucketing --stand-in
+"""
+
+import argparse
+import random
+import tempfile
+import timeit
+from typing import List
+
+import numpy as np
+
+from src.services.bucketing import encode_bucketed
+
+WORDS = (
+    "the of and to in is for on with vector search model token embedding "
+    "keyword sentence document cluster index query"
+).split()
+REQUEST_SIZES = (16, 64, 256)
+
+
+def mixed_texts(count: int, sentence_share: float, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(
+            rng.choices(
+                WORDS,
+                k=(
+                    rng.randint(20, 60)
+                    if rng.random() < sentence_share
+                    else rng.randint(1, 4)
+                ),
+            )
+        )
+        for _ in range(count)
+    ]
+
+
+def per_request_ms(run, repeat: int) -> float:
+    run()
+    return min(timeit.repeat(run, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--stand-in", action="store_true", help="use the tiny model")
+    parser.add_argument("--sentences", type=float, default=0.1)
+    parser.add_argument("--cap", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    model = args.model
+    if args.stand_in:
+        from benchmarks.stand_in import build_stand_in_model
+
+        model = build_stand_in_model(tempfile.mkdtemp())
+    encoder = SentenceTransformer(model, device="cpu")
+
+    print(
+        f"{'texts':>6} {'encode ms':>10} {'bucketed ms':>12} "
+        f"{'cap ' + str(args.cap) + ' ms':>10} {'speedup':>8} {'max diff':>9}"
+    )
+    for size in REQUEST_SIZES:
+        texts = mixed_texts(size, args.sentences)
+        baseline = per_request_ms(lambda: encoder.encode(texts), args.repeat)
+        bucketed = per_request_ms(lambda: encode_bucketed(encoder, texts), args.repeat)
+        capped = per_request_ms(
+            lambda: encode_bucketed(encoder, texts, args.cap), args.repeat
+        )
+        diff = np.abs(encoder.encode(texts) - encode_bucketed(encoder, texts)).max()
+        print(
+            f"{size:>6} {baseline:>10.1f} {bucketed:>12.1f} {capped:>10.1f} "
+            f"{baseline / bucketed:>7.1f}x {diff:>9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
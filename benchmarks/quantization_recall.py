@@ -0,0 +1,131 @@
+"""Top-k recall and size of each compact output mode against fp32 neighbours.
+
+Queries and corpus are disjoint sets of two-word phrases built from the
+calibration vocabulary. The random stand-in model puts every text in a narrow
+cone (mean cosine ~0.96), so its recall only smoke-tests the pipeline; use a
+real model for numbers worth comparing.
+
+Usage: python -m benchmarks.quantization_recall [--model all-MiniLM-L6-v2]
+       python -m benchmarks.quantization_recall --stand-in
+"""
+
+import argparse
+import itertools
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from src.services.quantization import (
+    CALIBRATION_TEXTS,
+    calibrate,
+    hamming_distances,
+    quantize_binary,
+    quantize_int8,
+    truncate,
+)
+
+
+def phrases(count: int, seed: int) -> List[str]:
+    words = [text for text in CALIBRATION_TEXTS if " " not in text]
+    pairs = [f"{a} {b}" for a, b in itertools.permutations(words, 2)]
+    rng = np.random.default_rng(seed)
+    return [pairs[i] for i in rng.choice(len(pairs), size=count, replace=False)]
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row."""
+    return np.argpartition(-scores, k, axis=1)[:, :k]
+
+
+def recall(found: np.ndarray, expected: np.ndarray) -> float:
+    hits = [len(set(a) & set(b)) for a, b in zip(found.tolist(), expected.tolist())]
+    return sum(hits) / expected.size
+
+
+def modes(
+    corpus: np.ndarray, calibration: np.ndarray
+) -> Dict[str, Tuple[Callable[[np.ndarray], np.ndarray], int]]:
+    """Scoring function and bytes per vector of every mode."""
+    dim = corpus.shape[1]
+
+    def float_mode(dtype):
+        stored = corpus.astype(dtype)
+        return (
+            lambda queries: queries.astype(dtype) @ stored.T,
+            dim * np.dtype(dtype).itemsize,
+        )
+
+    def int8_mode():
+        ranges = calibrate(calibration)
+        stored = quantize_int8(corpus, ranges).astype(np.int32)
+        return (
+            lambda queries: quantize_int8(queries, ranges).astype(np.int32) @ stored.T,
+            dim,
+        )
+
+    def binary_mode():
+        stored = quantize_binary(corpus)
+        return (
+            lambda queries: -hamming_distances(quantize_binary(queries), stored),
+            stored.shape[1],
+        )
+
+    def truncated_mode(dimensions):
+        stored = truncate(corpus, dimensions)
+        return (
+            lambda queries: truncate(queries, dimensions) @ stored.T,
+            dimensions * 4,
+        )
+
+    result = {
+        "float16": float_mode(np.float16),
+        "int8": int8_mode(),
+        "binary": binary_mode(),
+    }
+    for divisor in (2, 4):
+        result[f"truncate-{dim // divisor}"] = truncated_mode(dim // divisor)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--stand-in", action="store_true", help="use the tiny model")
+    parser.add_argument("--corpus", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    model_name = args.model
+    if args.stand_in:
+        from benchmarks.stand_in import build_stand_in_model
+
+        model_name = build_stand_in_model(tempfile.mkdtemp())
+
+    from src.services.inference import load_model
+
+    model = load_model(model_name)
+    texts = phrases(args.corpus + args.queries, seed=0)
+
+    def encode(batch: List[str]) -> np.ndarray:
+        vectors = np.asarray(model.encode(batch), dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    queries, corpus = encode(texts[: args.queries]), encode(texts[args.queries :])
+    calibration = encode(list(CALIBRATION_TEXTS))
+    expected = top_k(queries @ corpus.T, args.k)
+    fp32_bytes = corpus.shape[1] * 4
+
+    print(f"{'mode':>14} {'bytes':>8} {'smaller':>8} {f'recall@{args.k}':>10}")
+    print(f"{'float32':>14} {fp32_bytes:>8} {1:>7.0f}x {1:>10.3f}")
+    for name, (score, nbytes) in modes(corpus, calibration).items():
+        found = top_k(score(queries).astype(np.float64), args.k)
+        print(
+            f"{name:>14} {nbytes:>8} {fp32_bytes / nbytes:>7.0f}x "
+            f"{recall(found, expected):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
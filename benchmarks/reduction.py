@@ -0,0 +1,40 @@
+"""Per-request cost of the PCA + min-max step, sklearn vs the NumPy engine.
+
+Usage: python -m benchmarks.reduction [--dims 384] [--repeat 200]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from src.services.reduction import NumpyReducer, SklearnReducer
+
+SIZES = (2, 10, 50, 100)
+
+
+def per_request_us(reducer, embeddings: np.ndarray, repeat: int) -> float:
+    def run():
+        reducer.normalize(reducer.reduce(embeddings)).tolist()
+
+    run()
+    return min(timeit.repeat(run, number=1, repeat=repeat)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dims", type=int, default=384)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'points':>6} {'sklearn us':>12} {'numpy us':>10} {'speedup':>8}")
+    for size in SIZES:
+        embeddings = rng.standard_normal((size, args.dims)).astype(np.float32)
+        baseline = per_request_us(SklearnReducer(), embeddings, args.repeat)
+        fast = per_request_us(NumpyReducer(), embeddings, args.repeat)
+        print(f"{size:>6} {baseline:>12.1f} {fast:>10.1f} {baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Per-request CPU of the /keywords request and response handling.
+
+Compares the previous path (FastAPI body validation into ``Keywords``, one
+``EmbeddedKeyword`` per word, ``response_model`` re-validation) with the fast
+path (TypeAdapter ``validate_json`` plus direct rendering from the points).
+Both routes are driven through the ASGI app with the model work stubbed out,
+so the difference is the serialization overhead alone.
+
+Usage: python -m benchmarks.serialization [--keywords 100] [--repeat 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, MutableMapping
+
+from fastapi import Depends, FastAPI, status
+
+from src.models.embedding import EmbeddedKeyword, Embeddings, Keywords
+from src.routes.embedding import KEYWORDS_BODY, keywords_body
+from src.services.serialization import FastJSONResponse, orjson, render_embeddings
+
+
+def build_app(points: List[List[float]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/legacy", response_model=Embeddings, status_code=status.HTTP_201_CREATED)
+    async def legacy(keywords: Keywords):
+        return Embeddings(
+            keywords=[
+                EmbeddedKeyword(word=word, x=x, y=y)
+                for word, (x, y) in zip(keywords.keywords, points)
+            ]
+        )
+
+    @app.post(
+        "/fast",
+        response_model=Embeddings,
+        response_class=FastJSONResponse,
+        status_code=status.HTTP_201_CREATED,
+        openapi_extra=KEYWORDS_BODY.openapi,
+    )
+    async def fast(keywords: Keywords = Depends(keywords_body)):
+        return FastJSONResponse(
+            render_embeddings(keywords.keywords, points),
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    return app
+
+
+async def call(app: FastAPI, path: str, body: bytes) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    chunks: List[bytes] = []
+
+    async def receive() -> MutableMapping[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: MutableMapping[str, Any]) -> None:
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def per_request_us(app: FastAPI, path: str, body: bytes, repeat: int) -> float:
+    for _ in range(50):
+        await call(app, path, body)
+    started = time.process_time()
+    for _ in range(repeat):
+        await call(app, path, body)
+    return (time.process_time() - started) / repeat * 1e6
+
+
+async def run(n_keywords: int, repeat: int) -> None:
+    rng = random.Random(0)
+    keywords = [f"keyword {i} {rng.random():.6f}" for i in range(n_keywords)]
+    points = [[rng.random(), rng.random()] for _ in keywords]
+    body = json.dumps({"keywords": keywords}).encode()
+    app = build_app(points)
+
+    legacy_out = json.loads(await call(app, "/legacy", body))
+    fast_out = json.loads(await call(app, "/fast", body))
+    assert legacy_out == fast_out, "fast path changed the payload"
+
+    legacy = await per_request_us(app, "/legacy", body, repeat)
+    fast = await per_request_us(app, "/fast", body, repeat)
+    print(f"keywords: {n_keywords}, orjson: {orjson is not None}")
+    print(f"{'legacy':>8} {legacy:>9.1f} us/request")
+    print(f"{'fast':>8} {fast:>9.1f} us/request")
+    print(f"{'saved':>8} {legacy - fast:>9.1f} us/request ({legacy / fast:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.keywords, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
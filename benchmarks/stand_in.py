@@ -0,0 +1,60 @@
+"""Tiny randomly initialised sentence-transformers model for offline runs.
+
+It has the same module layout as the MiniLM/MPNet models (BERT encoder plus
+mean pooling), only small enough to build in a second without network access.
+"""
+
+import string
+from pathlib import Path
+from typing import Union
+
+VOCAB = (
+    ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    + list(string.ascii_lowercase + string.digits)
+    + ["##" + char for char in string.ascii_lowercase + string.digits]
+    + ["the", "of", "and", "to", "in", "is", "for", "on", "with"]
+)
+
+
+def build_stand_in_model(
+    directory: Union[str, Path],
+    hidden_size: int = 64,
+    num_layers: int = 2,
+    max_seq_length: int = 128,
+    seed: int = 0,
+) -> str:
+    """Build and save the stand-in model, returning a path SentenceTransformer loads."""
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    directory = Path(directory)
+    encoder_dir = directory / "encoder"
+    model_dir = directory / "model"
+    if model_dir.exists():
+        return str(model_dir)
+    encoder_dir.mkdir(parents=True, exist_ok=True)
+
+    vocab_file = encoder_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(VOCAB))
+    BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(encoder_dir)
+
+    torch.manual_seed(seed)
+    encoder = BertModel(
+        BertConfig(
+            vocab_size=len(VOCAB),
+            hidden_size=hidden_size,
+            num_hidden_layers=num_layers,
+            num_attention_heads=max(1, hidden_size // 32),
+            intermediate_size=hidden_size * 4,
+            max_position_embeddings=max_seq_length,
+        )
+    )
+    encoder.save_pretrained(encoder_dir)
+
+    transformer = models.Transformer(str(encoder_dir), max_seq_length=max_seq_length)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension())
+    SentenceTransformer(modules=[transformer, pooling], device="cpu").save(
+        str(model_dir)
+    )
+    return str(model_dir)
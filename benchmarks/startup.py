@@ -0,0 +1,74 @@
+"""Cold-start cost of the app: import time and RSS of ``src.main``.
+
+Each run imports the app in a fresh interpreter. Exits non-zero when the median
+import time or the peak RSS goes over budget, or when the ML stack is imported
+before any model is requested.
+
+Usage: python -m benchmarks.startup [--max-import-s 1.5] [--max-rss-mb 150]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "sklearn", "numpy")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - started
+from src.services.metrics import rss_bytes
+print(json.dumps({{
+    "import_s": elapsed,
+    "rss_mb": rss_bytes() / 2**20,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_once() -> Dict:
+    env = {"ENV_STATE": "test", **os.environ}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-s", type=float, default=1.5)
+    parser.add_argument("--max-rss-mb", type=float, default=150.0)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    import_s = statistics.median(run["import_s"] for run in runs)
+    rss_mb = max(run["rss_mb"] for run in runs)
+    heavy = sorted({module for run in runs for module in run["heavy"]})
+
+    print(f"import src.main: {import_s:.3f}s (budget {args.max_import_s}s)")
+    print(f"rss after import: {rss_mb:.1f} MB (budget {args.max_rss_mb} MB)")
+    print(f"ML modules imported: {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if import_s > args.max_import_s:
+        failures.append("import time over budget")
+    if rss_mb > args.max_rss_mb:
+        failures.append("RSS over budget")
+    if heavy:
+        failures.append("ML stack imported at startup")
+    if failures:
+        sys.exit("FAIL: " + ", ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
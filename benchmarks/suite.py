@@ -0,0 +1,269 @@
+"""Offline microbenchmarks of the embedding and rate-limiting hot paths.
+
+Everything runs in-process against the stand-in model, so no network access
+or model download is needed. Results are written as JSON; given a baseline
+result, the run exits non-zero when a case got slower than the threshold
+allows. Cases are compared on their fastest round, the least noisy estimate
+on a shared machine.
+
+Usage: python -m benchmarks.suite [--output results.json] [--filter create]
+       python -m benchmarks.suite --baseline baseline.json [--threshold 0.25]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from unittest import mock
+
+import numpy as np
+
+from src.security.rateLimiter.backends import RateLimiterBackend
+
+BATCH_SIZES = (1, 8, 32, 128)
+POINT_COUNTS = (10, 100, 1000)
+WORDS = (
+    "vector search model token embedding keyword sentence document cluster "
+    "index query projection basis cache batch stream"
+).split()
+
+Case = Tuple[str, Callable[[], Any]]
+
+
+class InProcessBackend(RateLimiterBackend):
+    """The fixed window of the Lua script, kept in a dict."""
+
+    def __init__(self) -> None:
+        self.windows: Dict[str, List[float]] = {}
+
+    async def eval_limiter(self, key, times, milliseconds, lua_sha, lua_script):
+        now = time.monotonic() * 1000
+        window = self.windows.get(key)
+        if window is None or window[1] <= now:
+            self.windows[key] = [1, now + milliseconds]
+            return 0
+        if window[0] + 1 > times:
+            return int(window[1] - now)
+        window[0] += 1
+        return 0
+
+    async def load_script(self, lua_script: str) -> str:
+        return "in-process"
+
+
+def keywords(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(1, 3))) for _ in range(count)]
+
+
+def embedding_service(model_path: str) -> Any:
+    """An EmbeddingService whose model is the stand-in instead of a download."""
+    from src.models.embedding import ModelName
+    from src.services.embedding import EmbeddingService
+    from src.services.inference import load_model
+
+    with mock.patch(
+        "src.services.embedding.load_model",
+        lambda name, backend: load_model(model_path, backend),
+    ):
+        return EmbeddingService(ModelName.MINI_L6)
+
+
+def embedding_cases(service: Any) -> Iterator[Case]:
+    from src.services.serialization import (
+        render_columnar,
+        render_embeddings,
+        render_packed,
+    )
+
+    def serialize_model(normalized: List, words: List[str]) -> str:
+        return service.get_embeddings(normalized, words).model_dump_json()
+
+    for size in BATCH_SIZES:
+        yield f"create_embeddings[{size}]", partial(
+            service.create_embeddings, keywords(size)
+        )
+
+    rng = np.random.default_rng(0)
+    for count in POINT_COUNTS:
+        words = keywords(count)
+        # MiniLM-sized vectors, the stand-in's own are much smaller
+        embeddings = rng.standard_normal((count, 384)).astype(np.float32)
+        reduced = service.reduce_dimensions(embeddings)
+        normalized = service.get_normalized_list(reduced)
+        points = np.asarray(normalized)
+        yield f"reduce_dimensions[{count}]", partial(
+            service.reduce_dimensions, embeddings
+        )
+        yield f"get_normalized_list[{count}]", partial(
+            service.get_normalized_list, reduced
+        )
+        yield f"get_embeddings[{count}]", partial(
+            service.get_embeddings, normalized, words
+        )
+        yield f"serialize_model[{count}]", partial(serialize_model, normalized, words)
+        yield f"serialize_objects[{count}]", partial(render_embeddings, words, points)
+        yield f"serialize_columnar[{count}]", partial(render_columnar, words, points)
+        yield f"serialize_base64[{count}]", partial(render_packed, words, points)
+
+
+def rate_limiter_cases(loop: asyncio.AbstractEventLoop) -> Iterator[Case]:
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    from src.main import app
+    from src.security.rateLimiter import FastAPILimiter
+    from src.security.rateLimiter.depends import RateLimiter
+
+    loop.run_until_complete(FastAPILimiter.init(backend=InProcessBackend()))
+    limiter = RateLimiter(times=10**9, seconds=60)
+    request = Request(
+        {
+            "type": "http",
+            "app": app,
+            "method": "POST",
+            "path": "/v1/embedding/keywords",
+            "headers": [(b"x-forwarded-for", b"10.0.0.1")],
+            "client": ("127.0.0.1", 1234),
+        }
+    )
+    response = Response()
+    yield "rate_limiter_call", lambda: limiter(request, response)
+
+
+def measure(
+    fn: Callable[[], Any], repeat: int, loop: asyncio.AbstractEventLoop
+) -> Dict:
+    """Per-call time over ``repeat`` rounds, each long enough to time reliably."""
+    if asyncio.iscoroutine(probe := fn()):
+        probe.close()
+
+        async def rounds(number: int) -> float:
+            started = time.perf_counter()
+            for _ in range(number):
+                await fn()
+            return time.perf_counter() - started
+
+        number = 1
+        while loop.run_until_complete(rounds(number)) < 0.02:
+            number *= 10
+        times = [loop.run_until_complete(rounds(number)) for _ in range(repeat)]
+    else:
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        times = timer.repeat(repeat=repeat, number=number)
+    per_call = sorted(elapsed / number * 1e6 for elapsed in times)
+    return {
+        "median_us": statistics.median(per_call),
+        "min_us": per_call[0],
+        "max_us": per_call[-1],
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_suite(model_path: str, repeat: int = 5, pattern: str = "") -> Dict[str, Dict]:
+    """Median, min and max microseconds per call of every case matching ``pattern``."""
+    loop = asyncio.new_event_loop()
+    service = embedding_service(model_path)
+    try:
+        cases = list(embedding_cases(service)) + list(rate_limiter_cases(loop))
+        results = {}
+        for name, fn in cases:
+            if pattern in name:
+                results[name] = measure(fn, repeat, loop)
+                print(f"{name:<28} {results[name]['median_us']:>12.1f} us")
+        return results
+    finally:
+        service.close()
+        loop.close()
+
+
+def environment() -> Dict:
+    try:
+        import torch
+
+        torch_info = {
+            "torch": torch.__version__,
+            "torch_threads": torch.get_num_threads(),
+        }
+    except ImportError:
+        torch_info = {}
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        **torch_info,
+    }
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> List[Dict]:
+    """Fastest round of every case against the baseline, as current / baseline."""
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append({"case": name, "status": "new"})
+            continue
+        ratio = result["min_us"] / before["min_us"]
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        rows.append({"case": name, "ratio": ratio, "status": status})
+    rows.extend(
+        {"case": name, "status": "missing"} for name in baseline if name not in results
+    )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a previous --output")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--filter", default="", help="only cases containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from benchmarks.stand_in import build_stand_in_model
+
+    model_path = build_stand_in_model(tempfile.mkdtemp())
+    results = run_suite(model_path, args.repeat, args.filter)
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        baseline = {
+            name: result for name, result in baseline.items() if args.filter in name
+        }
+        rows = compare(results, baseline, args.threshold)
+        print(f"\n{'case':<28} {'ratio':>7}  status")
+        for row in rows:
+            ratio = f"{row['ratio']:.2f}" if "ratio" in row else "-"
+            print(f"{row['case']:<28} {ratio:>7}  {row['status']}")
+        regressions = [row["case"] for row in rows if row["status"] == "regression"]
+        if regressions:
+            sys.exit(f"FAIL: slower than baseline: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
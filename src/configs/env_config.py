@@ -1,6 +1,6 @@
 import pathlib
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,6 +22,66 @@ class GlobalConfig(BaseConfig):
     ALLOWED_HOSTS: str = ""
     REDIS_URL: Optional[str] = None
     VALKEY_URL: Optional[str] = None
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 2.0
+    EMBEDDING_BATCH_MAX_SIZE: int = 128
+    # Rows per forward pass; each batch only holds texts of similar token length
+    EMBEDDING_ENCODE_BATCH_SIZE: int = 32
+    # Token cap for everything embedded outside document mode, None for the
+    # model's max_seq_length; part of the cache keys and the store directory
+    EMBEDDING_KEYWORD_MAX_SEQ_LENGTH: Optional[int] = None
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    EMBEDDING_SHARED_CACHE_ENABLED: bool = False
+    EMBEDDING_SHARED_CACHE_NAMESPACE: str = "v1"
+    EMBEDDING_SHARED_CACHE_TTL: int = 7 * 24 * 3600
+    EMBEDDING_STORE_DIR: Optional[str] = None
+    EMBEDDING_REDUCER: str = "numpy"
+    # Thread and executor sizes left as None are derived from the CPUs, the
+    # cgroup quota and the server workers sharing them (see runtime_config)
+    EMBEDDING_SERVER_WORKERS: Optional[int] = None
+    EMBEDDING_EXECUTOR_WORKERS: Optional[int] = None
+    EMBEDDING_TORCH_THREADS: Optional[int] = None
+    EMBEDDING_TORCH_INTEROP_THREADS: Optional[int] = None
+    EMBEDDING_CPU_AFFINITY: bool = False
+    EMBEDDING_PROCESS_WORKERS: int = 0
+    EMBEDDING_PROCESS_THREADS: Optional[int] = None
+    EMBEDDING_DEFAULT_BACKEND: str = "torch"
+    # Per-model override as JSON, e.g. {"all-MiniLM-L6-v2": "int8"}
+    EMBEDDING_BACKENDS: Dict[str, str] = {}
+    # ONNX exports are saved here and reused, None for ~/.cache/ai-toolbox/onnx
+    EMBEDDING_ONNX_CACHE_DIR: Optional[str] = None
+    EMBEDDING_PRELOAD_MODELS: str = ""
+    EMBEDDING_WARMUP_BATCH_SIZES: List[int] = [1, 8, 32]
+    EMBEDDING_MODEL_MEMORY_BUDGET_MB: int = 2048
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_MAX_QUEUE: int = 16
+    EMBEDDING_MAX_QUEUE_WAIT_S: float = 5.0
+    EMBEDDING_STREAM_CHUNK_SIZE: int = 256
+    EMBEDDING_STREAM_MAX_KEYWORDS: int = 1_000_000
+    EMBEDDING_STREAM_SPOOL_DIR: Optional[str] = None
+    EMBEDDING_JOB_DIR: Optional[str] = None
+    EMBEDDING_JOB_WORKERS: int = 1
+    EMBEDDING_JOB_CHUNK_SIZE: int = 1024
+    # A running job whose worker stops renewing this lease goes back to the queue
+    EMBEDDING_JOB_LEASE_S: float = 60.0
+    EMBEDDING_JOB_MAX_KEYWORDS: int = 10_000_000
+    EMBEDDING_CALIBRATION_DIR: Optional[str] = None
+    # "fit" fits a PCA per request, "basis" projects onto a stored per-model basis
+    EMBEDDING_PROJECTION: str = "fit"
+    EMBEDDING_BASIS_DIR: Optional[str] = None
+    # Text file with one reference term per line to fit the bases on, None for
+    # the built-in corpus; clear EMBEDDING_BASIS_DIR after changing it
+    EMBEDDING_BASIS_VOCABULARY_FILE: Optional[str] = None
+    # Fraction of the reference range added on each side before clipping
+    EMBEDDING_BASIS_MARGIN: float = 0.1
+    EMBEDDING_INDEX_DIR: Optional[str] = None
+    EMBEDDING_INDEX_IVF_MIN_SIZE: int = 50_000
+    EMBEDDING_INDEX_NPROBE: int = 16
+    EMBEDDING_SIMILARITY_BLOCK_MB: int = 64
+    # Sparse similarity requests that would return more pairs are rejected
+    EMBEDDING_SIMILARITY_MAX_PAIRS: int = 1_000_000
+    EMBEDDING_DOCUMENT_OVERLAP_TOKENS: int = 32
+    EMBEDDING_DOCUMENT_BATCH_SIZE: int = 32
+    EMBEDDING_DOCUMENT_MAX_CHUNKS: int = 10_000
 
     @property
     def get_allowed_hosts(self) -> list[str]:
@@ -31,6 +91,14 @@ class GlobalConfig(BaseConfig):
             else []
         )
 
+    @property
+    def get_preload_models(self) -> list[str]:
+        return (
+            [model.strip() for model in self.EMBEDDING_PRELOAD_MODELS.split(",")]
+            if self.EMBEDDING_PRELOAD_MODELS
+            else []
+        )
+
 
 class DevConfig(GlobalConfig):
     ENV_STATE: str = "dev"
@@ -0,0 +1,178 @@
+import logging
+import math
+import os
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import IO, Dict, List, Optional
+
+from src.configs.env_config import config
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Settings applied by configure_runtime, and the lock file holding this
+# worker's CPU slot for as long as the process lives
+_settings: Optional["RuntimeSettings"] = None
+_slot_lock: Optional[IO] = None
+_slot: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class RuntimeSettings:
+    cpus: int
+    cpu_quota: Optional[float]
+    workers: int
+    worker_cpus: int
+    torch_threads: int
+    torch_interop_threads: int
+    executor_workers: int
+    process_threads: Optional[int]
+    affinity: Optional[List[int]] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on, honouring an inherited affinity mask."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """CPUs granted by the cgroup CFS quota (v2, then v1), None when unlimited."""
+    try:
+        max_quota, max_period = (root / "cpu.max").read_text().split()
+        if max_quota == "max":
+            return None
+        return int(max_quota) / int(max_period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota_us = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period_us = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return quota_us / period_us if quota_us > 0 and period_us > 0 else None
+
+
+def server_workers() -> int:
+    """Worker processes sharing the node, as uvicorn and gunicorn read them."""
+    if config.EMBEDDING_SERVER_WORKERS:
+        return config.EMBEDDING_SERVER_WORKERS
+    try:
+        return max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+    except ValueError:
+        return 1
+
+
+def plan_runtime(cpus: int, quota: Optional[float], workers: int) -> RuntimeSettings:
+    """Split the node's CPU budget evenly between the server workers.
+
+    Each worker's share is divided between its executor threads, so
+    concurrent encodes never ask for more torch threads than the share;
+    worker processes split it the same way. Inter-op parallelism is off by
+    default since one encode is a single graph. Explicit settings win.
+    """
+    budget = cpus if quota is None else max(1, min(cpus, math.ceil(quota)))
+    worker_cpus = max(1, budget // workers)
+    executor_workers = config.EMBEDDING_EXECUTOR_WORKERS or min(2, worker_cpus)
+    process_threads = config.EMBEDDING_PROCESS_THREADS
+    if process_threads is None and config.EMBEDDING_PROCESS_WORKERS > 0:
+        process_threads = max(1, worker_cpus // config.EMBEDDING_PROCESS_WORKERS)
+    return RuntimeSettings(
+        cpus=cpus,
+        cpu_quota=quota,
+        workers=workers,
+        worker_cpus=worker_cpus,
+        torch_threads=config.EMBEDDING_TORCH_THREADS
+        or max(1, worker_cpus // executor_workers),
+        torch_interop_threads=config.EMBEDDING_TORCH_INTEROP_THREADS or 1,
+        executor_workers=executor_workers,
+        process_threads=process_threads,
+    )
+
+
+def claim_cpu_slot(workers: int, directory: Optional[Path] = None) -> Optional[int]:
+    """Index of the first free worker slot on this node, None if all are taken.
+
+    Each slot is an exclusive lock on a file; the kernel drops it when the
+    process exits, so a restarted worker takes over the slot of the one it
+    replaces.
+    """
+    global _slot_lock, _slot
+    import fcntl
+
+    if _slot_lock is not None:
+        return _slot
+
+    directory = directory or Path(tempfile.gettempdir()) / "ai-toolbox-cpu-slots"
+    directory.mkdir(parents=True, exist_ok=True)
+    for slot in range(workers):
+        handle = open(directory / f"slot-{slot}.lock", "w")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            continue
+        _slot_lock, _slot = handle, slot
+        return slot
+    return None
+
+
+def configure_torch(settings: Optional[RuntimeSettings] = None) -> None:
+    """Apply the thread settings to torch, once it is loaded."""
+    settings = settings or _settings
+    if settings is None or "torch" not in sys.modules:
+        return
+    import torch
+
+    torch.set_num_threads(settings.torch_threads)
+    try:
+        torch.set_num_interop_threads(settings.torch_interop_threads)
+    except RuntimeError:
+        # Only allowed before the first inter-op work, kept from the first call
+        pass
+
+
+def configure_runtime() -> RuntimeSettings:
+    """Size threads and executors for this worker's share of the node's CPUs.
+
+    Torch is not imported here: thread counts go to the OpenMP/BLAS
+    environment for a later import, unless the operator already set them
+    there, and are set on torch itself when a model loads, or right away if
+    it already has.
+    """
+    global _settings
+    cpus = available_cpus()
+    settings = plan_runtime(len(cpus), cgroup_cpu_quota(), server_workers())
+    if config.EMBEDDING_CPU_AFFINITY and hasattr(os, "sched_setaffinity"):
+        slot = claim_cpu_slot(settings.workers)
+        if slot is None:
+            logger.warning("No free CPU slot, leaving the affinity unchanged")
+        else:
+            share = cpus[
+                slot * settings.worker_cpus : (slot + 1) * settings.worker_cpus
+            ]
+            if share:
+                os.sched_setaffinity(0, share)
+                settings = replace(settings, affinity=share)
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(settings.torch_threads))
+    _settings = settings
+    configure_torch(settings)
+    logger.info(f"Runtime settings: {settings.to_dict()}")
+    return settings
+
+
+def get_runtime_settings() -> RuntimeSettings:
+    """The applied settings, or the plan for this process if none were applied."""
+    if _settings is not None:
+        return _settings
+    return plan_runtime(len(available_cpus()), cgroup_cpu_quota(), server_workers())
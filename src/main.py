@@ -1,24 +1,40 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 import redis.asyncio as redis
 import valkey
 from asgi_correlation_id import CorrelationIdMiddleware
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import JSONResponse
 
 from src.configs.env_config import config
 from src.configs.log_config import configure_logging
+from src.configs.runtime_config import configure_runtime
+from src.models.embedding import ModelName
+from src.routes.collections import router as collections_router
+from src.routes.embedding import get_model_registry
 from src.routes.embedding import router as embedding_router
+from src.routes.jobs import router as jobs_router
 from src.security.rateLimiter import FastAPILimiter
 from src.security.rateLimiter.backends import (
     RedisRateLimiterBackend,
     ValkeyRateLimiterBackend,
 )
 from src.security.rateLimiter.depends import RateLimiter
+from src.services.inference import check_backends
+from src.services.jobs import JobRunner, get_job_queue
+from src.services.sharedCache import SharedEmbeddingCache
+from src.services.sharedCache.backends import (
+    RedisSharedCacheBackend,
+    SharedCacheBackend,
+    ValkeySharedCacheBackend,
+)
+from src.services.warmup import warmup_models
 
 # Initialize logging
 logger = logging.getLogger(__name__)
@@ -48,17 +64,74 @@ async def get_backend_instance():
     return RedisRateLimiterBackend(redis_client)
 
 
+def get_shared_cache_backend(backend_instance) -> SharedCacheBackend:
+    """Reuse the rate limiter connection for the shared embedding cache."""
+    if isinstance(backend_instance, ValkeyRateLimiterBackend):
+        return ValkeySharedCacheBackend(backend_instance.client)
+    return RedisSharedCacheBackend(backend_instance.redis)
+
+
+async def warmup(app: FastAPI) -> None:
+    """Preload and warm up the configured models, then flag the app as ready."""
+    try:
+        app.state.models = await warmup_models(
+            [ModelName(model) for model in config.get_preload_models],
+            config.EMBEDDING_WARMUP_BATCH_SIZES,
+            get_model_registry(),
+        )
+        app.state.ready = True
+        logger.info("Application ready")
+    except Exception as e:
+        logger.error(f"Model warmup failed: {str(e)}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Configure logging
     configure_logging()
 
+    # Size torch threads and executors for this worker's share of the CPUs
+    app.state.runtime = configure_runtime()
+
+    # Refuse to start when a configured inference backend is not installed
+    check_backends()
+
     # Get rate limiter backend instance
     backend_instance = await get_backend_instance()
 
     # Initialize rate limiter
     await FastAPILimiter.init(backend=backend_instance)
+
+    # Share embeddings across workers and replicas through the same connection
+    if config.EMBEDDING_SHARED_CACHE_ENABLED:
+        logger.info("Enabling shared embedding cache")
+        await SharedEmbeddingCache.init(
+            backend=get_shared_cache_backend(backend_instance),
+            namespace=config.EMBEDDING_SHARED_CACHE_NAMESPACE,
+            ttl=config.EMBEDDING_SHARED_CACHE_TTL,
+        )
+
+    # Warm up in the background so liveness is served while models load
+    app.state.ready = False
+    warmup_task = asyncio.create_task(warmup(app))
+
+    # Drain bulk embedding jobs in the background, resuming interrupted ones
+    job_queue = get_job_queue()
+    if job_queue is not None:
+        registry = get_model_registry()
+        app.state.job_runner = JobRunner(
+            job_queue,
+            registry.acquire,
+            registry.release,
+            workers=config.EMBEDDING_JOB_WORKERS,
+        )
+        app.state.job_runner.start()
     yield
+    warmup_task.cancel()
+    if job_queue is not None:
+        await app.state.job_runner.stop()
+    get_model_registry().clear()
+    await SharedEmbeddingCache.close()
     await FastAPILimiter.close()
 
 
@@ -82,7 +155,20 @@ async def read_root(rate: None = Depends(RateLimiter(times=3, seconds=10))):
     return {"greetings": "Welcome to Jayseregon AI toolbox API."}
 
 
+@app.get("/ready")
+async def read_ready():
+    """Readiness probe: 503 until the preloaded models are warmed up."""
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting"},
+        )
+    return {"status": "ready", "models": getattr(app.state, "models", {})}
+
+
 app.include_router(embedding_router)
+app.include_router(jobs_router)
+app.include_router(collections_router)
 
 
 @app.exception_handler(HTTPException)
@@ -0,0 +1,44 @@
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.embedding import ModelName
+
+NAME_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+
+class CollectionItem(BaseModel):
+    id: Annotated[str, Field(min_length=1, max_length=256)]
+    text: str
+
+
+class CollectionItems(BaseModel):
+    items: Annotated[list[CollectionItem], Field(min_length=1, max_length=1000)]
+
+
+class CollectionItemIds(BaseModel):
+    ids: Annotated[list[str], Field(min_length=1, max_length=1000)]
+
+
+class SearchQuery(BaseModel):
+    queries: Annotated[list[str], Field(min_length=1, max_length=100)]
+    k: Annotated[int, Field(ge=1, le=1000)] = 10
+    nprobe: Annotated[Optional[int], Field(ge=1)] = None
+
+
+class SearchHit(BaseModel):
+    id: str
+    text: str
+    score: float
+
+
+class SearchResults(BaseModel):
+    results: list[list[SearchHit]]
+
+
+class Collection(BaseModel):
+    name: str
+    model: ModelName
+    size: int
+    dim: Optional[int] = None
+    index: str
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Annotated
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, Field
 
@@ -10,6 +10,29 @@ class ModelName(str, Enum):
     MINI_L12 = "all-MiniLM-L12-v2"
 
 
+class VectorDType(str, Enum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+    BINARY = "binary"
+
+
+class EmbeddingFormat(str, Enum):
+    OBJECTS = "objects"
+    COLUMNAR = "columnar"
+    BASE64 = "base64"
+
+
+class ProjectionMode(str, Enum):
+    FIT = "fit"
+    BASIS = "basis"
+
+
+class SentenceMode(str, Enum):
+    WORDS = "words"
+    DOCUMENT = "document"
+
+
 class Sentence(BaseModel):
     text: str
 
@@ -26,3 +49,19 @@ class EmbeddedKeyword(BaseModel):
 
 class Embeddings(BaseModel):
     keywords: list[EmbeddedKeyword]
+
+
+class DocumentEmbeddings(Embeddings):
+    embedding: list[float]
+
+
+class SimilarityRequest(BaseModel):
+    keywords: Annotated[list[str], Field(min_length=2, max_length=10_000)]
+    threshold: Annotated[Optional[float], Field(ge=-1, le=1)] = None
+    top_k: Annotated[Optional[int], Field(ge=1)] = None
+
+
+class SimilarityPairs(BaseModel):
+    rows: list[int]
+    cols: list[int]
+    scores: list[float]
@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.models.embedding import ModelName
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    id: str
+    model: ModelName
+    status: JobStatus
+    total: int
+    processed: int
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+    results: list[str] = []
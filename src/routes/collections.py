@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+
+from src.models.collections import (
+    NAME_PATTERN,
+    Collection,
+    CollectionItemIds,
+    CollectionItems,
+    SearchHit,
+    SearchQuery,
+    SearchResults,
+)
+from src.models.embedding import ModelName
+from src.routes.embedding import lease_embedding_service
+from src.security.admission import admit
+from src.security.rateLimiter.depends import RateLimiter
+
+if TYPE_CHECKING:
+    from src.services.embedding import EmbeddingService
+    from src.services.index import CollectionStore, VectorCollection
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1/collections", tags=["collections"])
+
+COLLECTION_NAME = Path(pattern=NAME_PATTERN)
+
+
+def get_collections() -> "CollectionStore":
+    # Imported here so the ML stack only loads with the first collection
+    from src.services.index import get_collection_store
+
+    return get_collection_store()
+
+
+def get_collection(
+    name: str = COLLECTION_NAME,
+    collections: "CollectionStore" = Depends(get_collections),
+) -> "VectorCollection":
+    collection = collections.get(name)
+    if collection is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found"
+        )
+    return collection
+
+
+async def get_collection_service(
+    collection: "VectorCollection" = Depends(get_collection),
+) -> AsyncIterator["EmbeddingService"]:
+    """Lease the service of the collection's model, behind its admission control."""
+    async with admit(collection.model):
+        async with lease_embedding_service(collection.model) as service:
+            yield service
+
+
+def describe(collection: "VectorCollection") -> Collection:
+    return Collection(
+        name=collection.name,
+        model=collection.model,
+        size=len(collection),
+        dim=collection.dim,
+        index=collection.index,
+    )
+
+
+@router.get("", response_model=list[Collection])
+async def list_collections(collections: "CollectionStore" = Depends(get_collections)):
+    """List the collections and their sizes."""
+
+    def describe_all():
+        return [describe(collections.get(name)) for name in collections.names()]
+
+    return await asyncio.to_thread(describe_all)
+
+
+@router.put("/{name}", response_model=Collection, status_code=status.HTTP_201_CREATED)
+async def create_collection(
+    name: str = COLLECTION_NAME,
+    model: ModelName = ModelName.MINI_L6,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    collections: "CollectionStore" = Depends(get_collections),
+):
+    """Create a collection whose items are embedded with ``model``."""
+    try:
+        collection = await asyncio.to_thread(collections.create, name, model)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return await asyncio.to_thread(describe, collection)
+
+
+@router.get("/{name}", response_model=Collection)
+async def read_collection(collection: "VectorCollection" = Depends(get_collection)):
+    """Report a collection's model, size and index type."""
+    return await asyncio.to_thread(describe, collection)
+
+
+@router.delete("/{name}", status_code=status.HTTP_204_NO_CONTENT)
+async def drop_collection(
+    name: str = COLLECTION_NAME,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    collections: "CollectionStore" = Depends(get_collections),
+):
+    """Delete a collection with all its items and index files."""
+    if not await asyncio.to_thread(collections.drop, name):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/{name}/items", response_model=Collection)
+async def add_items(
+    body: CollectionItems,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    collection: "VectorCollection" = Depends(get_collection),
+    embedding_service: "EmbeddingService" = Depends(get_collection_service),
+):
+    """Embed and insert items; an existing id is replaced.
+
+    Once the collection reaches EMBEDDING_INDEX_IVF_MIN_SIZE items, or has
+    doubled since, its IVF index is retrained on the model's executor.
+    """
+    texts = [item.text for item in body.items]
+    vectors = await embedding_service.embed(texts)
+    try:
+        await asyncio.to_thread(
+            collection.add, [item.id for item in body.items], texts, vectors
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    # A no-op unless needs_training, checked on the executor as it reads disk
+    await embedding_service.executor.run(collection.train)
+    return await asyncio.to_thread(describe, collection)
+
+
+@router.post("/{name}/items/delete", response_model=Collection)
+async def delete_items(
+    body: CollectionItemIds,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    collection: "VectorCollection" = Depends(get_collection),
+):
+    """Remove items by id; unknown ids are ignored."""
+    removed = await asyncio.to_thread(collection.delete, body.ids)
+    logger.debug(f"Removed {removed} items from collection {collection.name}")
+    return await asyncio.to_thread(describe, collection)
+
+
+@router.post("/{name}/search", response_model=SearchResults)
+async def search_collection(
+    query: SearchQuery,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    collection: "VectorCollection" = Depends(get_collection),
+    embedding_service: "EmbeddingService" = Depends(get_collection_service),
+):
+    """Return the ``k`` most similar items per query, by cosine similarity.
+
+    Collections below EMBEDDING_INDEX_IVF_MIN_SIZE items are searched
+    exactly; larger ones scan the ``nprobe`` closest IVF lists.
+    """
+    vectors = await embedding_service.embed(query.queries)
+    try:
+        hits = await asyncio.to_thread(
+            collection.search, vectors, query.k, query.nprobe
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return SearchResults(
+        results=[
+            [
+                SearchHit(id=item_id, text=text, score=score)
+                for item_id, text, score in row
+            ]
+            for row in hits
+        ]
+    )
@@ -1,11 +1,54 @@
+import asyncio
+import json
 import logging
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional, Union
 
-from fastapi import APIRouter, Depends, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from src.models.embedding import Keywords, ModelName, Sentence
+from src.configs.env_config import config
+from src.configs.runtime_config import get_runtime_settings
+from src.models.embedding import (
+    DocumentEmbeddings,
+    EmbeddingFormat,
+    Embeddings,
+    Keywords,
+    ModelName,
+    ProjectionMode,
+    Sentence,
+    SentenceMode,
+    SimilarityPairs,
+    SimilarityRequest,
+    VectorDType,
+)
+from src.security.admission import admit, get_admission_controller
 from src.security.rateLimiter.depends import RateLimiter
-from src.services.embedding import Embeddings, EmbeddingService
+from src.services.ndjson import iter_ndjson_keywords
+from src.services.registry import ModelRegistry
+from src.services.serialization import (
+    FastJSONResponse,
+    JSONBody,
+    dumps,
+    render_columnar,
+    render_embeddings,
+    render_packed,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.services.embedding import EmbeddingService
 
 # Initialize logging
 logger = logging.getLogger(__name__)
@@ -13,35 +56,350 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1/embedding", tags=["embedding"])
 
 
-@lru_cache()
-def get_embedding_service(model: ModelName = ModelName.MINI_L6) -> EmbeddingService:
+def create_embedding_service(model: ModelName) -> "EmbeddingService":
     """Create an instance of the EmbeddingService class."""
+    # Imported here so the ML stack only loads with the first model
+    from src.services.embedding import EmbeddingService
+
     logger.debug(f"Creating an instance of EmbeddingService with model {model}")
     return EmbeddingService(model_name=model)
 
 
+@lru_cache()
+def get_model_registry() -> ModelRegistry:
+    return ModelRegistry(
+        budget_bytes=config.EMBEDDING_MODEL_MEMORY_BUDGET_MB * 2**20,
+        factory=create_embedding_service,
+    )
+
+
+@asynccontextmanager
+async def lease_embedding_service(
+    model: ModelName,
+) -> AsyncIterator["EmbeddingService"]:
+    """Hold the model's service from the registry, so it is not evicted meanwhile."""
+    registry = get_model_registry()
+    service = await asyncio.to_thread(registry.acquire, model)
+    try:
+        yield service
+    finally:
+        # Eviction may close a model and wait for its worker processes
+        await asyncio.to_thread(registry.release, model)
+
+
+async def get_embedding_service(
+    model: ModelName = ModelName.MINI_L6,
+) -> AsyncIterator["EmbeddingService"]:
+    """Lease the model's service from the registry for the whole request."""
+    async with lease_embedding_service(model) as service:
+        yield service
+
+
+KEYWORDS_BODY = JSONBody(Keywords)
+SENTENCE_BODY = JSONBody(Sentence)
+
+
+async def keywords_body(request: Request) -> Keywords:
+    return KEYWORDS_BODY.parse(await request.body())
+
+
+async def sentence_body(request: Request) -> Sentence:
+    return SENTENCE_BODY.parse(await request.body())
+
+
+FORMAT_QUERY = Query(
+    default=EmbeddingFormat.OBJECTS,
+    alias="format",
+    description=(
+        "`objects` returns `{word, x, y}` per keyword; `columnar` returns "
+        "parallel `words`, `x` and `y` arrays; `base64` packs `x` and `y` as "
+        "base64 little-endian float32."
+    ),
+)
+
+
+PROJECTION_QUERY = Query(
+    default=None,
+    description=(
+        "`basis` projects onto the model's stored basis, so coordinates are "
+        "stable across requests; `fit` fits a PCA on this request's keywords. "
+        "Defaults to EMBEDDING_PROJECTION."
+    ),
+)
+
+
+def render_points(
+    keywords: List[str], points: "np.ndarray", layout: EmbeddingFormat, **extra: Any
+):
+    """Build the 201 response for projected points in the requested layout."""
+    if layout == EmbeddingFormat.COLUMNAR:
+        content = render_columnar(keywords, points, **extra)
+    elif layout == EmbeddingFormat.BASE64:
+        content = render_packed(keywords, points, **extra)
+    else:
+        content = render_embeddings(keywords, points.tolist(), **extra)
+    return FastJSONResponse(content, status_code=status.HTTP_201_CREATED)
+
+
+async def admit_embedding_request(model: ModelName = ModelName.MINI_L6):
+    """Shed load with a 503 once the model's running and queued slots are full."""
+    async with admit(model):
+        yield
+
+
 @router.post(
-    "/keywords", response_model=Embeddings, status_code=status.HTTP_201_CREATED
+    "/keywords",
+    response_model=Embeddings,
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=KEYWORDS_BODY.openapi,
 )
 async def create_embeddings(
-    keywords: Keywords,
-    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    keywords: Keywords = Depends(keywords_body),
+    layout: EmbeddingFormat = FORMAT_QUERY,
+    projection: Optional[ProjectionMode] = PROJECTION_QUERY,
     rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    admission: None = Depends(admit_embedding_request),
+    embedding_service: "EmbeddingService" = Depends(get_embedding_service),
 ):
     """Create embeddings from a list of keywords."""
     logger.debug(f"Processing keywords embedding for {keywords.keywords}")
-    return await embedding_service.process_keywords(keywords.keywords)
+    points = await embedding_service.project_points(keywords.keywords, projection)
+    # Rendered straight from the points, so no Embeddings model is built
+    return render_points(keywords.keywords, points, layout)
+
+
+@router.post("/keywords/stream", status_code=status.HTTP_201_CREATED)
+async def stream_embeddings(
+    request: Request,
+    projection: Optional[ProjectionMode] = PROJECTION_QUERY,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    admission: None = Depends(admit_embedding_request),
+    embedding_service: "EmbeddingService" = Depends(get_embedding_service),
+):
+    """Create embeddings from an NDJSON keyword stream of any length.
+
+    Each input line is a JSON string or ``{"keyword": ...}``; each output line
+    is ``{"word", "x", "y"}`` in input order.
+    """
+    from src.services.streaming import iter_ndjson_points
+
+    projected = await embedding_service.stream_keywords(
+        iter_ndjson_keywords(request.stream()), projection
+    )
+    logger.debug(f"Streaming {projected.count} projected keywords")
+    return StreamingResponse(
+        iter_ndjson_points(projected),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/x-ndjson",
+    )
 
 
 @router.post(
-    "/sentence", response_model=Embeddings, status_code=status.HTTP_201_CREATED
+    "/vectors",
+    status_code=status.HTTP_201_CREATED,
+    response_class=Response,
+    responses={
+        status.HTTP_201_CREATED: {
+            "content": {
+                "application/x-npy": {},
+                "application/vnd.apache.arrow.stream": {},
+            },
+            "description": "Full embedding matrix in input keyword order",
+        }
+    },
+)
+async def create_vectors(
+    keywords: Keywords,
+    dtype: VectorDType = VectorDType.FLOAT32,
+    dimensions: Optional[int] = Query(default=None, ge=1),
+    accept: Optional[str] = Header(default=None),
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    admission: None = Depends(admit_embedding_request),
+    embedding_service: "EmbeddingService" = Depends(get_embedding_service),
+):
+    """Return the raw embedding vectors as ``.npy`` or an Arrow IPC stream.
+
+    The format follows the Accept header. With npy the keyword order is sent
+    in the ``X-Keywords`` header as a JSON list; Arrow carries it as a column.
+    ``dimensions`` truncates the vectors, ``int8`` quantizes them with the
+    model's calibration ranges and ``binary`` packs one sign bit per dimension
+    (zero-padded to a whole byte).
+    """
+    from src.services.vectors import (
+        ARROW_MEDIA_TYPE,
+        arrow_available,
+        encode_arrow,
+        encode_npy,
+        negotiate_media_type,
+    )
+
+    try:
+        media_type = negotiate_media_type(accept)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=str(e))
+    if media_type == ARROW_MEDIA_TYPE and not arrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Arrow output requires pyarrow to be installed",
+        )
+
+    vectors = await embedding_service.embed_output(keywords.keywords, dtype, dimensions)
+    # Float modes are cast while serializing, quantized ones are final already
+    output_dtype = (
+        dtype.value
+        if dtype in (VectorDType.FLOAT32, VectorDType.FLOAT16)
+        else vectors.dtype
+    )
+    if media_type == ARROW_MEDIA_TYPE:
+        return Response(
+            encode_arrow(keywords.keywords, vectors, output_dtype),
+            status_code=status.HTTP_201_CREATED,
+            media_type=media_type,
+        )
+    return Response(
+        encode_npy(vectors, output_dtype),
+        status_code=status.HTTP_201_CREATED,
+        media_type=media_type,
+        headers={"X-Keywords": json.dumps(keywords.keywords)},
+    )
+
+
+@router.post(
+    "/similarity",
+    response_model=SimilarityPairs,
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {
+            "content": {"application/x-npy": {}},
+            "description": (
+                "Sparse pairs as JSON, or the dense float16 matrix as npy when "
+                "neither threshold nor top_k is set"
+            ),
+        }
+    },
+)
+async def create_similarity(
+    body: SimilarityRequest,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    admission: None = Depends(admit_embedding_request),
+    embedding_service: "EmbeddingService" = Depends(get_embedding_service),
+):
+    """Cosine similarities between all submitted keywords.
+
+    Without ``threshold`` or ``top_k`` the full matrix comes back as float16
+    ``.npy``. Otherwise only the kept pairs are returned as parallel
+    ``rows``/``cols``/``scores`` arrays indexing the input keywords: each
+    row's best ``top_k`` neighbours, or every pair at or above ``threshold``
+    once (``row < col``). Either way the matrix is computed in row blocks of
+    EMBEDDING_SIMILARITY_BLOCK_MB, never held in full as floats. Sparse
+    results beyond EMBEDDING_SIMILARITY_MAX_PAIRS pairs are rejected with 422.
+    """
+    from src.services.similarity import dense_similarity, sparse_similarity
+    from src.services.vectors import NPY_MEDIA_TYPE
+
+    n = len(body.keywords)
+    max_pairs = config.EMBEDDING_SIMILARITY_MAX_PAIRS
+    if body.top_k is not None and n * min(body.top_k, n - 1) > max_pairs:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"top_k={body.top_k} over {n} keywords exceeds {max_pairs} pairs",
+        )
+    # A one-off batch, kept out of the caches and the store
+    vectors = await embedding_service.embed_bulk(body.keywords)
+    block_bytes = config.EMBEDDING_SIMILARITY_BLOCK_MB * 2**20
+    if body.threshold is None and body.top_k is None:
+        matrix = await embedding_service.executor.run(
+            dense_similarity, vectors, "float16", block_bytes
+        )
+        return Response(
+            matrix, status_code=status.HTTP_201_CREATED, media_type=NPY_MEDIA_TYPE
+        )
+
+    try:
+        rows, cols, scores = await embedding_service.executor.run(
+            sparse_similarity,
+            vectors,
+            body.threshold,
+            body.top_k,
+            block_bytes,
+            max_pairs,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+    return FastJSONResponse(
+        dumps({"rows": rows, "cols": cols, "scores": scores}),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/sentence",
+    response_model=Union[Embeddings, DocumentEmbeddings],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=SENTENCE_BODY.openapi,
 )
 async def process_demo_text(
-    sentence: Sentence,
-    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    sentence: Sentence = Depends(sentence_body),
+    mode: SentenceMode = SentenceMode.WORDS,
+    layout: EmbeddingFormat = FORMAT_QUERY,
+    projection: Optional[ProjectionMode] = PROJECTION_QUERY,
     rate: None = Depends(RateLimiter(times=3, seconds=10)),
+    admission: None = Depends(admit_embedding_request),
+    embedding_service: "EmbeddingService" = Depends(get_embedding_service),
 ):
-    """Create embeddings from a sentence split into words."""
+    """Create embeddings from a sentence split into words.
+
+    In ``document`` mode the text is instead cut into overlapping windows of
+    the model's ``max_seq_length`` tokens. Each window is a point in the
+    response, which also carries the pooled document ``embedding``.
+    """
     logger.debug(f"Processing sentence embedding for {sentence.text}")
+    if mode == SentenceMode.DOCUMENT:
+        embedding, chunks, points = await embedding_service.embed_document(
+            sentence.text, projection
+        )
+        return render_points(chunks, points, layout, embedding=embedding)
     keywords = sentence.text.split()
-    return await embedding_service.process_keywords(keywords)
+    points = await embedding_service.project_points(keywords, projection)
+    return render_points(keywords, points, layout)
+
+
+@router.get("/models")
+async def get_resident_models():
+    """Report which models are loaded and the registry's memory use."""
+    return get_model_registry().get_stats()
+
+
+@router.get("/runtime")
+async def get_runtime():
+    """Report the CPU budget, threads and executor size chosen for this worker."""
+    return get_runtime_settings().to_dict()
+
+
+@router.get("/stats")
+async def get_embedding_stats(
+    model: ModelName = ModelName.MINI_L6,
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+):
+    """Report runtime statistics for a loaded embedding model.
+
+    Models are looked up without loading them: a model that is not resident
+    has no statistics and answers 404.
+    """
+    registry = get_model_registry()
+    embedding_service = registry.acquire_loaded(model)
+    if embedding_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model {model.value} is not loaded",
+        )
+    try:
+        stats = embedding_service.get_stats()
+    finally:
+        await asyncio.to_thread(registry.release, model)
+    return {**stats, "admission": get_admission_controller(model).get_stats()}
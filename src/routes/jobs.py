@@ -0,0 +1,91 @@
+import asyncio
+import csv
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, status
+from fastapi.responses import FileResponse
+
+from src.configs.env_config import config
+from src.models.embedding import ModelName
+from src.models.jobs import Job, JobStatus
+from src.security.rateLimiter.depends import RateLimiter
+from src.services.jobs import JobQueue, get_job_queue
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1/jobs", tags=["jobs"])
+
+MEDIA_TYPES = {
+    ".npy": "application/octet-stream",
+    ".parquet": "application/vnd.apache.parquet",
+}
+
+
+def get_queue() -> JobQueue:
+    queue = get_job_queue()
+    if queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Bulk embedding jobs are not enabled",
+        )
+    return queue
+
+
+async def get_job(job_id: str, queue: JobQueue = Depends(get_queue)) -> Job:
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return job
+
+
+@router.post("", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    request: Request,
+    file: UploadFile,
+    model: ModelName = ModelName.MINI_L6,
+    queue: JobQueue = Depends(get_queue),
+    rate: None = Depends(RateLimiter(times=3, seconds=10)),
+):
+    """Queue a JSONL or CSV corpus for background embedding."""
+    csv_format = (file.filename or "").lower().endswith(".csv")
+    try:
+        job = await asyncio.to_thread(
+            queue.submit,
+            model,
+            file.file,
+            csv_format,
+            config.EMBEDDING_JOB_MAX_KEYWORDS,
+        )
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    runner = getattr(request.app.state, "job_runner", None)
+    if runner is not None:
+        runner.notify()
+    return job
+
+
+@router.get("/{job_id}", response_model=Job)
+async def read_job(job: Job = Depends(get_job)):
+    """Report a job's status and progress."""
+    return job
+
+
+@router.get("/{job_id}/results/{name}")
+async def download_result(
+    name: str, job: Job = Depends(get_job), queue: JobQueue = Depends(get_queue)
+):
+    """Download one of a completed job's result files."""
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Job is not completed"
+        )
+    if name not in job.results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Result not found"
+        )
+    path = queue.job_dir(job.id) / name
+    return FileResponse(path, media_type=MEDIA_TYPES[path.suffix], filename=name)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from math import ceil
+from typing import AsyncIterator, Deque, Dict, Hashable
+
+from fastapi import HTTPException
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from src.configs.env_config import config
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """Bound how much work a model accepts: N running, M waiting, shed the rest.
+
+    Rejected requests get a 503 with ``Retry-After`` estimated from an EWMA of
+    the measured service time and the current backlog, so clients back off for
+    about as long as it takes the backlog to drain.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait_s: float,
+        alpha: float = 0.2,
+        initial_service_s: float = 1.0,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.alpha = alpha
+        self.service_s = initial_service_s
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        backlog = self.running + self.queued + 1
+        return max(1, ceil(self.service_s * backlog / self.max_concurrency))
+
+    def _reject(self, reason: str) -> HTTPException:
+        logger.warning(f"Shedding request for {self.name}: {reason}")
+        return HTTPException(
+            HTTP_503_SERVICE_UNAVAILABLE,
+            "Service Overloaded",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    async def acquire(self) -> None:
+        """Take a slot, wait in the bounded queue, or raise a 503 at once."""
+        if self.running < self.max_concurrency and not self._waiters:
+            self.running += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise self._reject("queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_wait_s)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            self.timed_out += 1
+            raise self._reject("queue wait timed out")
+        self.admitted += 1
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just before we gave up, pass it on
+            self._release_slot()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _release_slot(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter, running is unchanged
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def release(self, service_s: float) -> None:
+        """Free the slot and fold the request's service time into the EWMA."""
+        self.service_s += self.alpha * (service_s - self.service_s)
+        self._release_slot()
+
+    def get_stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "service_ms": round(self.service_s * 1000, 3),
+            "retry_after_s": self.retry_after(),
+        }
+
+
+@lru_cache()
+def get_admission_controller(key: Hashable) -> AdmissionController:
+    return AdmissionController(
+        name=str(getattr(key, "value", key)),
+        max_concurrency=config.EMBEDDING_MAX_CONCURRENCY,
+        max_queue=config.EMBEDDING_MAX_QUEUE,
+        max_wait_s=config.EMBEDDING_MAX_QUEUE_WAIT_S,
+    )
+
+
+@asynccontextmanager
+async def admit(key: Hashable) -> AsyncIterator[None]:
+    """Hold an admission slot for ``key`` for the duration of the request."""
+    controller = get_admission_controller(key)
+    await controller.acquire()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        controller.release(time.perf_counter() - started)
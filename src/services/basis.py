@@ -0,0 +1,125 @@
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.configs.env_config import config
+from src.services.quantization import CALIBRATION_TEXTS
+from src.services.reduction import NumpyReducer
+from src.services.store import JSONModelStore
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+class ProjectionBasis:
+    """A PCA basis and normalization bounds fitted once on a reference vocabulary.
+
+    Projecting with a fixed basis is a single matmul, so a keyword lands at the
+    same coordinates in every request and chunks can be projected one at a
+    time. The bounds are widened by a margin at fit time so texts a little
+    outside the reference vocabulary keep distinct coordinates; only points
+    beyond the margin are clipped to the value range.
+    """
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        components: np.ndarray,
+        data_min: np.ndarray,
+        data_max: np.ndarray,
+    ) -> None:
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.components = np.asarray(components, dtype=np.float64)
+        self.data_min = np.asarray(data_min, dtype=np.float64)
+        self.data_max = np.asarray(data_max, dtype=np.float64)
+
+    @property
+    def n_components(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(
+        cls, vectors: np.ndarray, n_components: int = 2, margin: float = 0.0
+    ) -> "ProjectionBasis":
+        """Fit on reference vectors, padding each bound by ``margin`` of its range."""
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if n_components > min(vectors.shape):
+            raise ValueError(
+                f"n_components={n_components} must be between 0 and "
+                f"min(n_samples, n_features)={min(vectors.shape)}"
+            )
+        mean = vectors.mean(axis=0)
+        centered = vectors - mean
+        components = NumpyReducer().components(centered, n_components)
+        points = centered @ components.T
+        data_min, data_max = points.min(axis=0), points.max(axis=0)
+        pad = (data_max - data_min) * margin
+        return cls(mean, components, data_min - pad, data_max + pad)
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        """Raw coordinates along the basis, before normalization."""
+        return (np.asarray(vectors, dtype=np.float64) - self.mean) @ self.components.T
+
+    def normalize(
+        self, points: np.ndarray, value_range: Tuple[float, float] = (0, 1)
+    ) -> np.ndarray:
+        data_range = self.data_max - self.data_min
+        data_range[data_range == 0.0] = 1.0
+        scale = (value_range[1] - value_range[0]) / data_range
+        values = points * scale + (value_range[0] - self.data_min * scale)
+        return np.clip(values, value_range[0], value_range[1])
+
+    def transform(
+        self, vectors: np.ndarray, value_range: Tuple[float, float] = (0, 1)
+    ) -> np.ndarray:
+        return self.normalize(self.project(vectors), value_range)
+
+    def to_dict(self) -> Dict[str, list]:
+        return {
+            "mean": self.mean.tolist(),
+            "components": self.components.tolist(),
+            "min": self.data_min.tolist(),
+            "max": self.data_max.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, list]) -> "ProjectionBasis":
+        return cls(data["mean"], data["components"], data["min"], data["max"])
+
+
+def reference_texts(path: Optional[str] = None) -> List[str]:
+    """Reference vocabulary for the bases: one text per line of ``path``.
+
+    Without a file the built-in calibration corpus is used.
+    """
+    if path is None:
+        return list(CALIBRATION_TEXTS)
+    with open(path, encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    if not texts:
+        raise ValueError(f"Reference vocabulary {path} is empty")
+    return texts
+
+
+class BasisStore(JSONModelStore):
+    """Projection bases per vector key, persisted as JSON when a directory is set.
+
+    Without a directory each worker fits the same basis from the shared
+    reference vocabulary, so coordinates still agree across workers.
+    """
+
+    suffix = ".basis.json"
+    label = "projection basis"
+
+    def to_json(self, basis: ProjectionBasis) -> Dict:
+        return basis.to_dict()
+
+    def from_json(self, data: Dict) -> ProjectionBasis:
+        return ProjectionBasis.from_dict(data)
+
+
+@lru_cache()
+def get_basis_store() -> BasisStore:
+    return BasisStore(config.EMBEDDING_BASIS_DIR)
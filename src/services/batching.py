@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from src.services.metrics import Histogram
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+@dataclass
+class _PendingRequest:
+    texts: List[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """Merge concurrent encode requests into a single forward pass.
+
+    Requests arriving within ``max_wait_ms`` of the first pending one are
+    encoded together, up to ``max_batch_size`` texts per call. Each caller gets
+    back only the rows for its own texts. ``encode`` is a coroutine function,
+    so where the forward pass actually runs is up to the caller.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Awaitable[np.ndarray]],
+        max_wait_ms: float = 2.0,
+        max_batch_size: int = 128,
+    ) -> None:
+        self.encode = encode
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.wait_ms_histogram = Histogram(WAIT_MS_BUCKETS)
+        self._pending: List[_PendingRequest] = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        request = _PendingRequest(texts=list(texts), future=loop.create_future())
+        self._pending.append(request)
+        self._pending_size += len(request.texts)
+
+        if self._pending_size >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        return await request.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending, self._pending_size = self._pending, [], 0
+        batch: List[_PendingRequest] = []
+        batch_size = 0
+        for request in pending:
+            # A request never gets split, so an oversized one runs on its own
+            if batch and batch_size + len(request.texts) > self.max_batch_size:
+                self._schedule(batch)
+                batch, batch_size = [], 0
+            batch.append(request)
+            batch_size += len(request.texts)
+        if batch:
+            self._schedule(batch)
+
+    def _schedule(self, batch: List[_PendingRequest]) -> None:
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_PendingRequest]) -> None:
+        started = time.perf_counter()
+        merged = [text for request in batch for text in request.texts]
+        for request in batch:
+            self.wait_ms_histogram.observe((started - request.enqueued_at) * 1000)
+        self.batch_size_histogram.observe(len(merged))
+        logger.debug(f"Encoding batch of {len(merged)} texts from {len(batch)} calls")
+
+        try:
+            vectors = await self.encode(merged)
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            end = offset + len(request.texts)
+            if not request.future.done():
+                request.future.set_result(vectors[offset:end])
+            offset = end
+
+    def get_stats(self) -> Dict:
+        return {
+            "max_wait_ms": self.max_wait_ms,
+            "max_batch_size": self.max_batch_size,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "wait_ms": self.wait_ms_histogram.snapshot(),
+        }
@@ -0,0 +1,74 @@
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+
+def length_buckets(
+    lengths: Sequence[int], max_batch_size: int = 32
+) -> List[np.ndarray]:
+    """Indices grouped by power-of-two token length, at most ``max_batch_size`` each.
+
+    Within a bucket no sequence is more than twice as long as another, so
+    padding to the longest one wastes at most half of the batch.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    order = np.argsort(lengths, kind="stable")
+    classes = np.ceil(np.log2(np.maximum(lengths[order], 1))).astype(np.int64)
+    buckets: List[np.ndarray] = []
+    for group in np.split(order, np.flatnonzero(np.diff(classes)) + 1):
+        buckets.extend(
+            group[start : start + max_batch_size]
+            for start in range(0, len(group), max_batch_size)
+        )
+    return [bucket for bucket in buckets if len(bucket)]
+
+
+def _pad(encoding: Any, rows: np.ndarray, width: int, pad_id: int) -> dict:
+    import torch
+
+    features = {}
+    for key, values in encoding.items():
+        batch = np.full((len(rows), width), pad_id if key == "input_ids" else 0)
+        for row, index in enumerate(rows):
+            batch[row, : len(values[index])] = values[index]
+        features[key] = torch.from_numpy(batch)
+    return features
+
+
+def encode_bucketed(
+    model: Any,
+    texts: List[str],
+    max_seq_length: Optional[int] = None,
+    batch_size: int = 32,
+) -> np.ndarray:
+    """Encode with a SentenceTransformer, padding each length bucket on its own.
+
+    Texts are tokenized once, grouped by token length with
+    :func:`length_buckets` and run through the model a bucket at a time, so a
+    long sentence no longer pads a batch of one-word keywords to its length.
+    ``max_seq_length`` further cuts every text, below the model's own limit.
+    Models without a fast tokenizer go through ``model.encode`` unchanged.
+    """
+    tokenizer: Any = getattr(model, "tokenizer", None)
+    if not texts or getattr(tokenizer, "is_fast", False) is not True:
+        return model.encode(texts)
+    import torch
+
+    limit = model.max_seq_length
+    if max_seq_length is not None:
+        limit = min(limit, max_seq_length)
+    encoding = tokenizer(texts, truncation=True, max_length=limit, verbose=False)
+    lengths = [len(ids) for ids in encoding["input_ids"]]
+    pad_id = tokenizer.pad_token_id or 0
+
+    vectors = None
+    with torch.inference_mode():
+        for bucket in length_buckets(lengths, batch_size):
+            width = max(lengths[index] for index in bucket)
+            features = _pad(encoding, bucket, width, pad_id)
+            embeddings = model(features)["sentence_embedding"].float().cpu().numpy()
+            if vectors is None:
+                vectors = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+            # Scatter the bucket back to the callers' order
+            vectors[bucket] = embeddings
+    return vectors
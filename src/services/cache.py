@@ -0,0 +1,97 @@
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.configs.env_config import config
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """LRU cache of raw embedding vectors bounded by a byte budget.
+
+    Entries are keyed by ``(model_name, text)`` so a single budget is shared by
+    every loaded model. Stored vectors are read-only copies.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[Hashable, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(
+        self, model_name: Hashable, texts: Sequence[str]
+    ) -> List[Optional[np.ndarray]]:
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                key = (model_name, text)
+                vector = self._entries.get(key)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                found.append(vector)
+        return found
+
+    def put_many(
+        self, model_name: Hashable, texts: Sequence[str], vectors: np.ndarray
+    ) -> None:
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = (model_name, text)
+                stored = np.array(vector, copy=True)
+                if stored.nbytes > self.max_bytes:
+                    continue
+                stored.flags.writeable = False
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.current_bytes -= previous.nbytes
+                self._entries[key] = stored
+                self.current_bytes += stored.nbytes
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, vector = self._entries.popitem(last=False)
+            self.current_bytes -= vector.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache()
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache shared by every EmbeddingService."""
+    logger.debug(
+        f"Creating embedding cache with {config.EMBEDDING_CACHE_MAX_BYTES} bytes budget"
+    )
+    return EmbeddingCache(max_bytes=config.EMBEDDING_CACHE_MAX_BYTES)
@@ -0,0 +1,86 @@
+import itertools
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+LAST_SPACE = re.compile(r"\s(?=\S*$)")
+WORD = re.compile(r"\S+")
+
+
+def iter_text_pieces(text: str, size: int = 64 * 1024) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+def _word_token(text: str, spans: List[Tuple[int, int]], index: int, floor: int) -> int:
+    """Step back from token ``index`` to the first token of its word, above ``floor``."""
+    while index > floor + 1 and spans[index][0] > 0:
+        if text[spans[index][0] - 1].isspace():
+            break
+        index -= 1
+    return index
+
+
+class DocumentChunker:
+    """Sliding windows of ``max_tokens`` tokens over a text arriving in pieces.
+
+    Consecutive windows share ``overlap`` tokens. Token boundaries come from
+    the model's fast tokenizer offsets when it has one, otherwise from
+    whitespace. Windows after the first start on a word boundary, so the
+    overlap can be a token or two longer. Only the text from the next window
+    on is kept and re-tokenized, so memory stays bounded by one window plus
+    one piece however long the document is.
+    """
+
+    def __init__(
+        self, tokenizer: Optional[Any] = None, max_tokens: int = 254, overlap: int = 32
+    ) -> None:
+        if not 0 <= overlap < max_tokens:
+            raise ValueError(
+                f"overlap must be between 0 and max_tokens - 1, got {overlap}"
+            )
+        fast = tokenizer is not None and getattr(tokenizer, "is_fast", False) is True
+        self.tokenizer = tokenizer if fast else None
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+
+    def _spans(self, text: str) -> List[Tuple[int, int]]:
+        """Character span of every token in ``text``."""
+        if self.tokenizer is None:
+            return [match.span() for match in WORD.finditer(text)]
+        encoding = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            verbose=False,
+        )
+        return encoding["offset_mapping"]
+
+    def iter_chunks(self, pieces: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """Yield ``(chunk_text, n_tokens)`` in document order."""
+        pending = ""
+        for piece in itertools.chain(pieces, [None]):
+            final = piece is None
+            if piece is not None:
+                pending += piece
+            # Only whole words are tokenized, the rest waits for the next piece
+            match = None if final else LAST_SPACE.search(pending)
+            cut = len(pending) if final else (match.start() if match else 0)
+            segment = pending[:cut]
+            spans = self._spans(segment)
+
+            start = 0
+            # Until the end, a window must leave a token after it, so the
+            # pending tail always holds text no window has covered yet
+            while len(spans) - start > self.max_tokens or (
+                final and start < len(spans)
+            ):
+                end = min(start + self.max_tokens, len(spans))
+                yield segment[spans[start][0] : spans[end - 1][1]], end - start
+                if end == len(spans):
+                    start = end
+                    break
+                # Windows start on a word, so the tail re-tokenizes the same way
+                start = _word_token(segment, spans, end - self.overlap, start)
+
+            keep = spans[start][0] if start < len(spans) else cut
+            pending = segment[keep:] + pending[cut:]
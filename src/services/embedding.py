@@ -1,52 +1,243 @@
 import asyncio
+import itertools
 import logging
-from typing import List, Literal, Tuple
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
 
 import numpy as np
 from fastapi import HTTPException
-from sentence_transformers import SentenceTransformer
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import MinMaxScaler
 
-from src.models.embedding import EmbeddedKeyword, Embeddings, ModelName
+from src.configs.env_config import config
+from src.configs.runtime_config import get_runtime_settings
+from src.models.embedding import (
+    EmbeddedKeyword,
+    Embeddings,
+    ModelName,
+    ProjectionMode,
+    VectorDType,
+)
+from src.services.basis import ProjectionBasis, get_basis_store, reference_texts
+from src.services.batching import MicroBatcher
+from src.services.bucketing import encode_bucketed
+from src.services.cache import get_embedding_cache
+from src.services.chunking import DocumentChunker, iter_text_pieces
+from src.services.executor import InferenceExecutor
+from src.services.inference import get_backend, load_model
+from src.services.quantization import (
+    CALIBRATION_TEXTS,
+    calibrate,
+    get_calibration_store,
+    quantize_binary,
+    quantize_int8,
+    truncate,
+)
+from src.services.reduction import get_reducer
+from src.services.sharedCache import SharedEmbeddingCache
+from src.services.store import EmbeddingStore
+from src.services.streaming import StreamingProjection
+from src.services.workers import ProcessInferencePool
 
 # Initialize logging
 logger = logging.getLogger(__name__)
 
+# Token limit assumed for models that do not report a max_seq_length
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+
+def keyword_max_seq_length(model: object) -> Optional[int]:
+    """EMBEDDING_KEYWORD_MAX_SEQ_LENGTH, None when it does not cut below the model."""
+    cap = config.EMBEDDING_KEYWORD_MAX_SEQ_LENGTH
+    limit = getattr(model, "max_seq_length", None)
+    if cap is None or (isinstance(limit, int) and limit <= cap):
+        return None
+    return cap
+
+
+def vector_key(
+    model_name: ModelName, backend: str, max_seq_length: Optional[int]
+) -> str:
+    """Name of the vectors a model produces, keying the caches and the store.
+
+    The inference backend and the token cap both change the vectors, so they
+    are part of the name and switching either starts from empty caches.
+    """
+    key = f"{model_name.value}@{backend}"
+    if max_seq_length is None:
+        return key
+    return f"{key}@seq{max_seq_length}"
+
 
 class EmbeddingService:
     def __init__(self, model_name: ModelName) -> None:
+        self.model_name = model_name
         try:
-            logger.debug(f"Loading model {model_name}")
-            self.model = SentenceTransformer(model_name)
+            self.backend = get_backend(model_name)
+            self.model = load_model(model_name, self.backend)
         except Exception as e:
             logger.error(f"Failed to load model {model_name}: {str(e)}")
             raise HTTPException(
                 status_code=500, detail="Failed to initialize embedding model"
             )
+        self.keyword_max_seq_length = keyword_max_seq_length(self.model)
+        self.vector_key = vector_key(
+            model_name, self.backend, self.keyword_max_seq_length
+        )
+        runtime = get_runtime_settings()
+        self.executor = InferenceExecutor(
+            f"embedding-{model_name.value}",
+            max_workers=runtime.executor_workers,
+        )
+        self.process_pool: Optional[ProcessInferencePool] = None
+        if config.EMBEDDING_PROCESS_WORKERS > 0:
+            self.process_pool = ProcessInferencePool(
+                model_name.value,
+                processes=config.EMBEDDING_PROCESS_WORKERS,
+                threads_per_process=runtime.process_threads,
+                backend=self.backend,
+            )
+        self.batcher = MicroBatcher(
+            self.encode_keywords,
+            max_wait_ms=config.EMBEDDING_BATCH_MAX_WAIT_MS,
+            max_batch_size=config.EMBEDDING_BATCH_MAX_SIZE,
+        )
+        self.cache = get_embedding_cache()
+        self.reducer = get_reducer(config.EMBEDDING_REDUCER)
+        self.calibrations = get_calibration_store()
+        self.bases = get_basis_store()
+        self.store = (
+            EmbeddingStore(Path(config.EMBEDDING_STORE_DIR) / self.vector_key)
+            if config.EMBEDDING_STORE_DIR
+            else None
+        )
 
-    def create_embeddings(self, keywords: List[str]) -> np.ndarray:
+    def create_embeddings(
+        self, keywords: List[str], max_seq_length: Optional[int] = None
+    ) -> np.ndarray:
         try:
             logger.debug(f"Encoding keywords: {keywords}")
-            return self.model.encode(keywords)
+            return encode_bucketed(
+                self.model,
+                keywords,
+                max_seq_length,
+                batch_size=config.EMBEDDING_ENCODE_BATCH_SIZE,
+            )
         except Exception as e:
             logger.error(f"Embedding creation failed: {str(e)}")
             raise HTTPException(status_code=500, detail="Failed to create embeddings")
 
+    async def encode_batch(
+        self, keywords: List[str], max_seq_length: Optional[int] = None
+    ) -> np.ndarray:
+        """Encode off the event loop, in worker processes when they are enabled."""
+        if self.process_pool is None:
+            return await self.executor.run(
+                self.create_embeddings, keywords, max_seq_length
+            )
+        try:
+            return await self.process_pool.encode(keywords, max_seq_length)
+        except Exception as e:
+            logger.error(f"Embedding creation failed in worker process: {str(e)}")
+            raise HTTPException(status_code=500, detail="Failed to create embeddings")
+
+    async def encode_keywords(self, keywords: List[str]) -> np.ndarray:
+        """Encode short texts, cut to EMBEDDING_KEYWORD_MAX_SEQ_LENGTH tokens."""
+        return await self.encode_batch(keywords, self.keyword_max_seq_length)
+
+    async def embed(self, keywords: List[str]) -> np.ndarray:
+        """Embed keywords, encoding only unique texts missing from the caches."""
+        unique = list(dict.fromkeys(keywords))
+        if not unique:
+            return await self.batcher.submit(keywords)
+
+        vectors = self.cache.get_many(self.vector_key, unique)
+        missing = [text for text, vector in zip(unique, vectors) if vector is None]
+        if missing:
+            logger.debug(f"Embedding cache missed {len(missing)}/{len(unique)} texts")
+            found = await self._fetch_missing(missing)
+            self.cache.put_many(
+                self.vector_key, missing, np.stack([found[text] for text in missing])
+            )
+            vectors = [
+                found[text] if vector is None else vector
+                for text, vector in zip(unique, vectors)
+            ]
+
+        # Scatter unique rows back to the original (possibly repeated) order
+        position = {text: i for i, text in enumerate(unique)}
+        return np.stack(vectors)[[position[text] for text in keywords]]
+
+    async def embed_bulk(self, keywords: List[str]) -> np.ndarray:
+        """Embed one-off bulk keywords without filling the caches or the store.
+
+        Vectors already in the in-process cache are reused, the rest are
+        encoded directly, so a large job neither evicts the hot interactive
+        keywords nor grows the store and the shared cache.
+        """
+        unique = list(dict.fromkeys(keywords))
+        if not unique:
+            return await self.encode_keywords(keywords)
+
+        vectors = self.cache.get_many(self.vector_key, unique)
+        missing = [text for text, vector in zip(unique, vectors) if vector is None]
+        if missing:
+            found = dict(zip(missing, await self.encode_keywords(missing)))
+            vectors = [
+                found[text] if vector is None else vector
+                for text, vector in zip(unique, vectors)
+            ]
+        position = {text: i for i, text in enumerate(unique)}
+        return np.stack(vectors)[[position[text] for text in keywords]]
+
+    async def _fetch_missing(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        if self.store is not None:
+            stored = await asyncio.to_thread(self.store.get_many, texts)
+            found.update(
+                (text, vector)
+                for text, vector in zip(texts, stored)
+                if vector is not None
+            )
+
+        remaining = [text for text in texts if text not in found]
+        if not remaining:
+            return found
+        shared = await SharedEmbeddingCache.get_many(self.vector_key, remaining)
+        found.update(
+            (text, vector)
+            for text, vector in zip(remaining, shared)
+            if vector is not None
+        )
+
+        to_encode = [text for text in remaining if text not in found]
+        if to_encode:
+            encoded = await self.batcher.submit(to_encode)
+            await SharedEmbeddingCache.put_many(self.vector_key, to_encode, encoded)
+            found.update(zip(to_encode, encoded))
+
+        # Persist everything the local store did not have yet
+        if self.store is not None:
+            await asyncio.to_thread(
+                self.store.append,
+                remaining,
+                np.stack([found[text] for text in remaining]),
+            )
+        return found
+
     def reduce_dimensions(
         self, embeddings: np.ndarray, n_components: Literal[2, 3] = 2
     ) -> np.ndarray:
         logger.debug(f"Reducing dimensions with {n_components} components")
-        pca = PCA(n_components=n_components)
-        return pca.fit_transform(embeddings)
+        return self.reducer.reduce(embeddings, n_components)
 
     def get_normalized_list(
         self, embeddings: np.ndarray, value_range: Tuple[float, float] = (0, 1)
     ) -> List[float]:
         logger.debug("Normalizing embeddings.")
-        scaler = MinMaxScaler(feature_range=value_range)
-        normalized = scaler.fit_transform(embeddings)
-        return normalized.tolist()
+        return self.reducer.normalize(embeddings, value_range).tolist()
+
+    def project(self, embeddings: np.ndarray) -> np.ndarray:
+        """Reduce and normalize in one go, so it costs a single executor job."""
+        return self.reducer.normalize(self.reduce_dimensions(embeddings))
 
     def get_embeddings(
         self, normalized_embeddings: List, keywords: List[str]
@@ -59,18 +250,233 @@ class EmbeddingService:
             ]
         )
 
+    async def basis(self) -> ProjectionBasis:
+        """Projection basis of these vectors, fitted on the reference texts on first use.
+
+        Keyed by ``vector_key``, since another backend or token cap moves the
+        vectors the basis was fitted on.
+        """
+        basis = self.bases.get(self.vector_key)
+        if basis is None:
+            texts = await asyncio.to_thread(
+                reference_texts, config.EMBEDDING_BASIS_VOCABULARY_FILE
+            )
+            vectors = await self.encode_batch(texts)
+            basis = await self.executor.run(
+                ProjectionBasis.fit, vectors, 2, config.EMBEDDING_BASIS_MARGIN
+            )
+            self.bases.put(self.vector_key, basis)
+        return basis
+
+    async def project_keywords(
+        self, keywords: List[str], projection: Optional[ProjectionMode] = None
+    ) -> List[List[float]]:
+        """Normalized 2D points of the keywords, in order."""
+        return (await self.project_points(keywords, projection)).tolist()
+
+    async def project_points(
+        self, keywords: List[str], projection: Optional[ProjectionMode] = None
+    ) -> np.ndarray:
+        """Normalized 2D points of the keywords as an ``(n, 2)`` matrix.
+
+        ``fit`` fits a PCA on the request's own keywords, ``basis`` projects
+        onto the model's stored basis; the default follows
+        EMBEDDING_PROJECTION.
+        """
+        projection = ProjectionMode(projection or config.EMBEDDING_PROJECTION)
+        try:
+            embeddings = await self.embed(keywords)
+            if projection == ProjectionMode.BASIS:
+                basis = await self.basis()
+                return await self.executor.run(basis.transform, embeddings)
+            return await self.executor.run(self.project, embeddings)
+        except HTTPException:
+            # Re-raise HTTP exceptions
+            raise
+        except Exception as e:
+            logger.error(f"Keyword processing failed: {str(e)}")
+            raise HTTPException(status_code=500, detail="Failed to process keywords")
+
     async def process_keywords(
         self,
         keywords: List[str],
+        projection: Optional[ProjectionMode] = None,
     ) -> Embeddings:
+        normalized = await self.project_keywords(keywords, projection)
+        return self.get_embeddings(normalized, keywords)
+
+    async def calibration(self, dimensions: int) -> np.ndarray:
+        """int8 ranges of these vectors at ``dimensions``, calibrated on first use."""
+        key = f"{self.vector_key}-{dimensions}d"
+        ranges = self.calibrations.get(key)
+        if ranges is None:
+            vectors = await self.encode_batch(list(CALIBRATION_TEXTS))
+            ranges = calibrate(truncate(vectors, dimensions))
+            self.calibrations.put(key, ranges)
+        return ranges
+
+    async def embed_output(
+        self,
+        keywords: List[str],
+        mode: VectorDType = VectorDType.FLOAT32,
+        dimensions: Optional[int] = None,
+    ) -> np.ndarray:
+        """Embed keywords, optionally truncated, then int8 or binary quantized.
+
+        Float modes come back as float32; the caller casts on serialization.
+        """
+        vectors = truncate(await self.embed(keywords), dimensions)
+        if mode == VectorDType.INT8:
+            return quantize_int8(vectors, await self.calibration(vectors.shape[1]))
+        if mode == VectorDType.BINARY:
+            return quantize_binary(vectors)
+        return vectors
+
+    async def _add_chunk(
+        self, projection: StreamingProjection, keywords: List[str]
+    ) -> None:
+        # Streamed keywords are mostly one-off, so they stay out of the caches
+        vectors = await self.embed_bulk(keywords)
+        await self.executor.run(projection.add, keywords, vectors)
+
+    async def stream_keywords(
+        self,
+        keywords: AsyncIterator[str],
+        projection_mode: Optional[ProjectionMode] = None,
+    ) -> StreamingProjection:
+        """Embed and fit a keyword stream chunk by chunk, spooling it to disk.
+
+        With the ``basis`` projection each chunk is projected as it arrives
+        and no vectors are spooled.
+        """
+        chunk_size = config.EMBEDDING_STREAM_CHUNK_SIZE
+        projection_mode = ProjectionMode(projection_mode or config.EMBEDDING_PROJECTION)
+        basis = await self.basis() if projection_mode == ProjectionMode.BASIS else None
+        projection = StreamingProjection(
+            chunk_size=chunk_size,
+            spool_dir=config.EMBEDDING_STREAM_SPOOL_DIR,
+            basis=basis,
+        )
         try:
-            embeddings = await asyncio.to_thread(self.create_embeddings, keywords)
-            reduced = await asyncio.to_thread(self.reduce_dimensions, embeddings)
-            normalized = await asyncio.to_thread(self.get_normalized_list, reduced)
-            return self.get_embeddings(normalized, keywords)
+            chunk: List[str] = []
+            async for keyword in keywords:
+                if (
+                    projection.count + len(chunk)
+                    >= config.EMBEDDING_STREAM_MAX_KEYWORDS
+                ):
+                    raise ValueError(
+                        f"At most {config.EMBEDDING_STREAM_MAX_KEYWORDS} keywords "
+                        "can be streamed"
+                    )
+                chunk.append(keyword)
+                if len(chunk) == chunk_size:
+                    await self._add_chunk(projection, chunk)
+                    chunk = []
+            if chunk:
+                await self._add_chunk(projection, chunk)
+            await self.executor.run(projection.finish)
+            return projection
         except HTTPException:
-            # Re-raise HTTP exceptions
+            projection.close()
             raise
+        except ValueError as e:
+            projection.close()
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
-            logger.error(f"Keyword processing failed: {str(e)}")
+            projection.close()
+            logger.error(f"Keyword stream processing failed: {str(e)}")
             raise HTTPException(status_code=500, detail="Failed to process keywords")
+
+    def chunker(self) -> DocumentChunker:
+        """Windows that fit the model's ``max_seq_length``, using its tokenizer."""
+        limit = getattr(self.model, "max_seq_length", None)
+        # Two tokens of every window go to [CLS] and [SEP]
+        max_tokens = (limit if isinstance(limit, int) else DEFAULT_MAX_SEQ_LENGTH) - 2
+        return DocumentChunker(
+            getattr(self.model, "tokenizer", None),
+            max_tokens=max_tokens,
+            overlap=min(config.EMBEDDING_DOCUMENT_OVERLAP_TOKENS, max_tokens - 1),
+        )
+
+    async def embed_document(
+        self, text: str, projection_mode: Optional[ProjectionMode] = None
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Pooled embedding of a long text, its chunks and their 2D points.
+
+        The text is chunked lazily and embedded EMBEDDING_DOCUMENT_BATCH_SIZE
+        chunks at a time. The chunk texts and vectors are kept for the
+        projection, so memory is O(chunks): the response lists every chunk
+        anyway, and EMBEDDING_DOCUMENT_MAX_CHUNKS bounds them (10,000 chunks
+        of a 384-dimensional model are 15 MB of float32). The document
+        embedding is the token-weighted mean of the chunk embeddings,
+        L2-normalized.
+        """
+        chunks = self.chunker().iter_chunks(iter_text_pieces(text))
+        projection_mode = ProjectionMode(projection_mode or config.EMBEDDING_PROJECTION)
+        try:
+            texts: List[str] = []
+            batches: List[np.ndarray] = []
+            pooled, total_tokens = 0.0, 0
+            while True:
+                batch = await self.executor.run(
+                    list, itertools.islice(chunks, config.EMBEDDING_DOCUMENT_BATCH_SIZE)
+                )
+                if not batch:
+                    break
+                if len(texts) + len(batch) > config.EMBEDDING_DOCUMENT_MAX_CHUNKS:
+                    raise ValueError(
+                        f"Documents are limited to "
+                        f"{config.EMBEDDING_DOCUMENT_MAX_CHUNKS} chunks"
+                    )
+                batch_texts = [chunk for chunk, _ in batch]
+                tokens = np.array([n_tokens for _, n_tokens in batch], dtype=np.float64)
+                # Full-length chunks skip the keyword cap and the keyword caches
+                vectors = await self.encode_batch(batch_texts)
+                pooled = pooled + tokens @ vectors
+                total_tokens += int(tokens.sum())
+                texts.extend(batch_texts)
+                batches.append(vectors)
+            if not texts:
+                raise ValueError("The document has no text to embed")
+
+            embedding = np.asarray(pooled / total_tokens, dtype=np.float32)
+            norm = np.linalg.norm(embedding)
+            if norm > 0:
+                embedding /= norm
+            vectors = np.concatenate(batches)
+            if projection_mode == ProjectionMode.BASIS:
+                basis = await self.basis()
+                points = await self.executor.run(basis.transform, vectors)
+            elif len(texts) == 1:
+                # Nothing to fit a PCA on; a lone point sits at the lower bound
+                points = np.zeros((1, 2))
+            else:
+                points = await self.executor.run(self.project, vectors)
+            return embedding, texts, points
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Document processing failed: {str(e)}")
+            raise HTTPException(status_code=500, detail="Failed to process document")
+
+    def close(self) -> None:
+        """Release the executor and worker processes held by this model."""
+        self.executor.shutdown()
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+
+    def get_stats(self) -> Dict:
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "batching": self.batcher.get_stats(),
+            "executor": self.executor.get_stats(),
+            "process_pool": (
+                self.process_pool.get_stats() if self.process_pool is not None else None
+            ),
+            "cache": self.cache.get_stats(),
+            "shared_cache": SharedEmbeddingCache.get_stats(),
+            "store": self.store.get_stats() if self.store is not None else None,
+        }
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.services.metrics import Histogram
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+LATENCY_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000, 2500)
+
+
+class InferenceExecutor:
+    """Dedicated, fixed-size thread pool for a model's CPU-bound work.
+
+    Keeping inference off the default pool means a burst of encodes cannot
+    starve the rest of the application's ``to_thread`` work, and the pool size
+    caps how many cores a model can claim at once.
+    """
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.wait_ms_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.run_ms_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def job() -> Any:
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            self.wait_ms_histogram.observe((started - submitted) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                self.run_ms_histogram.observe((time.perf_counter() - started) * 1000)
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._pool, job)
+
+    def shutdown(self) -> None:
+        logger.debug(f"Shutting down executor {self.name}")
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "wait_ms": self.wait_ms_histogram.snapshot(),
+            "run_ms": self.run_ms_histogram.snapshot(),
+        }
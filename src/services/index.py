@@ -0,0 +1,684 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.configs.env_config import config
+from src.models.collections import NAME_PATTERN
+from src.models.embedding import ModelName
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+# A search hit: item id, item text and cosine similarity
+Hit = Tuple[str, str, float]
+
+VECTOR_DTYPE = np.dtype("<f4")
+LIST_DTYPE = np.dtype("<i4")
+# Rows copied per block when a collection is compacted
+COPY_BLOCK_ROWS = 16384
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Unit-length float32 rows, so inner products are cosine similarities."""
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, ...]:
+    """Keep the k best columns of each row of ``scores``, unsorted."""
+    if scores.shape[1] <= k:
+        return scores, rows
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return (
+        np.take_along_axis(scores, best, axis=1),
+        np.take_along_axis(rows, best, axis=1),
+    )
+
+
+def exact_search(
+    queries: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    block_size: int = 16384,
+    live: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k inner products of every query, sorted best first.
+
+    The corpus is scanned in blocks so only one ``(queries, block)`` score
+    matrix is alive at a time and a memmapped corpus streams from disk. Rows
+    where the boolean mask ``live`` is false never rank above live ones.
+    Returns ``(scores, rows)``, both shaped ``(len(queries), min(k, n))``.
+    """
+    n_queries = len(queries)
+    best_scores = np.empty((n_queries, 0), dtype=np.float32)
+    best_rows = np.empty((n_queries, 0), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start : start + block_size])
+        scores = queries @ block.T
+        if live is not None:
+            scores[:, ~live[start : start + len(block)]] = -np.inf
+        rows = np.broadcast_to(
+            np.arange(start, start + len(block), dtype=np.int64), scores.shape
+        )
+        best_scores, best_rows = _top_k(
+            np.hstack((best_scores, scores)), np.hstack((best_rows, rows)), k
+        )
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(best_scores, order, axis=1),
+        np.take_along_axis(best_rows, order, axis=1),
+    )
+
+
+def assign(
+    vectors: np.ndarray, centroids: np.ndarray, block_size: int = 16384
+) -> np.ndarray:
+    """Index of the most similar centroid for every row."""
+    lists = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start : start + block_size])
+        lists[start : start + len(block)] = (block @ centroids.T).argmax(axis=1)
+    return lists
+
+
+def kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    n_iter: int = 10,
+    max_points_per_cluster: int = 256,
+    seed: int = 0,
+    rows: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Spherical k-means centroids, trained on a sample of the rows.
+
+    Like faiss, at most ``max_points_per_cluster`` rows per centroid are used,
+    which is plenty for a coarse quantizer and keeps training time flat.
+    ``rows`` restricts the sample to those row indices, sorted.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.arange(len(vectors)) if rows is None else rows
+    n_samples = min(len(rows), n_clusters * max_points_per_cluster)
+    sample = np.asarray(
+        vectors[rows[np.sort(rng.choice(len(rows), n_samples, replace=False))]]
+    )
+    centroids = sample[rng.choice(n_samples, n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = assign(sample, centroids)
+        counts = np.bincount(labels, minlength=n_clusters)
+        # Per-cluster sums in one pass over the rows sorted by cluster
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros_like(centroids)
+        filled = counts > 0
+        sums[filled] = np.add.reduceat(
+            sample[np.argsort(labels, kind="stable")], starts[filled]
+        )
+        # Empty clusters restart from random rows instead of collapsing
+        empty = counts == 0
+        sums[empty] = sample[rng.choice(n_samples, int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class VectorCollection:
+    """Named set of ``(id, text, vector)`` items with top-k cosine search.
+
+    Small collections are searched exactly. From ``ivf_min_size`` items an
+    IVF index can be trained with :meth:`train`: vectors are bucketed by
+    their nearest k-means centroid and a query only scans the ``nprobe``
+    closest buckets. New items join existing buckets; ``needs_training``
+    turns true again once the collection has doubled since the last training.
+
+    Like the embedding store, items are only ever appended: each generation
+    of files holds ``vectors-{n}.f32`` and ``lists-{n}.i32`` with a row per
+    insert and ``items-{n}.jsonl``, the id and text of every row followed by
+    tombstones for deleted ids. Replacing or deleting an item leaves a dead
+    row behind; once dead rows outnumber live ones, or when the index is
+    retrained, the live rows are copied to the next generation and
+    ``index.json`` is switched over to it. Vectors are memory-mapped, so idle
+    collections cost no RAM. As in the embedding store, writes from several
+    workers are serialised with ``flock`` and every call first replays what
+    the others appended since.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: ModelName,
+        directory: Optional[Path] = None,
+        ivf_min_size: int = 50_000,
+        nprobe: int = 16,
+    ) -> None:
+        self.name = name
+        self.model = model
+        self.directory = Path(directory) if directory else None
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._generation = 0
+        # Bytes of the item log replayed so far, always whole lines
+        self._log_bytes = 0
+        # Per row, dead ones included; _positions maps live ids to their row
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: Optional[np.ndarray] = None
+        self._live: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._trained_size = 0
+
+    def _path(self, name: str) -> Path:
+        if self.directory is None:
+            raise ValueError(f"Collection {self.name} is not stored on disk")
+        return self.directory / name
+
+    def _file(self, kind: str, generation: Optional[int] = None) -> Path:
+        suffix = {"vectors": "f32", "lists": "i32", "items": "jsonl"}
+        generation = self._generation if generation is None else generation
+        if kind == "centroids":
+            return self._path(f"centroids-{generation}.npy")
+        return self._path(f"{kind}-{generation}.{suffix[kind]}")
+
+    def _map(self, kind: str, dtype: np.dtype, shape: Tuple[int, ...]) -> np.memmap:
+        return np.memmap(self._file(kind), dtype=dtype, mode="r", shape=shape)
+
+    @contextmanager
+    def _flock(self, operation: int) -> Iterator[None]:
+        """Hold ``.lock`` across workers: shared to read, exclusive to write."""
+        if self.directory is None or (
+            operation == fcntl.LOCK_SH and not self.directory.exists()
+        ):
+            yield
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._path(".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reset(self) -> None:
+        self._ids, self._texts, self._positions = [], [], {}
+        self._vectors = self._centroids = self._lists = None
+        self._log_bytes = 0
+        self._trained_size = 0
+        self._changed()
+
+    def _refresh(self) -> None:
+        """Catch up with the files, which other workers may have written.
+
+        The caller holds the lock and a flock. A new generation, or a log
+        shorter than what was replayed, means the collection was compacted or
+        cleared elsewhere and is read again; otherwise only the log lines
+        appended since the last refresh are replayed.
+        """
+        if self.directory is None:
+            return
+        try:
+            meta = json.loads(self._path("index.json").read_text())
+        except FileNotFoundError:
+            if self._ids:
+                self._reset()
+            return
+        log = self._file("items", meta["generation"])
+        size = log.stat().st_size if log.exists() else 0
+        if meta["generation"] != self._generation or size < self._log_bytes:
+            self._reset()
+            self._generation = meta["generation"]
+        self._trained_size = meta["trained_size"]
+        if size == self._log_bytes:
+            return
+        self._replay()
+        rows = len(self._ids)
+        if not rows:
+            return
+        self._vectors = self._map("vectors", VECTOR_DTYPE, (rows, meta["dim"]))
+        if self._centroids is None and self._file("centroids").exists():
+            self._centroids = np.load(self._file("centroids"))
+        if self._centroids is not None:
+            # Rows only reach the log once their vectors and lists are written
+            self._lists = self._map("lists", LIST_DTYPE, (rows,))
+        self._changed()
+
+    def _replay(self) -> None:
+        """Apply the item log past ``_log_bytes``, up to its last whole line."""
+        with open(self._file("items"), "rb") as f:
+            f.seek(self._log_bytes)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                entry = json.loads(line)
+                if "deleted" in entry:
+                    for item_id in entry["deleted"]:
+                        self._positions.pop(item_id, None)
+                else:
+                    self._positions[entry["id"]] = len(self._ids)
+                    self._ids.append(entry["id"])
+                    self._texts.append(entry["text"])
+                self._log_bytes += len(line)
+
+    def _sync(self) -> None:
+        with self._flock(fcntl.LOCK_SH):
+            self._refresh()
+
+    def _append_rows(self, kind: str, rows: np.ndarray, start: int) -> None:
+        """Write rows after the first ``start``, dropping any torn tail first."""
+        rows = np.ascontiguousarray(rows)
+        row_bytes = rows.itemsize * int(np.prod(rows.shape[1:]))
+        with open(self._file(kind), "a+b") as f:
+            f.truncate(start * row_bytes)
+            f.write(rows.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _log(self, entries: Iterable[Dict]) -> None:
+        """Append to the item log, after the last line replayed."""
+        with open(self._file("items"), "a+b") as f:
+            # A line torn by a crashed writer is dropped
+            f.truncate(self._log_bytes)
+            f.writelines((json.dumps(entry) + "\n").encode() for entry in entries)
+
+    def _write(self, name: str, write) -> None:
+        # Written next to the target and renamed, so readers never see half a file
+        tmp = self._path(f".{name}.tmp")
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, self._path(name))
+
+    def _write_meta(self, dim: Optional[int]) -> None:
+        meta = {
+            "dim": dim,
+            "generation": self._generation,
+            "trained_size": self._trained_size,
+        }
+        self._write("index.json", lambda f: f.write(json.dumps(meta).encode()))
+
+    def _changed(self) -> None:
+        self._live = self._order = self._offsets = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._positions)
+
+    @property
+    def dim(self) -> Optional[int]:
+        with self._lock:
+            self._sync()
+            return None if self._vectors is None else self._vectors.shape[1]
+
+    @property
+    def index(self) -> str:
+        with self._lock:
+            self._sync()
+            return "ivf" if self._use_ivf() else "exact"
+
+    @property
+    def needs_training(self) -> bool:
+        """Whether the IVF index is missing or outgrown; see :meth:`train`."""
+        with self._lock:
+            self._sync()
+            return self._outgrown()
+
+    def _outgrown(self) -> bool:
+        return len(self._positions) >= self.ivf_min_size and (
+            self._centroids is None or len(self._positions) > 2 * self._trained_size
+        )
+
+    def _use_ivf(self) -> bool:
+        return self._centroids is not None and len(self._positions) >= self.ivf_min_size
+
+    def _live_rows(self) -> np.ndarray:
+        if self._live is None:
+            self._live = np.sort(np.fromiter(self._positions.values(), dtype=np.int64))
+        return self._live
+
+    def add(self, ids: Sequence[str], texts: Sequence[str], vectors: np.ndarray) -> int:
+        """Insert or replace items, returning the collection size."""
+        # The last occurrence of a repeated id wins
+        last = {item_id: i for i, item_id in enumerate(ids)}
+        rows = sorted(last.values())
+        ids = [ids[i] for i in rows]
+        texts = [texts[i] for i in rows]
+        vectors = normalize_rows(np.asarray(vectors)[rows])
+        with self._lock, self._flock(fcntl.LOCK_EX):
+            self._refresh()
+            if self._vectors is not None and vectors.shape[1] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Expected {self._vectors.shape[1]}-dimensional vectors, "
+                    f"got {vectors.shape[1]}"
+                )
+            start = len(self._ids)
+            lists = (
+                None if self._centroids is None else assign(vectors, self._centroids)
+            )
+            if self.directory is None:
+                self._vectors = (
+                    vectors
+                    if self._vectors is None
+                    else np.concatenate((self._vectors, vectors))
+                )
+                if self._lists is not None and lists is not None:
+                    self._lists = np.concatenate((self._lists, lists))
+                self._ids.extend(ids)
+                self._texts.extend(texts)
+                self._positions.update(
+                    (item_id, start + i) for i, item_id in enumerate(ids)
+                )
+                self._changed()
+            else:
+                if self._vectors is None:
+                    self._write_meta(vectors.shape[1])
+                # Vectors and lists go first, so a logged row always has both
+                self._append_rows("vectors", vectors, start)
+                if lists is not None:
+                    self._append_rows("lists", lists.astype(LIST_DTYPE), start)
+                self._log({"id": i, "text": t} for i, t in zip(ids, texts))
+                self._refresh()
+            self._compact_if_sparse()
+            return len(self._positions)
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Remove items by id, returning how many existed."""
+        with self._lock, self._flock(fcntl.LOCK_EX):
+            self._refresh()
+            removed = [
+                item_id for item_id in dict.fromkeys(ids) if item_id in self._positions
+            ]
+            if not removed:
+                return 0
+            if len(removed) == len(self._positions):
+                self._clear()
+                return len(removed)
+            for item_id in removed:
+                del self._positions[item_id]
+            self._changed()
+            if self.directory is not None:
+                self._log([{"deleted": removed}])
+                self._refresh()
+            self._compact_if_sparse()
+            return len(removed)
+
+    def _clear(self) -> None:
+        self._reset()
+        if self.directory is not None:
+            # An empty next generation, so other workers drop what they read
+            self._generation += 1
+            self._write_meta(None)
+            for path in self.directory.glob("*-*.*"):
+                path.unlink(missing_ok=True)
+
+    def _compact_if_sparse(self) -> None:
+        if len(self._ids) - len(self._positions) > len(self._positions):
+            self._rewrite(self._centroids)
+
+    def _rewrite(self, centroids: Optional[np.ndarray]) -> None:
+        """Copy the live rows into a new generation, listed under ``centroids``.
+
+        The caller holds the lock and, for a stored collection, the exclusive
+        flock. Vectors are copied a block at a time and assigned to their
+        list on the way, so the collection is never read into RAM at once.
+        """
+        rows = self._live_rows()
+        vectors = self._vectors
+        if vectors is None:
+            return
+        dim = vectors.shape[1]
+        if centroids is not None and len(rows) < self.ivf_min_size:
+            centroids = None
+        if centroids is None:
+            self._trained_size = 0
+        ids = [self._ids[row] for row in rows]
+        texts = [self._texts[row] for row in rows]
+
+        if self.directory is None:
+            self._vectors = np.asarray(vectors)[rows]
+            self._lists = (
+                None if centroids is None else assign(self._vectors, centroids)
+            )
+        else:
+            old = self._generation
+            self._generation += 1
+            with (
+                open(self._file("vectors"), "wb") as vectors_file,
+                open(self._file("lists"), "wb") as lists_file,
+            ):
+                for start in range(0, len(rows), COPY_BLOCK_ROWS):
+                    block = np.asarray(
+                        vectors[rows[start : start + COPY_BLOCK_ROWS]],
+                        dtype=VECTOR_DTYPE,
+                    )
+                    vectors_file.write(block.tobytes())
+                    if centroids is not None:
+                        lists_file.write(
+                            assign(block, centroids).astype(LIST_DTYPE).tobytes()
+                        )
+                os.fsync(vectors_file.fileno())
+                os.fsync(lists_file.fileno())
+            if centroids is not None:
+                np.save(self._file("centroids"), centroids)
+            self._log_bytes = 0
+            self._log({"id": i, "text": t} for i, t in zip(ids, texts))
+            # The switch to the new generation is this one atomic rename
+            self._write_meta(dim)
+            for path in self.directory.glob(f"*-{old}.*"):
+                path.unlink(missing_ok=True)
+            self._log_bytes = self._file("items").stat().st_size
+            self._vectors = self._map("vectors", VECTOR_DTYPE, (len(rows), dim))
+            self._lists = (
+                None
+                if centroids is None
+                else self._map("lists", LIST_DTYPE, (len(rows),))
+            )
+
+        self._ids, self._texts = ids, texts
+        self._positions = {item_id: i for i, item_id in enumerate(ids)}
+        self._centroids = centroids
+        self._changed()
+        logger.debug(f"Compacted collection {self.name} to {len(ids)} rows")
+
+    def train(self) -> bool:
+        """(Re)train the IVF centroids if ``needs_training``; CPU-heavy.
+
+        k-means runs on a snapshot without holding any lock, so searches and
+        writes carry on meanwhile; the live rows, including those added in
+        the meantime, are then rewritten under the new centroids. Returns
+        whether it trained, which it skips if another worker just did.
+        """
+        with self._lock:
+            self._sync()
+            if not self._outgrown() or self._vectors is None:
+                return False
+            vectors, rows = self._vectors, self._live_rows()
+        n_lists = max(1, int(np.sqrt(len(rows))))
+        logger.info(
+            f"Training IVF index of collection {self.name} "
+            f"with {n_lists} lists over {len(rows)} items"
+        )
+        centroids = kmeans(vectors, n_lists, rows=rows)
+        with self._lock, self._flock(fcntl.LOCK_EX):
+            self._refresh()
+            if not self._outgrown():
+                return False
+            self._trained_size = len(self._positions)
+            self._rewrite(centroids)
+        return True
+
+    def _inverted_lists(
+        self, lists: np.ndarray, n_lists: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Live rows grouped by IVF list, with each list's start offset."""
+        if self._order is None or self._offsets is None:
+            rows = self._live_rows()
+            row_lists = np.asarray(lists[rows])
+            self._order = rows[np.argsort(row_lists, kind="stable")]
+            counts = np.bincount(row_lists, minlength=n_lists)
+            self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        return self._order, self._offsets
+
+    def search(
+        self, queries: np.ndarray, k: int, nprobe: Optional[int] = None
+    ) -> List[List[Hit]]:
+        """Top-k items per query by cosine similarity, best first."""
+        queries = normalize_rows(queries)
+        with self._lock:
+            self._sync()
+            vectors = self._vectors
+            if vectors is None:
+                return [[] for _ in queries]
+            if queries.shape[1] != vectors.shape[1]:
+                raise ValueError(
+                    f"Expected {vectors.shape[1]}-dimensional queries, "
+                    f"got {queries.shape[1]}"
+                )
+            # Arrays are replaced and row lists only grow, so a snapshot is
+            # safe to read without the lock
+            ids, texts = self._ids, self._texts
+            live = None
+            if len(self._positions) < len(self._ids):
+                live = np.zeros(len(self._ids), dtype=bool)
+                live[self._live_rows()] = True
+            k = min(k, len(self._positions))
+            centroids, lists = self._centroids, self._lists
+            ivf = None
+            if self._use_ivf() and centroids is not None and lists is not None:
+                ivf = (centroids, *self._inverted_lists(lists, len(centroids)))
+
+        if ivf is None:
+            scores, rows = exact_search(queries, vectors, k, live=live)
+        else:
+            centroids, order, offsets = ivf
+            nprobe = min(nprobe or self.nprobe, len(centroids))
+            probes = np.argpartition(-(queries @ centroids.T), nprobe - 1, axis=1)
+            scores, rows = [], []
+            for query, lists in zip(queries, probes[:, :nprobe]):
+                # Sorted rows keep reads from a memmapped corpus sequential
+                candidates = np.sort(
+                    np.concatenate([order[offsets[i] : offsets[i + 1]] for i in lists])
+                )
+                best_scores, best = exact_search(
+                    query[np.newaxis], vectors[candidates], k
+                )
+                scores.append(best_scores[0])
+                rows.append(candidates[best[0]])
+        return [
+            [(ids[row], texts[row], float(score)) for score, row in zip(s, r)]
+            for s, r in zip(scores, rows)
+        ]
+
+    def drop(self) -> None:
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CollectionStore:
+    """Vector collections by name, under ``directory`` when one is set.
+
+    A collection's model is recorded in its ``meta.json``; its items are
+    only read from disk on first use.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ivf_min_size: int = 50_000,
+        nprobe: int = 16,
+    ) -> None:
+        self.directory = Path(directory) if directory else None
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self._collections: Dict[str, VectorCollection] = {}
+        self._lock = threading.Lock()
+
+    def _open(self, name: str, model: ModelName) -> VectorCollection:
+        collection = VectorCollection(
+            name,
+            model,
+            self.directory / name if self.directory else None,
+            ivf_min_size=self.ivf_min_size,
+            nprobe=self.nprobe,
+        )
+        self._collections[name] = collection
+        return collection
+
+    def _find(self, name: str) -> Optional[VectorCollection]:
+        """Open or existing collection; the caller holds ``self._lock``."""
+        if self.directory is None or not re.match(NAME_PATTERN, name):
+            return self._collections.get(name)
+        meta = self.directory / name / "meta.json"
+        if not meta.exists():
+            # Possibly dropped by another worker
+            self._collections.pop(name, None)
+            return None
+        if name in self._collections:
+            return self._collections[name]
+        return self._open(name, ModelName(json.loads(meta.read_text())["model"]))
+
+    def get(self, name: str) -> Optional[VectorCollection]:
+        with self._lock:
+            return self._find(name)
+
+    def create(self, name: str, model: ModelName) -> VectorCollection:
+        """Create a collection, or return the existing one for the same model."""
+        if not re.match(NAME_PATTERN, name):
+            raise ValueError(f"Invalid collection name {name!r}")
+        # Checked and created in one critical section, so two concurrent
+        # creates for different models cannot both succeed
+        with self._lock:
+            existing = self._find(name)
+            if existing is not None:
+                if existing.model != model:
+                    raise ValueError(
+                        f"Collection {name} already exists for model "
+                        f"{existing.model.value}"
+                    )
+                return existing
+            collection = self._open(name, model)
+            if collection.directory is not None:
+                collection.directory.mkdir(parents=True, exist_ok=True)
+                (collection.directory / "meta.json").write_text(
+                    json.dumps({"model": model.value})
+                )
+        logger.info(f"Created collection {name} for model {model.value}")
+        return collection
+
+    def drop(self, name: str) -> bool:
+        with self._lock:
+            collection = self._find(name)
+            if collection is None:
+                return False
+            self._collections.pop(name, None)
+            collection.drop()
+        return True
+
+    def names(self) -> List[str]:
+        names = set(self._collections)
+        if self.directory is not None and self.directory.exists():
+            names.update(
+                path.parent.name for path in self.directory.glob("*/meta.json")
+            )
+        return sorted(names)
+
+
+@lru_cache()
+def get_collection_store() -> CollectionStore:
+    return CollectionStore(
+        config.EMBEDDING_INDEX_DIR,
+        ivf_min_size=config.EMBEDDING_INDEX_IVF_MIN_SIZE,
+        nprobe=config.EMBEDDING_INDEX_NPROBE,
+    )
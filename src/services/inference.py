@@ -0,0 +1,120 @@
+import importlib.util
+import logging
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from src.configs.env_config import config
+from src.configs.runtime_config import configure_torch
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+INFERENCE_BACKENDS = ("torch", "int8", "onnx")
+
+# Modules each backend needs beyond the base install
+BACKEND_MODULES = {"onnx": ("optimum", "onnxruntime")}
+
+
+def get_backend(model_name: str) -> str:
+    """Inference backend configured for a model, falling back to the default."""
+    name = getattr(model_name, "value", model_name)
+    backend = config.EMBEDDING_BACKENDS.get(name, config.EMBEDDING_DEFAULT_BACKEND)
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(
+            f"Unknown inference backend {backend!r} for {name}, "
+            f"expected one of {INFERENCE_BACKENDS}"
+        )
+    return backend
+
+
+def check_backends() -> None:
+    """Fail fast when a configured backend is unknown or not installed.
+
+    Checked at startup so a missing extra surfaces before the first request
+    instead of as a load failure mid-traffic; nothing is imported here.
+    """
+    backends = {config.EMBEDDING_DEFAULT_BACKEND, *config.EMBEDDING_BACKENDS.values()}
+    for backend in sorted(backends):
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(
+                f"Unknown inference backend {backend!r}, "
+                f"expected one of {INFERENCE_BACKENDS}"
+            )
+        missing = [
+            module
+            for module in BACKEND_MODULES.get(backend, ())
+            if importlib.util.find_spec(module) is None
+        ]
+        if missing:
+            raise RuntimeError(
+                f"Inference backend {backend!r} needs {', '.join(missing)}; "
+                f"install it with `poetry install --extras {backend}`"
+            )
+
+
+def onnx_export_dir(model_name: str) -> Path:
+    """Where the ONNX export of a model is kept between loads."""
+    name = str(getattr(model_name, "value", model_name))
+    root = config.EMBEDDING_ONNX_CACHE_DIR or os.path.join(
+        os.environ.get("XDG_CACHE_HOME", "~/.cache"), "ai-toolbox", "onnx"
+    )
+    return Path(root).expanduser() / re.sub(r"[^\w.-]+", "--", name).strip("-")
+
+
+def _load_onnx(model_name: str) -> Any:
+    """Load the saved ONNX export, exporting and saving it on the first load.
+
+    The export is written to a temporary directory and renamed into place,
+    so workers loading at the same time never see half a model; the first
+    rename wins and the others keep their own copy in memory only.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    export_dir = onnx_export_dir(model_name)
+    if (export_dir / "onnx" / "model.onnx").exists():
+        return SentenceTransformer(str(export_dir), device="cpu", backend="onnx")
+
+    model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+    export_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=export_dir.parent, prefix=".export-")
+    try:
+        model.save_pretrained(staging)
+        os.rename(staging, export_dir)
+        logger.info(f"Saved ONNX export of {model_name} to {export_dir}")
+    except OSError as e:
+        logger.debug(f"ONNX export of {model_name} not saved: {str(e)}")
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return model
+
+
+def load_model(model_name: str, backend: str = "torch") -> Any:
+    """Load a SentenceTransformer on the requested CPU inference backend.
+
+    - ``torch``: the plain fp32 model.
+    - ``int8``: fp32 model with every ``nn.Linear`` dynamically quantized to int8.
+    - ``onnx``: ONNX Runtime graph (needs ``optimum[onnxruntime]``), exported
+      once and reloaded from EMBEDDING_ONNX_CACHE_DIR afterwards.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    configure_torch()
+    logger.debug(f"Loading model {model_name} on {backend} backend")
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "int8":
+        import torch
+
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    if backend == "onnx":
+        return _load_onnx(model_name)
+    raise ValueError(
+        f"Unknown inference backend {backend!r}, expected one of {INFERENCE_BACKENDS}"
+    )
@@ -0,0 +1,392 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator, List, Optional
+
+from src.configs.env_config import config
+from src.models.embedding import ModelName
+from src.models.jobs import Job, JobStatus
+from src.services.ndjson import parse_keyword
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    done_chunks INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT,
+    lease_until REAL
+)
+"""
+
+# Columns added after the first release, migrated on open
+LEASE_COLUMNS = {"owner": "TEXT", "lease_until": "REAL"}
+# A failing queue is retried after poll_interval_s doubled at most this often
+MAX_BACKOFF_DOUBLINGS = 5
+
+
+class LeaseLost(Exception):
+    """Another worker took the job over after this one's lease expired."""
+
+
+def iter_corpus(lines: Iterator[str], csv_format: bool) -> Iterator[str]:
+    """Keywords of an uploaded corpus, one per JSONL line or CSV row.
+
+    CSV files use the ``keyword`` column when the header has one, otherwise
+    the first column.
+    """
+    if not csv_format:
+        for line in lines:
+            if line.strip():
+                yield parse_keyword(line.encode("utf-8"))
+        return
+
+    column = 0
+    for i, row in enumerate(csv.reader(lines)):
+        if not row:
+            continue
+        if i == 0:
+            header = [cell.strip().lower() for cell in row]
+            if "keyword" in header:
+                column = header.index("keyword")
+                continue
+        if column >= len(row):
+            raise ValueError(f"Row {i + 1} has no column {column + 1}")
+        yield row[column]
+
+
+class JobQueue:
+    """Bulk embedding jobs persisted in SQLite, with inputs and results on disk.
+
+    Each job's keywords are copied to ``{data_dir}/{id}/keywords.jsonl`` and
+    progress is recorded per finished chunk, so a restarted worker resumes a
+    job where it stopped instead of starting over.
+
+    Several server workers can share the queue: a claim records its owner
+    and a lease the owner keeps renewing, and only jobs whose lease expired
+    (their worker died) are handed to another worker.
+    """
+
+    def __init__(self, data_dir: Path, chunk_size: int, lease_s: float = 60.0) -> None:
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.lease_s = lease_s
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.data_dir / "jobs.sqlite3", check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(SCHEMA)
+            columns = {
+                row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")
+            }
+            for name, kind in LEASE_COLUMNS.items():
+                if name not in columns:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.data_dir / job_id
+
+    def _execute(self, sql: str, *params: Any) -> List[sqlite3.Row]:
+        with self._lock, self._db:
+            return self._db.execute(sql, params).fetchall()
+
+    def _to_job(self, row: sqlite3.Row) -> Job:
+        status = JobStatus(row["status"])
+        results = []
+        if status == JobStatus.COMPLETED:
+            results = sorted(
+                path.name
+                for path in self.job_dir(row["id"]).iterdir()
+                if path.suffix in (".npy", ".parquet")
+            )
+        return Job(
+            id=row["id"],
+            model=ModelName(row["model"]),
+            status=status,
+            total=row["total"],
+            processed=min(row["done_chunks"] * row["chunk_size"], row["total"]),
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            results=results,
+        )
+
+    def submit(
+        self, model: ModelName, upload: IO[bytes], csv_format: bool, max_keywords: int
+    ) -> Job:
+        """Copy an uploaded corpus to the job directory and queue it."""
+        job_id = uuid.uuid4().hex
+        directory = self.job_dir(job_id)
+        directory.mkdir()
+        total = 0
+        try:
+            lines = (line.decode("utf-8") for line in upload)
+            with open(directory / "keywords.jsonl", "w", encoding="utf-8") as f:
+                for keyword in iter_corpus(lines, csv_format):
+                    total += 1
+                    if total > max_keywords:
+                        raise ValueError(f"At most {max_keywords} keywords per job")
+                    f.write(json.dumps(keyword) + "\n")
+            if total < 2:
+                raise ValueError(f"At least 2 keywords are required, got {total}")
+        except (ValueError, UnicodeDecodeError, csv.Error):
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, model, status, total, chunk_size, created_at, "
+            "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            job_id,
+            model.value,
+            JobStatus.QUEUED.value,
+            total,
+            self.chunk_size,
+            now,
+            now,
+        )
+        logger.info(f"Queued job {job_id} with {total} keywords for {model.value}")
+        return self._to_job(self._execute("SELECT * FROM jobs WHERE id = ?", job_id)[0])
+
+    def get(self, job_id: str) -> Optional[Job]:
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", job_id)
+        return self._to_job(rows[0]) if rows else None
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """Lease the oldest queued (or abandoned) job to this worker and return it."""
+        now = time.time()
+        rows = self._execute(
+            "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = ? OR (status = ? AND "
+            "coalesce(lease_until, 0) < ?) ORDER BY created_at LIMIT 1) RETURNING *",
+            JobStatus.RUNNING.value,
+            self.owner,
+            now + self.lease_s,
+            now,
+            JobStatus.QUEUED.value,
+            JobStatus.RUNNING.value,
+            now,
+        )
+        return rows[0] if rows else None
+
+    def renew(self, job_id: str) -> bool:
+        """Extend this worker's lease on a job; False once it lost the job."""
+        rows = self._execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? "
+            "AND status = ? RETURNING id",
+            time.time() + self.lease_s,
+            job_id,
+            self.owner,
+            JobStatus.RUNNING.value,
+        )
+        return bool(rows)
+
+    def advance(self, job_id: str, done_chunks: int) -> bool:
+        """Record progress and renew the lease; False once this worker lost the job."""
+        now = time.time()
+        rows = self._execute(
+            "UPDATE jobs SET done_chunks = ?, updated_at = ?, lease_until = ? "
+            "WHERE id = ? AND owner = ? AND status = ? RETURNING id",
+            done_chunks,
+            now,
+            now + self.lease_s,
+            job_id,
+            self.owner,
+            JobStatus.RUNNING.value,
+        )
+        return bool(rows)
+
+    def finish(
+        self, job_id: str, status: JobStatus, error: Optional[str] = None
+    ) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ?, "
+            "lease_until = NULL WHERE id = ? AND owner = ?",
+            status.value,
+            error,
+            time.time(),
+            job_id,
+            self.owner,
+        )
+
+    def requeue_expired(self) -> int:
+        """Put running jobs whose worker stopped renewing back in the queue."""
+        rows = self._execute(
+            "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL "
+            "WHERE status = ? AND coalesce(lease_until, 0) < ? RETURNING id",
+            JobStatus.QUEUED.value,
+            JobStatus.RUNNING.value,
+            time.time(),
+        )
+        return len(rows)
+
+    def release_claims(self) -> int:
+        """Requeue this worker's running jobs, so a shutdown need not wait out leases."""
+        rows = self._execute(
+            "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL "
+            "WHERE status = ? AND owner = ? RETURNING id",
+            JobStatus.QUEUED.value,
+            JobStatus.RUNNING.value,
+            self.owner,
+        )
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache()
+def get_job_queue() -> Optional[JobQueue]:
+    """The job queue, or None when EMBEDDING_JOB_DIR is not configured."""
+    if not config.EMBEDDING_JOB_DIR:
+        return None
+    return JobQueue(
+        Path(config.EMBEDDING_JOB_DIR),
+        config.EMBEDDING_JOB_CHUNK_SIZE,
+        lease_s=config.EMBEDDING_JOB_LEASE_S,
+    )
+
+
+class JobRunner:
+    """Background workers that drain the job queue chunk by chunk."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        acquire: Callable[[ModelName], Any],
+        release: Callable[[ModelName], None],
+        workers: int = 1,
+        poll_interval_s: float = 1.0,
+    ) -> None:
+        self.queue = queue
+        self.acquire = acquire
+        self.release = release
+        self.workers = workers
+        self.poll_interval_s = poll_interval_s
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        requeued = self.queue.requeue_expired()
+        if requeued:
+            logger.info(f"Resuming {requeued} interrupted jobs")
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        released = await asyncio.to_thread(self.queue.release_claims)
+        if released:
+            logger.info(f"Requeued {released} unfinished jobs")
+
+    def notify(self) -> None:
+        """Wake idle workers after a submit instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def _work(self) -> None:
+        failures = 0
+        while True:
+            try:
+                await self._work_once()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The queue itself failed (a locked or full disk, say): keep the
+                # worker alive and retry with a growing delay
+                failures += 1
+                delay = self.poll_interval_s * 2 ** min(failures, MAX_BACKOFF_DOUBLINGS)
+                logger.error(f"Job worker error, retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+    async def _work_once(self) -> None:
+        """Claim and run one job, or wait for one to be submitted."""
+        row = await asyncio.to_thread(self.queue.claim)
+        if row is None:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            return
+        try:
+            await self.run_job(row)
+            await asyncio.to_thread(self.queue.finish, row["id"], JobStatus.COMPLETED)
+            logger.info(f"Job {row['id']} completed")
+        except asyncio.CancelledError:
+            # Requeued by stop, or by another worker once the lease expires
+            raise
+        except LeaseLost:
+            logger.warning(f"Job {row['id']} was taken over by another worker")
+        except Exception as e:
+            logger.error(f"Job {row['id']} failed: {str(e)}")
+            detail = getattr(e, "detail", None) or str(e)
+            await asyncio.to_thread(
+                self.queue.finish, row["id"], JobStatus.FAILED, detail
+            )
+
+    async def run_job(self, row: sqlite3.Row) -> None:
+        # Imported here so the ML stack only loads once a job actually runs
+        from src.services.results import JobResults
+
+        model = ModelName(row["model"])
+        total, chunk_size = row["total"], row["chunk_size"]
+        results = JobResults(self.queue.job_dir(row["id"]), total)
+        heartbeat = asyncio.create_task(self._heartbeat(row["id"]))
+        service = await asyncio.to_thread(self.acquire, model)
+        try:
+            with open(results.keywords_path, encoding="utf-8") as f:
+                # Skip the chunks a previous run already wrote
+                for _ in range(row["done_chunks"] * chunk_size):
+                    f.readline()
+                n_chunks = -(-total // chunk_size)
+                for chunk in range(row["done_chunks"], n_chunks):
+                    start = chunk * chunk_size
+                    size = min(chunk_size, total - start)
+                    keywords = [json.loads(f.readline()) for _ in range(size)]
+                    vectors = await service.embed_bulk(keywords)
+                    # Never write over a chunk that now belongs to another worker
+                    if not await asyncio.to_thread(self.queue.renew, row["id"]):
+                        raise LeaseLost(row["id"])
+                    await asyncio.to_thread(results.write_vectors, start, vectors)
+                    if not await asyncio.to_thread(
+                        self.queue.advance, row["id"], chunk + 1
+                    ):
+                        raise LeaseLost(row["id"])
+            await service.executor.run(results.finalize, chunk_size)
+        finally:
+            heartbeat.cancel()
+            await asyncio.to_thread(self.release, model)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Keep the lease alive through long chunks and the final projection."""
+        while True:
+            await asyncio.sleep(self.queue.lease_s / 3)
+            if not await asyncio.to_thread(self.queue.renew, job_id):
+                return
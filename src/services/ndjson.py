@@ -0,0 +1,28 @@
+import json
+from typing import AsyncIterator
+
+
+def parse_keyword(line: bytes) -> str:
+    """One NDJSON line: a JSON string or an object with a ``keyword`` field."""
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON line: {e.msg}") from None
+    if isinstance(value, dict):
+        value = value.get("keyword")
+    if not isinstance(value, str):
+        raise ValueError("Each line must be a string or an object with a keyword")
+    return value
+
+
+async def iter_ndjson_keywords(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into keywords without holding more than one line."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield parse_keyword(line)
+    if buffer.strip():
+        yield parse_keyword(buffer)
@@ -0,0 +1,98 @@
+import logging
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.configs.env_config import config
+from src.services.store import JSONModelStore
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+# Generic vocabulary spanning many topics, embedded once per model to find the
+# value range of each dimension for int8 quantization
+CALIBRATION_TEXTS = (
+    "machine learning, neural network, database index, cloud computing, "
+    "web server, programming language, operating system, encryption key, "
+    "mountain, river, ocean, forest, desert, island, volcano, glacier, "
+    "weather forecast, climate change, solar energy, wind turbine, "
+    "apple, banana, bread, cheese, coffee, chocolate, soup, salad, "
+    "football, basketball, tennis, swimming, marathon, chess, cycling, "
+    "piano, guitar, symphony, jazz, painting, sculpture, poetry, novel, "
+    "doctor, hospital, vaccine, surgery, medicine, nutrition, exercise, "
+    "bank account, stock market, inflation, mortgage, invoice, tax return, "
+    "election, parliament, constitution, court ruling, tax policy, treaty, "
+    "car engine, airplane, railway, bicycle, highway, harbour, spaceship, "
+    "dog, cat, horse, eagle, shark, butterfly, elephant, bacteria, "
+    "happiness, anger, fear, curiosity, friendship, grief, nostalgia, "
+    "history, philosophy, mathematics, chemistry, biology, linguistics, "
+    "kitchen, bedroom, garden, office, library, museum, airport, school, "
+    "red, blue, green, bright, dark, heavy, small, ancient, modern, fast, "
+    "how to bake sourdough bread at home, best hiking trails near the coast, "
+    "quarterly revenue grew by ten percent, the patient reported mild symptoms, "
+    "install the package and restart the server, a quiet evening by the lake"
+).split(", ")
+
+
+def calibrate(vectors: np.ndarray) -> np.ndarray:
+    """Per-dimension ``[min, max]`` ranges, shape ``(2, dim)``."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return np.stack((vectors.min(axis=0), vectors.max(axis=0)))
+
+
+def truncate(vectors: np.ndarray, dimensions: Optional[int]) -> np.ndarray:
+    """Keep the leading dimensions and re-normalize, Matryoshka style."""
+    if dimensions is None or dimensions >= vectors.shape[1]:
+        return vectors
+    truncated = np.asarray(vectors[:, :dimensions], dtype=np.float32)
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return truncated / norms
+
+
+def quantize_int8(vectors: np.ndarray, ranges: np.ndarray) -> np.ndarray:
+    """Map each dimension's calibrated range linearly onto -128..127."""
+    low, high = ranges[0, : vectors.shape[1]], ranges[1, : vectors.shape[1]]
+    steps = (high - low) / 255
+    steps[steps == 0] = 1
+    scaled = (vectors - low) / steps - 128
+    return np.clip(np.rint(scaled), -128, 127).astype(np.int8)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """One sign bit per dimension, packed eight to a byte."""
+    return np.packbits(vectors > 0, axis=-1)
+
+
+# Number of set bits of every byte value
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(
+    axis=1
+)
+
+
+def hamming_distances(queries: np.ndarray, corpus: np.ndarray) -> np.ndarray:
+    """Pairwise Hamming distances between packed binary vectors."""
+    return POPCOUNT[queries[:, np.newaxis, :] ^ corpus[np.newaxis, :, :]].sum(axis=-1)
+
+
+class CalibrationStore(JSONModelStore):
+    """int8 calibration ranges per model, persisted as JSON when a directory is set.
+
+    Every worker derives the same ranges from ``CALIBRATION_TEXTS``, so int8
+    vectors stay comparable across workers and restarts even without a
+    directory; persisting them just skips the calibration encode.
+    """
+
+    label = "int8 calibration"
+
+    def to_json(self, ranges: np.ndarray) -> Dict:
+        return {"min": ranges[0].tolist(), "max": ranges[1].tolist()}
+
+    def from_json(self, data: Dict) -> np.ndarray:
+        return np.array([data["min"], data["max"]], dtype=np.float32)
+
+
+@lru_cache()
+def get_calibration_store() -> CalibrationStore:
+    return CalibrationStore(config.EMBEDDING_CALIBRATION_DIR)
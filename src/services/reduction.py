@@ -0,0 +1,245 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple, Type
+
+import numpy as np
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+def _as_float_array(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype in (np.float32, np.float64):
+        return values
+    return values.astype(np.float64)
+
+
+def _flip_signs(components: np.ndarray) -> np.ndarray:
+    """Make the largest loading of each component positive, as sklearn does."""
+    max_abs = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(components.shape[0]), max_abs])
+    signs[signs == 0] = 1
+    components *= signs[:, np.newaxis]
+    return components
+
+
+def _top_eigh(matrix: np.ndarray, n_components: int) -> Tuple[np.ndarray, ...]:
+    """Largest eigenpairs of a symmetric matrix, largest first.
+
+    scipy (installed with scikit-learn) solves for just these eigenpairs,
+    several times faster than numpy's full decomposition.
+    """
+    from scipy.linalg import eigh
+
+    size = len(matrix)
+    eigenvalues, eigenvectors = eigh(
+        matrix, subset_by_index=[size - n_components, size - 1]
+    )
+    return eigenvalues[::-1], eigenvectors[:, ::-1]
+
+
+def randomized_components(
+    centered: np.ndarray,
+    n_components: int,
+    n_oversamples: int = 10,
+    n_iter: int = 4,
+    seed: int = 0,
+) -> np.ndarray:
+    """Top principal axes of centered data via a seeded randomized range finder."""
+    rng = np.random.default_rng(seed)
+    sketch = rng.standard_normal(
+        (centered.shape[1], n_components + n_oversamples)
+    ).astype(centered.dtype, copy=False)
+    q, _ = np.linalg.qr(centered @ sketch)
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(centered.T @ q)
+        q, _ = np.linalg.qr(centered @ q)
+    _, _, vt = np.linalg.svd(q.T @ centered, full_matrices=False)
+    return vt[:n_components]
+
+
+class Reducer(ABC):
+    """Projection to 2-3 dimensions followed by min-max normalization."""
+
+    name: str = ""
+
+    @abstractmethod
+    def reduce(self, embeddings: np.ndarray, n_components: int = 2) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def normalize(
+        self, values: np.ndarray, value_range: Tuple[float, float] = (0, 1)
+    ) -> np.ndarray:
+        pass
+
+
+class NumpyReducer(Reducer):
+    """Estimator-free PCA and min-max scaling with sklearn-identical output.
+
+    Components come from the eigendecomposition of the covariance matrix when
+    there are at least as many samples as features, and of the Gram matrix
+    otherwise, so the eigenproblem is sized by the smaller side. Once that side
+    exceeds ``randomized_min_dim`` a seeded randomized SVD is used instead.
+    """
+
+    name = "numpy"
+
+    def __init__(self, randomized_min_dim: int = 1_000) -> None:
+        self.randomized_min_dim = randomized_min_dim
+
+    def components(self, centered: np.ndarray, n_components: int) -> np.ndarray:
+        n_samples, n_features = centered.shape
+        if min(n_samples, n_features) > self.randomized_min_dim:
+            components = randomized_components(centered, n_components)
+        elif n_samples >= n_features:
+            # Tall inputs (a document's chunks): eigh of the d x d covariance
+            _, eigenvectors = _top_eigh(centered.T @ centered, n_components)
+            components = eigenvectors.T.copy()
+        else:
+            # Wide inputs (a request's keywords): eigh of the n x n Gram matrix
+            eigenvalues, top = _top_eigh(centered @ centered.T, n_components)
+            singular = np.sqrt(np.clip(eigenvalues, 0, None))
+            singular[singular == 0] = 1
+            components = (top.T @ centered) / singular[:, np.newaxis]
+        return _flip_signs(components)
+
+    def reduce(self, embeddings: np.ndarray, n_components: int = 2) -> np.ndarray:
+        values = _as_float_array(embeddings)
+        if n_components > min(values.shape):
+            raise ValueError(
+                f"n_components={n_components} must be between 0 and "
+                f"min(n_samples, n_features)={min(values.shape)}"
+            )
+        centered = values - values.mean(axis=0)
+        return centered @ self.components(centered, n_components).T
+
+    def normalize(
+        self, values: np.ndarray, value_range: Tuple[float, float] = (0, 1)
+    ) -> np.ndarray:
+        values = np.array(_as_float_array(values), copy=True)
+        data_min = values.min(axis=0)
+        data_range = values.max(axis=0) - data_min
+        # Constant columns map to the lower bound, like MinMaxScaler
+        data_range[data_range == 0.0] = 1.0
+        scale = (value_range[1] - value_range[0]) / data_range
+        values *= scale
+        values += value_range[0] - data_min * scale
+        return values
+
+
+class IncrementalPCA:
+    """PCA fitted one batch at a time in memory independent of the sample count.
+
+    Follows sklearn's ``IncrementalPCA`` update: each batch is stacked under
+    the current scaled components plus a mean-correction row and re-solved with
+    a small SVD. Keeping only ``n_components`` axes between batches drifts far
+    from the exact PCA, so ``n_oversamples`` extra axes are carried along.
+    """
+
+    def __init__(self, n_components: int = 2, n_oversamples: int = 16) -> None:
+        self.n_components = n_components
+        self.n_kept = n_components + n_oversamples
+        self.n_samples_seen = 0
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.singular_values: Optional[np.ndarray] = None
+
+    def partial_fit(self, batch: np.ndarray) -> "IncrementalPCA":
+        batch = np.asarray(batch, dtype=np.float64)
+        n_new = batch.shape[0]
+        if not n_new:
+            return self
+        batch_mean = batch.mean(axis=0)
+        n_total = self.n_samples_seen + n_new
+        centered = batch - batch_mean
+        components, singular_values = self.components, self.singular_values
+        if components is not None and singular_values is not None:
+            correction = np.sqrt(self.n_samples_seen * n_new / n_total) * (
+                self.mean - batch_mean
+            )
+            centered = np.vstack(
+                (
+                    singular_values[:, np.newaxis] * components,
+                    centered,
+                    correction,
+                )
+            )
+            self.mean = self.mean + (batch_mean - self.mean) * (n_new / n_total)
+        else:
+            self.mean = batch_mean
+        _, singular, vt = np.linalg.svd(centered, full_matrices=False)
+        self.components = _flip_signs(vt[: self.n_kept])
+        self.singular_values = singular[: self.n_kept]
+        self.n_samples_seen = n_total
+        return self
+
+    def transform(self, batch: np.ndarray) -> np.ndarray:
+        if self.components is None or len(self.components) < self.n_components:
+            raise ValueError(
+                f"n_components={self.n_components} must be between 0 and "
+                f"n_samples_seen={self.n_samples_seen}"
+            )
+        components = self.components[: self.n_components]
+        return (np.asarray(batch, dtype=np.float64) - self.mean) @ components.T
+
+
+class RunningMinMax:
+    """Min-max scaling whose bounds are accumulated batch by batch."""
+
+    def __init__(self) -> None:
+        self.data_min: Optional[np.ndarray] = None
+        self.data_max: Optional[np.ndarray] = None
+
+    def update(self, values: np.ndarray) -> None:
+        batch_min, batch_max = values.min(axis=0), values.max(axis=0)
+        if self.data_min is None:
+            self.data_min, self.data_max = batch_min, batch_max
+        else:
+            self.data_min = np.minimum(self.data_min, batch_min)
+            self.data_max = np.maximum(self.data_max, batch_max)
+
+    def normalize(
+        self, values: np.ndarray, value_range: Tuple[float, float] = (0, 1)
+    ) -> np.ndarray:
+        data_min, data_max = self.data_min, self.data_max
+        if data_min is None or data_max is None:
+            raise ValueError("RunningMinMax.normalize called before any update")
+        data_range = data_max - data_min
+        data_range[data_range == 0.0] = 1.0
+        scale = (value_range[1] - value_range[0]) / data_range
+        return values * scale + (value_range[0] - data_min * scale)
+
+
+class SklearnReducer(Reducer):
+    """Reference implementation on top of sklearn estimators."""
+
+    name = "sklearn"
+
+    def reduce(self, embeddings: np.ndarray, n_components: int = 2) -> np.ndarray:
+        from sklearn.decomposition import PCA
+
+        return PCA(n_components=n_components).fit_transform(embeddings)
+
+    def normalize(
+        self, values: np.ndarray, value_range: Tuple[float, float] = (0, 1)
+    ) -> np.ndarray:
+        from sklearn.preprocessing import MinMaxScaler
+
+        return MinMaxScaler(feature_range=value_range).fit_transform(values)
+
+
+REDUCERS: Dict[str, Type[Reducer]] = {
+    NumpyReducer.name: NumpyReducer,
+    SklearnReducer.name: SklearnReducer,
+}
+
+
+def get_reducer(name: str) -> Reducer:
+    try:
+        return REDUCERS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown reducer {name!r}, expected one of {sorted(REDUCERS)}"
+        ) from None
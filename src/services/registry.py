@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.services.metrics import rss_bytes
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+def parameter_bytes(service: Any) -> int:
+    """Size of a torch model's parameters and buffers, 0 for other backends."""
+    model: Any = getattr(service, "model", None)
+    if not callable(getattr(model, "parameters", None)):
+        return 0
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+@dataclass
+class _Entry:
+    service: Any
+    footprint: int
+    in_flight: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ModelRegistry:
+    """Keep embedding models resident within an RSS budget.
+
+    Each model's footprint is the RSS growth measured while it loads (loads
+    are serialised so the deltas do not mix), floored at the size of its
+    parameters since freed memory from an evicted model is often reused. When
+    the budget is exceeded the least recently used models are evicted, but
+    only once no request is still using them; a busy model is skipped and
+    retried on release. ``acquire`` and ``release`` block on loads and
+    evictions, so async callers run them in a thread.
+    """
+
+    def __init__(self, budget_bytes: int, factory: Callable[[Any], Any]) -> None:
+        self.budget_bytes = budget_bytes
+        self.factory = factory
+        self.loads = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(entry.footprint for entry in self._entries.values())
+
+    def _pin(self, model: Hashable, entry: _Entry) -> None:
+        """Mark the entry in use; the caller holds ``self._lock``."""
+        entry.in_flight += 1
+        entry.last_used = time.monotonic()
+        self._entries.move_to_end(model)
+
+    def _load(self, model: Hashable) -> _Entry:
+        """Load the model, returning its entry already pinned."""
+        with self._load_lock:
+            with self._lock:
+                entry = self._entries.get(model)
+                if entry is not None:
+                    self._pin(model, entry)
+                    return entry
+
+            before = rss_bytes()
+            service = self.factory(model)
+            footprint = max(rss_bytes() - before, parameter_bytes(service))
+            entry = _Entry(service=service, footprint=footprint)
+            with self._lock:
+                # Inserted pinned, so no eviction can slip in before the caller
+                self._entries[model] = entry
+                self._pin(model, entry)
+                self.loads += 1
+            logger.info(f"Loaded model {model} ({footprint / 2**20:.0f} MB)")
+            return entry
+
+    def acquire(self, model: Hashable) -> Any:
+        """Return the model's service and pin it until ``release`` is called."""
+        with self._lock:
+            entry = self._entries.get(model)
+            if entry is not None:
+                self._pin(model, entry)
+        if entry is None:
+            entry = self._load(model)
+        self._evict_over_budget()
+        return entry.service
+
+    def acquire_loaded(self, model: Hashable) -> Optional[Any]:
+        """Pin and return the model's service if it is resident, never loading it."""
+        with self._lock:
+            entry = self._entries.get(model)
+            if entry is None:
+                return None
+            self._pin(model, entry)
+            return entry.service
+
+    def release(self, model: Hashable) -> None:
+        """Unpin the model, evicting over budget; blocking, as closing can be slow."""
+        with self._lock:
+            entry = self._entries.get(model)
+            if entry is not None:
+                entry.in_flight -= 1
+        self._evict_over_budget()
+
+    def footprint(self, model: Hashable) -> int:
+        """Measured footprint of a resident model, 0 when it is not loaded."""
+        with self._lock:
+            entry = self._entries.get(model)
+            return entry.footprint if entry is not None else 0
+
+    def _evict_over_budget(self) -> None:
+        evicted = []
+        with self._lock:
+            for model in list(self._entries):
+                if self.resident_bytes <= self.budget_bytes:
+                    break
+                # Never evict the most recently used model, nor a busy one
+                if model == next(reversed(self._entries)):
+                    break
+                if self._entries[model].in_flight == 0:
+                    evicted.append((model, self._entries.pop(model)))
+                    self.evictions += 1
+        for model, entry in evicted:
+            self._close(model, entry)
+
+    def _close(self, model: Hashable, entry: _Entry) -> None:
+        logger.info(f"Evicting model {model} ({entry.footprint / 2**20:.0f} MB)")
+        close = getattr(entry.service, "close", None)
+        if callable(close):
+            close()
+
+    def clear(self) -> None:
+        with self._lock:
+            entries, self._entries = list(self._entries.items()), OrderedDict()
+        for model, entry in entries:
+            self._close(model, entry)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            resident = {
+                str(getattr(model, "value", model)): {
+                    "footprint_bytes": entry.footprint,
+                    "in_flight": entry.in_flight,
+                    "idle_s": round(time.monotonic() - entry.last_used, 3),
+                }
+                for model, entry in self._entries.items()
+            }
+        return {
+            "budget_bytes": self.budget_bytes,
+            "resident_bytes": sum(m["footprint_bytes"] for m in resident.values()),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "resident": resident,
+        }
@@ -0,0 +1,111 @@
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from src.services.reduction import IncrementalPCA, RunningMinMax
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+class JobResults:
+    """On-disk outputs of a bulk embedding job.
+
+    ``vectors.npy`` is filled chunk by chunk through a memmap, so a job of any
+    size is written without holding its vectors in RAM. ``finalize`` fits the
+    2D projection over it the same way and writes ``coordinates.npy``, plus
+    ``results.parquet`` when pyarrow is installed.
+    """
+
+    def __init__(self, directory: Path, total: int) -> None:
+        self.directory = Path(directory)
+        self.total = total
+        self.keywords_path = self.directory / "keywords.jsonl"
+        self.vectors_path = self.directory / "vectors.npy"
+        self.coordinates_path = self.directory / "coordinates.npy"
+        self.parquet_path = self.directory / "results.parquet"
+
+    def write_vectors(self, start: int, vectors: np.ndarray) -> None:
+        if self.vectors_path.exists():
+            output = open_memmap(self.vectors_path, mode="r+")
+        else:
+            output = open_memmap(
+                self.vectors_path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(self.total, vectors.shape[1]),
+            )
+        output[start : start + len(vectors)] = vectors
+        output.flush()
+        del output
+
+    def _chunks(self, chunk_size: int) -> Iterator[slice]:
+        for start in range(0, self.total, chunk_size):
+            yield slice(start, min(start + chunk_size, self.total))
+
+    def _iter_keywords(self, chunk_size: int) -> Iterator[List[str]]:
+        with open(self.keywords_path, encoding="utf-8") as f:
+            for rows in self._chunks(chunk_size):
+                yield [json.loads(f.readline()) for _ in range(rows.stop - rows.start)]
+
+    def finalize(self, chunk_size: int) -> None:
+        """Fit the projection over all vectors and write the derived files."""
+        vectors = np.load(self.vectors_path, mmap_mode="r")
+        pca = IncrementalPCA(n_components=2)
+        for rows in self._chunks(chunk_size):
+            pca.partial_fit(vectors[rows])
+
+        bounds = RunningMinMax()
+        coordinates = open_memmap(
+            self.coordinates_path, mode="w+", dtype=np.float64, shape=(self.total, 2)
+        )
+        for rows in self._chunks(chunk_size):
+            coordinates[rows] = pca.transform(vectors[rows])
+            bounds.update(coordinates[rows])
+        for rows in self._chunks(chunk_size):
+            coordinates[rows] = bounds.normalize(coordinates[rows])
+        coordinates.flush()
+
+        self._write_parquet(vectors, coordinates, chunk_size)
+        del coordinates, vectors
+
+    def _write_parquet(
+        self, vectors: np.ndarray, coordinates: np.ndarray, chunk_size: int
+    ) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.debug("pyarrow not installed, skipping Parquet results")
+            return
+
+        schema = pa.schema(
+            [
+                ("keyword", pa.string()),
+                ("x", pa.float64()),
+                ("y", pa.float64()),
+                ("vector", pa.list_(pa.float32(), vectors.shape[1])),
+            ]
+        )
+        with pq.ParquetWriter(self.parquet_path, schema) as writer:
+            for rows, keywords in zip(
+                self._chunks(chunk_size), self._iter_keywords(chunk_size)
+            ):
+                flat = pa.array(np.ascontiguousarray(vectors[rows]).ravel())
+                writer.write_table(
+                    pa.table(
+                        {
+                            "keyword": keywords,
+                            "x": coordinates[rows, 0],
+                            "y": coordinates[rows, 1],
+                            "vector": pa.FixedSizeListArray.from_arrays(
+                                flat, vectors.shape[1]
+                            ),
+                        },
+                        schema=schema,
+                    )
+                )
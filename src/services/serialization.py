@@ -0,0 +1,122 @@
+import base64
+import json
+from typing import Any, Dict, Generic, List, Sequence, Type, TypeVar
+
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - a declared dependency, kept safe to miss
+    orjson = None
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def _default(value: Any) -> Any:
+    # NumPy arrays orjson cannot take natively, or any array without orjson
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON, through orjson when it is installed.
+
+    NumPy arrays are accepted anywhere in ``content``; orjson writes
+    contiguous ones natively without going through Python floats.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        content, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with ``dumps``; pre-rendered bytes pass through."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+class JSONBody(Generic[Model]):
+    """Validate a request body straight from bytes with a cached TypeAdapter.
+
+    Skips FastAPI's ``json.loads`` plus per-field validation round; errors are
+    raised in FastAPI's own 422 format. ``openapi`` documents the body, which
+    FastAPI cannot infer for a raw ``Request``.
+    """
+
+    def __init__(self, model: Type[Model]) -> None:
+        self.model = model
+        self.adapter: TypeAdapter[Model] = TypeAdapter(model)
+
+    def parse(self, body: bytes) -> Model:
+        try:
+            return self.adapter.validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", *error["loc"])}
+                    for error in e.errors(include_url=False)
+                ],
+                body=body,
+            )
+
+    @property
+    def openapi(self) -> Dict[str, Any]:
+        return {
+            "requestBody": {
+                "content": {
+                    "application/json": {"schema": self.model.model_json_schema()}
+                },
+                "required": True,
+            }
+        }
+
+
+def render_embeddings(
+    keywords: Sequence[str], points: List[List[float]], **extra: Any
+) -> bytes:
+    """Serialize ``Embeddings`` directly from projected points, no models built.
+
+    ``extra`` keys are added to the top-level object, as in every renderer.
+    """
+    return dumps(
+        {
+            "keywords": [
+                {"word": word, "x": x, "y": y} for word, (x, y) in zip(keywords, points)
+            ],
+            **extra,
+        }
+    )
+
+
+def render_columnar(keywords: Sequence[str], points: Any, **extra: Any) -> bytes:
+    """Serialize an ``(n, 2)`` point matrix as parallel ``words``/``x``/``y`` arrays."""
+    # Transposed copy, so each coordinate column is contiguous for orjson
+    x, y = points.T.copy()
+    return dumps({"words": list(keywords), "x": x, "y": y, **extra})
+
+
+def render_packed(keywords: Sequence[str], points: Any, **extra: Any) -> bytes:
+    """Like ``render_columnar`` with ``x``/``y`` as base64 little-endian float32."""
+
+    def pack(column: Any) -> str:
+        return base64.b64encode(column.astype("<f4").tobytes()).decode("ascii")
+
+    return dumps(
+        {
+            "words": list(keywords),
+            "dtype": "float32",
+            "x": pack(points[:, 0]),
+            "y": pack(points[:, 1]),
+            **extra,
+        }
+    )
@@ -0,0 +1,112 @@
+__all__ = ["SharedEmbeddingCache"]
+
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Hashable, List, Optional, Sequence
+
+from .backends import SharedCacheBackend
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SharedEmbeddingCache:
+    """Second-level embedding cache shared by every worker and replica.
+
+    Vectors are stored as float16 blobs under
+    ``{prefix}:{namespace}:{model}:{sha1(text)}``, where ``model`` is the
+    service's vector key naming the model, backend and token cap. Bump the
+    namespace whenever the model weights change so stale vectors are never
+    served.
+    """
+
+    backend: Optional[SharedCacheBackend] = None
+    prefix: str = "embedding"
+    namespace: str = "v1"
+    ttl: int = 7 * 24 * 3600
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @classmethod
+    async def init(
+        cls,
+        backend: SharedCacheBackend,
+        prefix: str = "embedding",
+        namespace: str = "v1",
+        ttl: int = 7 * 24 * 3600,
+    ) -> None:
+        cls.backend = backend
+        cls.prefix = prefix
+        cls.namespace = namespace
+        cls.ttl = ttl
+        cls.hits = cls.misses = cls.errors = 0
+
+    @classmethod
+    async def close(cls) -> None:
+        """Detach the backend; the connection itself belongs to the rate limiter."""
+        cls.backend = None
+
+    @classmethod
+    def key(cls, model_name: Hashable, text: str) -> str:
+        model = getattr(model_name, "value", model_name)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"{cls.prefix}:{cls.namespace}:{model}:{digest}"
+
+    @classmethod
+    async def get_many(
+        cls, model_name: Hashable, texts: Sequence[str]
+    ) -> List[Optional["np.ndarray"]]:
+        if not cls.backend or not texts:
+            return [None] * len(texts)
+        try:
+            blobs = await cls.backend.mget([cls.key(model_name, t) for t in texts])
+        except Exception as e:
+            # The shared cache is an optimisation, never a reason to fail
+            cls.errors += 1
+            logger.warning(f"Shared embedding cache read failed: {str(e)}")
+            return [None] * len(texts)
+
+        import numpy as np
+
+        vectors: List[Optional[np.ndarray]] = []
+        for blob in blobs:
+            if blob is None:
+                cls.misses += 1
+                vectors.append(None)
+            else:
+                cls.hits += 1
+                vectors.append(np.frombuffer(blob, dtype=np.float16).astype(np.float32))
+        return vectors
+
+    @classmethod
+    async def put_many(
+        cls, model_name: Hashable, texts: Sequence[str], vectors: "np.ndarray"
+    ) -> None:
+        if not cls.backend or not len(texts):
+            return
+        import numpy as np
+
+        blobs = np.asarray(vectors, dtype=np.float16)
+        items = {
+            cls.key(model_name, text): blob.tobytes()
+            for text, blob in zip(texts, blobs)
+        }
+        try:
+            await cls.backend.mset(items, cls.ttl)
+        except Exception as e:
+            cls.errors += 1
+            logger.warning(f"Shared embedding cache write failed: {str(e)}")
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        return {
+            "enabled": cls.backend is not None,
+            "namespace": cls.namespace,
+            "ttl": cls.ttl,
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "errors": cls.errors,
+        }
@@ -0,0 +1,45 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+
+class SharedCacheBackend(ABC):
+    @abstractmethod
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        pass
+
+    @abstractmethod
+    async def mset(self, items: Dict[str, bytes], ttl: int) -> None:
+        pass
+
+
+class RedisSharedCacheBackend(SharedCacheBackend):
+    def __init__(self, redis_instance):
+        self.redis = redis_instance
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self.redis.mget(keys)
+
+    async def mset(self, items: Dict[str, bytes], ttl: int) -> None:
+        # MSET has no TTL, so pipeline SET EX calls into a single round trip
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+
+class ValkeySharedCacheBackend(SharedCacheBackend):
+    def __init__(self, valkey_client):
+        self.client = valkey_client
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await asyncio.to_thread(self.client.mget, keys)
+
+    async def mset(self, items: Dict[str, bytes], ttl: int) -> None:
+        def _mset() -> None:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(key, value, ex=ttl)
+            pipe.execute()
+
+        await asyncio.to_thread(_mset)
@@ -0,0 +1,100 @@
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.services.index import normalize_rows
+from src.services.vectors import npy_buffer
+
+
+def block_rows(n: int, block_bytes: int) -> int:
+    """Rows per block so one ``(rows, n)`` float32 score block fits the budget."""
+    return max(1, block_bytes // (4 * max(n, 1)))
+
+
+def iter_similarity_blocks(
+    vectors: np.ndarray, block_bytes: int
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Cosine similarities of every vector against all others, a row block at a time.
+
+    The vectors are normalized once; each block is a float32 ``(rows, n)``
+    matrix, so peak memory stays at ``block_bytes`` whatever ``n`` is.
+    """
+    normalized = normalize_rows(vectors)
+    step = block_rows(len(normalized), block_bytes)
+    for start in range(0, len(normalized), step):
+        yield start, normalized[start : start + step] @ normalized.T
+
+
+def dense_similarity(
+    vectors: np.ndarray, dtype: str = "float16", block_bytes: int = 64 * 2**20
+) -> memoryview:
+    """The full similarity matrix as ``.npy``, each block cast into the body."""
+    n = len(vectors)
+    body, matrix = npy_buffer((n, n), dtype)
+    for start, block in iter_similarity_blocks(vectors, block_bytes):
+        matrix[start : start + len(block)] = block
+    return memoryview(body)
+
+
+def sparse_similarity(
+    vectors: np.ndarray,
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+    block_bytes: int = 64 * 2**20,
+    max_pairs: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(rows, cols, scores)`` of the pairs worth keeping, self-pairs excluded.
+
+    With ``top_k`` each row keeps its best ``top_k`` neighbours, best first,
+    dropping those under ``threshold`` if one is given. With only
+    ``threshold`` every pair above it is kept once, as ``row < col``. A low
+    threshold keeps close to ``n**2 / 2`` pairs, so more than ``max_pairs``
+    raises a ``ValueError``, as soon as the blocks seen so far exceed it.
+    """
+    n = len(vectors)
+    if (
+        max_pairs is not None
+        and top_k is not None
+        and n * min(top_k, n - 1) > max_pairs
+    ):
+        raise ValueError(
+            f"top_k={top_k} over {n} keywords can return more than "
+            f"{max_pairs} pairs"
+        )
+    rows, cols, scores = [], [], []
+    total = 0
+    for start, block in iter_similarity_blocks(vectors, block_bytes):
+        block_index = np.arange(len(block))
+        if top_k is not None:
+            block[block_index, start + block_index] = -np.inf
+            k = min(top_k, block.shape[1] - 1)
+            best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(block, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            keep = np.ones_like(best, dtype=bool)
+            if threshold is not None:
+                keep = best_scores >= threshold
+            hit_rows, _ = np.nonzero(keep)
+            rows.append(start + hit_rows)
+            cols.append(best[keep])
+            scores.append(best_scores[keep])
+        else:
+            # Only the upper triangle, each unordered pair once
+            upper = np.arange(block.shape[1]) > (start + block_index)[:, np.newaxis]
+            hit_rows, block_cols = np.nonzero((block >= threshold) & upper)
+            total += len(hit_rows)
+            if max_pairs is not None and total > max_pairs:
+                raise ValueError(
+                    f"threshold={threshold} keeps more than {max_pairs} pairs, "
+                    "raise it or set top_k"
+                )
+            rows.append(start + hit_rows)
+            cols.append(block_cols)
+            scores.append(block[hit_rows, block_cols])
+    return (
+        np.concatenate(rows).astype(np.int64),
+        np.concatenate(cols).astype(np.int64),
+        np.concatenate(scores).astype(np.float32),
+    )
@@ -0,0 +1,235 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+HASH_DTYPE = np.dtype("<u8")
+VECTOR_DTYPE = np.dtype("<f4")
+# Rows appended since the last merge stay in a small sorted tail until they
+# reach this share of the sorted base, so appends cost O(tail) not O(rows)
+TAIL_FRACTION = 8
+
+
+def text_hash(text: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _merge(
+    hashes: np.ndarray, rows: np.ndarray, new_hashes: np.ndarray, new_rows: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge sorted ``new_hashes`` into sorted ``hashes``, after equal ones."""
+    positions = np.searchsorted(hashes, new_hashes, side="right")
+    return np.insert(hashes, positions, new_hashes), np.insert(
+        rows, positions, new_rows
+    )
+
+
+def _find(hashes: np.ndarray, rows: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Row of the first occurrence of each key in sorted ``hashes``, or -1."""
+    found = np.full(len(keys), -1, dtype=np.int64)
+    if not len(hashes):
+        return found
+    positions = np.searchsorted(hashes, keys)
+    clipped = np.minimum(positions, len(hashes) - 1)
+    hit = (positions < len(hashes)) & (hashes[clipped] == keys)
+    found[hit] = rows[clipped[hit]]
+    return found
+
+
+class EmbeddingStore:
+    """Append-only on-disk embedding store for a single model.
+
+    ``vectors.f32`` holds float32 rows and ``index.u8`` the 64-bit text hash of
+    each row, in the same order. Lookups return views into a read-only memmap,
+    so a restarted worker serves known texts without loading the store into
+    RAM. Appends from several workers are serialised with ``flock`` and picked
+    up by the others on their next lookup.
+
+    Lookups binary-search the hashes sorted in NumPy arrays, 16 bytes a row
+    instead of a dict entry; a hash seen twice resolves to its first row.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / "vectors.f32"
+        self.index_path = self.directory / "index.u8"
+        self.meta_path = self.directory / "meta.json"
+        self.lock_path = self.directory / ".lock"
+        self.dim: Optional[int] = None
+        # Sorted hashes with their rows, plus the tail appended since a merge
+        self._hashes = np.empty(0, dtype=HASH_DTYPE)
+        self._rows = np.empty(0, dtype=np.int64)
+        self._tail_hashes = np.empty(0, dtype=HASH_DTYPE)
+        self._tail_rows = np.empty(0, dtype=np.int64)
+        self._index_bytes = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self.index_path.touch(exist_ok=True)
+        self.vectors_path.touch(exist_ok=True)
+        self._refresh()
+        logger.debug(f"Opened embedding store {self.directory} with {len(self)} rows")
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._tail_rows)
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last refresh, by us or other workers."""
+        size = self.index_path.stat().st_size
+        size -= size % HASH_DTYPE.itemsize
+        if size > self._index_bytes:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_bytes)
+                hashes = np.frombuffer(f.read(size - self._index_bytes), HASH_DTYPE)
+            start = self._index_bytes // HASH_DTYPE.itemsize
+            order = np.argsort(hashes, kind="stable")
+            self._tail_hashes, self._tail_rows = _merge(
+                self._tail_hashes,
+                self._tail_rows,
+                hashes[order],
+                start + order.astype(np.int64),
+            )
+            if len(self._tail_rows) * TAIL_FRACTION > len(self._rows):
+                self._hashes, self._rows = _merge(
+                    self._hashes, self._rows, self._tail_hashes, self._tail_rows
+                )
+                self._tail_hashes = np.empty(0, dtype=HASH_DTYPE)
+                self._tail_rows = np.empty(0, dtype=np.int64)
+            self._index_bytes = size
+
+        if self.dim is None and self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+        rows = self._index_bytes // HASH_DTYPE.itemsize
+        if self.dim and rows and (self._vectors is None or len(self._vectors) < rows):
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=VECTOR_DTYPE, mode="r", shape=(rows, self.dim)
+            )
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Rows of the hashes ``keys``, -1 for unknown ones."""
+        found = _find(self._tail_hashes, self._tail_rows, keys)
+        # Base rows predate the tail, so they win
+        base = _find(self._hashes, self._rows, keys)
+        return np.where(base >= 0, base, found)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            self._refresh()
+            if self._vectors is None:
+                return [None] * len(texts)
+            keys = np.array([text_hash(text) for text in texts], dtype=HASH_DTYPE)
+            rows = self._lookup(keys).tolist()
+            return [None if row < 0 else self._vectors[row] for row in rows]
+
+    def append(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=VECTOR_DTYPE)
+        if not len(texts):
+            return
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                if self.dim is None:
+                    self.dim = int(vectors.shape[1])
+                    self.meta_path.write_text(json.dumps({"dim": self.dim}))
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(
+                        f"Vector dimension {vectors.shape[1]} does not match store "
+                        f"dimension {self.dim}"
+                    )
+
+                keys = [text_hash(text) for text in texts]
+                known = self._lookup(np.array(keys, dtype=HASH_DTYPE)) >= 0
+                new_hashes: Dict[int, int] = {}
+                for i, (value, seen) in enumerate(zip(keys, known.tolist())):
+                    if not seen:
+                        new_hashes.setdefault(value, i)
+                if not new_hashes:
+                    return
+
+                # Drop vectors left behind by a writer that died before its
+                # index write, so rows and hashes stay aligned
+                rows = self._index_bytes // HASH_DTYPE.itemsize
+                with open(self.vectors_path, "r+b") as f:
+                    f.truncate(rows * self.dim * VECTOR_DTYPE.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(vectors[list(new_hashes.values())].tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.index_path, "ab") as f:
+                    f.write(np.asarray(list(new_hashes), dtype=HASH_DTYPE).tobytes())
+                self._refresh()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_stats(self) -> Dict:
+        return {
+            "path": str(self.directory),
+            "rows": len(self),
+            "dim": self.dim,
+            "bytes": len(self) * (self.dim or 0) * VECTOR_DTYPE.itemsize,
+        }
+
+
+class JSONModelStore(ABC):
+    """Small per-model values, persisted as JSON when a directory is set.
+
+    Values are kept in memory once read or written; ``{model}{suffix}``
+    files let workers and restarts reuse them. Subclasses convert values to
+    and from their JSON document with ``to_json`` and ``from_json``.
+    """
+
+    suffix = ".json"
+    label = "value"
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = Path(directory) if directory else None
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def to_json(self, value: Any) -> Dict:
+        pass
+
+    @abstractmethod
+    def from_json(self, data: Dict) -> Any:
+        pass
+
+    def _path(self, model: str) -> Optional[Path]:
+        return self.directory / f"{model}{self.suffix}" if self.directory else None
+
+    def get(self, model_name: Hashable) -> Optional[Any]:
+        model = str(getattr(model_name, "value", model_name))
+        with self._lock:
+            if model in self._values:
+                return self._values[model]
+            path = self._path(model)
+            if path is not None and path.exists():
+                self._values[model] = self.from_json(json.loads(path.read_text()))
+                return self._values[model]
+        return None
+
+    def put(self, model_name: Hashable, value: Any) -> None:
+        model = str(getattr(model_name, "value", model_name))
+        with self._lock:
+            self._values[model] = value
+            path = self._path(model)
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Renamed into place, so other workers never read half a file
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(self.to_json(value)))
+                os.replace(tmp, path)
+                logger.info(f"Saved {self.label} for {model} to {path}")
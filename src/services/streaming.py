@@ -0,0 +1,117 @@
+import asyncio
+import json
+import logging
+import tempfile
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.basis import ProjectionBasis
+from src.services.reduction import IncrementalPCA, RunningMinMax
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+class StreamingProjection:
+    """Project an unbounded keyword stream to 2D in constant memory.
+
+    Keywords and vectors are spooled to temporary files while the incremental
+    PCA is fitted chunk by chunk. ``finish`` then projects the spool to track
+    the running min/max, and ``iter_rows`` streams the normalized points back.
+    With a fixed ``basis`` each chunk is projected in ``add`` and ``finish``
+    has nothing left to do.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        n_components: int = 2,
+        spool_dir: Optional[str] = None,
+        basis: Optional[ProjectionBasis] = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.basis = basis
+        if basis is not None:
+            n_components = basis.n_components
+        self.pca = IncrementalPCA(n_components)
+        self.bounds = RunningMinMax()
+        self.count = 0
+        self.dim: Optional[int] = None
+        self._keywords = tempfile.TemporaryFile("w+", encoding="utf-8", dir=spool_dir)
+        self._vectors = tempfile.TemporaryFile(dir=spool_dir)
+        self._points = tempfile.TemporaryFile(dir=spool_dir)
+
+    def add(self, keywords: List[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.dim = vectors.shape[1]
+        # One JSON string per line keeps keywords with newlines intact
+        self._keywords.writelines(json.dumps(keyword) + "\n" for keyword in keywords)
+        self.count += len(keywords)
+        if self.basis is not None:
+            self._points.write(self.basis.project(vectors).tobytes())
+            return
+        self.pca.partial_fit(vectors)
+        self._vectors.write(vectors.tobytes())
+
+    def finish(self) -> None:
+        """Project the spooled vectors once the fit has seen every chunk."""
+        minimum = 1 if self.basis is not None else self.pca.n_components
+        # The dimension is known once any chunk was added
+        dim = self.dim
+        if self.count < minimum or dim is None:
+            raise ValueError(
+                f"At least {minimum} keywords are required, got {self.count}"
+            )
+        if self.basis is not None:
+            return
+        self._vectors.seek(0)
+        while True:
+            vectors = np.fromfile(
+                self._vectors, dtype=np.float32, count=self.chunk_size * dim
+            )
+            if not vectors.size:
+                break
+            points = self.pca.transform(vectors.reshape(-1, dim))
+            self.bounds.update(points)
+            self._points.write(points.tobytes())
+        # The vectors are no longer needed, give the disk space back early
+        self._vectors.close()
+
+    def iter_rows(
+        self, value_range: Tuple[float, float] = (0, 1)
+    ) -> Iterator[List[Tuple[str, float, float]]]:
+        """Yield chunks of ``(keyword, x, y)`` in input order."""
+        self._keywords.seek(0)
+        self._points.seek(0)
+        n_components = self.pca.n_components
+        while True:
+            points = np.fromfile(
+                self._points, dtype=np.float64, count=self.chunk_size * n_components
+            )
+            if not points.size:
+                break
+            bounds = self.basis if self.basis is not None else self.bounds
+            points = bounds.normalize(points.reshape(-1, n_components), value_range)
+            keywords = [json.loads(self._keywords.readline()) for _ in points]
+            yield [(word, x, y) for word, (x, y) in zip(keywords, points.tolist())]
+
+    def close(self) -> None:
+        for spool in (self._keywords, self._vectors, self._points):
+            spool.close()
+
+
+async def iter_ndjson_points(projection: StreamingProjection) -> AsyncIterator[bytes]:
+    """Serialize a finished projection as NDJSON, closing its spool at the end."""
+    rows = projection.iter_rows()
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, rows, None)
+            if chunk is None:
+                break
+            yield "".join(
+                json.dumps({"word": word, "x": x, "y": y}) + "\n"
+                for word, x, y in chunk
+            ).encode("utf-8")
+    finally:
+        projection.close()
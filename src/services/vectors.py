@@ -0,0 +1,87 @@
+import importlib.util
+import io
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+NPY_MEDIA_TYPE = "application/x-npy"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+VECTOR_MEDIA_TYPES = (NPY_MEDIA_TYPE, ARROW_MEDIA_TYPE)
+
+
+def arrow_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Pick the vector format from an Accept header, npy unless asked otherwise."""
+    if not accept:
+        return NPY_MEDIA_TYPE
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in ("*/*", "application/*"):
+            candidate = NPY_MEDIA_TYPE
+        elif media_type in VECTOR_MEDIA_TYPES:
+            candidate = media_type
+        else:
+            continue
+        if q > best_q:
+            best, best_q = candidate, q
+    if best is None:
+        raise ValueError(f"Supported media types: {', '.join(VECTOR_MEDIA_TYPES)}")
+    return best
+
+
+def npy_buffer(shape: Tuple[int, ...], dtype: str) -> Tuple[bytearray, np.ndarray]:
+    """An ``.npy`` body with its header written, and an array view of its data."""
+    array_dtype = np.dtype(dtype)
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header,
+        {
+            "descr": np.lib.format.dtype_to_descr(array_dtype),
+            "fortran_order": False,
+            "shape": shape,
+        },
+    )
+    offset = header.tell()
+    body = bytearray(offset + int(np.prod(shape)) * array_dtype.itemsize)
+    body[:offset] = header.getvalue()
+    return body, np.frombuffer(body, dtype=array_dtype, offset=offset).reshape(shape)
+
+
+def encode_npy(vectors: np.ndarray, dtype: str) -> memoryview:
+    """Serialize to ``.npy`` with the cast written straight into the body buffer."""
+    body, data = npy_buffer(vectors.shape, dtype)
+    np.copyto(data, vectors, casting="same_kind")
+    return memoryview(body)
+
+
+def encode_arrow(keywords: List[str], vectors: np.ndarray, dtype: str) -> memoryview:
+    """Serialize to an Arrow IPC stream with a ``keyword`` and a ``vector`` column."""
+    import pyarrow as pa
+
+    values = np.ascontiguousarray(vectors, dtype=dtype)
+    # Wrapping the numpy buffer avoids copying the vectors into Arrow memory
+    flat = pa.Array.from_buffers(
+        pa.from_numpy_dtype(values.dtype), values.size, [None, pa.py_buffer(values)]
+    )
+    table = pa.table(
+        {
+            "keyword": pa.array(keywords, type=pa.string()),
+            "vector": pa.FixedSizeListArray.from_arrays(flat, values.shape[1]),
+        }
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return memoryview(sink.getvalue())
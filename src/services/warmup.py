@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+
+async def warmup_models(
+    models: Iterable[str],
+    batch_sizes: Iterable[int],
+    registry: Any,
+) -> Dict[str, Dict[str, float]]:
+    """Load each model and run throwaway encodes so real requests start warm.
+
+    Each model is pinned in the registry while it warms up, so loading the
+    next one cannot evict it mid-warmup. Warmup goes straight to
+    ``encode_batch``, past the caches, so every batch size really reaches
+    the model. Returns load and warmup seconds and the footprint per model,
+    and warns when the preloaded models do not fit the registry's budget
+    together.
+    """
+    timings: Dict[str, Dict[str, float]] = {}
+    total_bytes = 0
+    for model in models:
+        started = time.perf_counter()
+        service = await asyncio.to_thread(registry.acquire, model)
+        try:
+            loaded = time.perf_counter()
+            for batch_size in batch_sizes:
+                texts = [f"warmup keyword {i}" for i in range(batch_size)]
+                await service.encode_batch(texts)
+            warmed = time.perf_counter()
+            footprint = registry.footprint(model)
+        finally:
+            await asyncio.to_thread(registry.release, model)
+
+        total_bytes += footprint
+        timings[str(getattr(model, "value", model))] = {
+            "load_s": round(loaded - started, 3),
+            "warmup_s": round(warmed - loaded, 3),
+            "footprint_mb": round(footprint / 2**20, 1),
+        }
+        logger.info(
+            f"Model {model} loaded in {loaded - started:.2f}s, "
+            f"warmed up in {warmed - loaded:.2f}s"
+        )
+
+    if total_bytes > registry.budget_bytes:
+        logger.warning(
+            f"Preloaded models need {total_bytes / 2**20:.0f} MB but "
+            f"EMBEDDING_MODEL_MEMORY_BUDGET_MB is "
+            f"{registry.budget_bytes / 2**20:.0f} MB; the least recently used "
+            "ones will be evicted and reloaded on demand"
+        )
+    return timings
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from src.configs.env_config import config
+from src.services.bucketing import encode_bucketed
+from src.services.inference import load_model
+
+# Initialize logging
+logger = logging.getLogger(__name__)
+
+# Model held by each worker process, set once by the pool initializer
+_worker_model: Any = None
+
+
+def _init_worker(
+    loader: Callable[[str, str], Any],
+    model_name: str,
+    backend: str,
+    threads: Optional[int],
+) -> None:
+    global _worker_model
+    if threads:
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    _worker_model = loader(model_name, backend)
+
+
+def _encode_job(
+    texts: List[str], max_seq_length: Optional[int] = None
+) -> Tuple[str, Tuple[int, ...], str]:
+    """Encode in the worker and hand the result back through shared memory."""
+    vectors = encode_bucketed(
+        _worker_model,
+        texts,
+        max_seq_length,
+        batch_size=config.EMBEDDING_ENCODE_BATCH_SIZE,
+    )
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    shm = shared_memory.SharedMemory(create=True, size=max(vectors.nbytes, 1))
+    try:
+        np.ndarray(vectors.shape, dtype=vectors.dtype, buffer=shm.buf)[...] = vectors
+        return shm.name, vectors.shape, vectors.dtype.str
+    finally:
+        # The parent owns the segment from here on and unlinks it after reading
+        shm.close()
+
+
+def _read_shared(name: str, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+class ProcessInferencePool:
+    """Long-lived worker processes that each hold their own copy of a model.
+
+    Encoding in separate processes sidesteps the GIL for the tokenization and
+    pooling work around the forward pass, so throughput scales with cores.
+    Only the texts are pickled; vectors come back through shared memory.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        processes: int,
+        threads_per_process: Optional[int] = None,
+        backend: str = "torch",
+        loader: Callable[[str, str], Any] = load_model,
+    ) -> None:
+        self.model_name = model_name
+        self.processes = processes
+        logger.debug(f"Starting {processes} inference processes for {model_name}")
+        # Forking a process that already runs torch threads can deadlock
+        self._pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(loader, model_name, backend, threads_per_process),
+        )
+
+    async def encode(
+        self, texts: List[str], max_seq_length: Optional[int] = None
+    ) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        name, shape, dtype = await loop.run_in_executor(
+            self._pool, _encode_job, texts, max_seq_length
+        )
+        return _read_shared(name, shape, dtype)
+
+    def shutdown(self) -> None:
+        logger.debug(f"Stopping inference processes for {self.model_name}")
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        return {"processes": self.processes}
@@ -27,6 +27,51 @@ def test_global_config_defaults():
     assert config.ALLOWED_HOSTS == ""
     assert config.REDIS_URL is None
     assert config.VALKEY_URL is None
+    assert config.EMBEDDING_BATCH_MAX_WAIT_MS == 2.0
+    assert config.EMBEDDING_BATCH_MAX_SIZE == 128
+    assert config.EMBEDDING_ENCODE_BATCH_SIZE == 32
+    assert config.EMBEDDING_KEYWORD_MAX_SEQ_LENGTH is None
+    assert config.EMBEDDING_CACHE_MAX_BYTES == 64 * 1024 * 1024
+    assert config.EMBEDDING_SHARED_CACHE_ENABLED is False
+    assert config.EMBEDDING_SHARED_CACHE_NAMESPACE == "v1"
+    assert config.EMBEDDING_STORE_DIR is None
+    assert config.EMBEDDING_REDUCER == "numpy"
+    assert config.EMBEDDING_SERVER_WORKERS is None
+    assert config.EMBEDDING_EXECUTOR_WORKERS is None
+    assert config.EMBEDDING_TORCH_THREADS is None
+    assert config.EMBEDDING_TORCH_INTEROP_THREADS is None
+    assert config.EMBEDDING_CPU_AFFINITY is False
+    assert config.EMBEDDING_PROCESS_WORKERS == 0
+    assert config.EMBEDDING_DEFAULT_BACKEND == "torch"
+    assert config.EMBEDDING_BACKENDS == {}
+    assert config.EMBEDDING_ONNX_CACHE_DIR is None
+    assert config.get_preload_models == []
+    assert config.EMBEDDING_WARMUP_BATCH_SIZES == [1, 8, 32]
+    assert config.EMBEDDING_MODEL_MEMORY_BUDGET_MB == 2048
+    assert config.EMBEDDING_MAX_CONCURRENCY == 4
+    assert config.EMBEDDING_MAX_QUEUE == 16
+    assert config.EMBEDDING_MAX_QUEUE_WAIT_S == 5.0
+    assert config.EMBEDDING_STREAM_CHUNK_SIZE == 256
+    assert config.EMBEDDING_STREAM_MAX_KEYWORDS == 1_000_000
+    assert config.EMBEDDING_STREAM_SPOOL_DIR is None
+    assert config.EMBEDDING_JOB_DIR is None
+    assert config.EMBEDDING_JOB_WORKERS == 1
+    assert config.EMBEDDING_JOB_CHUNK_SIZE == 1024
+    assert config.EMBEDDING_JOB_LEASE_S == 60.0
+    assert config.EMBEDDING_JOB_MAX_KEYWORDS == 10_000_000
+    assert config.EMBEDDING_CALIBRATION_DIR is None
+    assert config.EMBEDDING_PROJECTION == "fit"
+    assert config.EMBEDDING_BASIS_DIR is None
+    assert config.EMBEDDING_BASIS_VOCABULARY_FILE is None
+    assert config.EMBEDDING_BASIS_MARGIN == 0.1
+    assert config.EMBEDDING_INDEX_DIR is None
+    assert config.EMBEDDING_INDEX_IVF_MIN_SIZE == 50_000
+    assert config.EMBEDDING_INDEX_NPROBE == 16
+    assert config.EMBEDDING_SIMILARITY_BLOCK_MB == 64
+    assert config.EMBEDDING_SIMILARITY_MAX_PAIRS == 1_000_000
+    assert config.EMBEDDING_DOCUMENT_OVERLAP_TOKENS == 32
+    assert config.EMBEDDING_DOCUMENT_BATCH_SIZE == 32
+    assert config.EMBEDDING_DOCUMENT_MAX_CHUNKS == 10_000
 
 
 def test_global_config_allowed_hosts():
@@ -37,6 +82,13 @@ def test_global_config_allowed_hosts():
     assert config.get_allowed_hosts == []
 
 
+def test_global_config_preload_models():
+    config = GlobalConfig(
+        EMBEDDING_PRELOAD_MODELS="all-MiniLM-L6-v2, all-mpnet-base-v2"
+    )
+    assert config.get_preload_models == ["all-MiniLM-L6-v2", "all-mpnet-base-v2"]
+
+
 def test_environment_specific_configs():
     dev_config = DevConfig()
     prod_config = ProdConfig()
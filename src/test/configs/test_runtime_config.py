@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from src.configs import runtime_config
+from src.configs.runtime_config import (
+    cgroup_cpu_quota,
+    claim_cpu_slot,
+    configure_runtime,
+    get_runtime_settings,
+    plan_runtime,
+    server_workers,
+)
+
+
+@pytest.mark.parametrize(
+    "cpu_max,expected", [("150000 100000\n", 1.5), ("max 100000\n", None)]
+)
+def test_cgroup_v2_quota(tmp_path, cpu_max, expected):
+    (tmp_path / "cpu.max").write_text(cpu_max)
+
+    assert cgroup_cpu_quota(tmp_path) == expected
+
+
+@pytest.mark.parametrize("quota,expected", [("200000", 2.0), ("-1", None)])
+def test_cgroup_v1_quota(tmp_path, quota, expected):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text(quota)
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+
+    assert cgroup_cpu_quota(tmp_path) == expected
+    assert cgroup_cpu_quota(tmp_path / "missing") is None
+
+
+def test_server_workers(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert server_workers() == 3
+
+    monkeypatch.setattr(runtime_config.config, "EMBEDDING_SERVER_WORKERS", 5)
+    assert server_workers() == 5
+
+
+def test_plan_splits_cpus_between_workers():
+    settings = plan_runtime(16, None, 4)
+
+    assert settings.worker_cpus == 4
+    assert settings.executor_workers == 2
+    assert settings.torch_threads == 2
+    assert settings.torch_interop_threads == 1
+    assert settings.process_threads is None
+
+
+def test_plan_honours_quota_and_overrides(monkeypatch):
+    assert plan_runtime(16, 2.5, 2).worker_cpus == 1
+    assert plan_runtime(16, 2.5, 2).torch_threads == 1
+
+    monkeypatch.setattr(runtime_config.config, "EMBEDDING_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(runtime_config.config, "EMBEDDING_TORCH_THREADS", 6)
+    settings = plan_runtime(8, None, 1)
+
+    assert settings.process_threads == 4
+    assert settings.torch_threads == 6
+
+
+def test_claim_cpu_slot_skips_taken_slots(tmp_path, monkeypatch):
+    import fcntl
+
+    monkeypatch.setattr(runtime_config, "_slot_lock", None)
+    monkeypatch.setattr(runtime_config, "_slot", None)
+    with open(tmp_path / "slot-0.lock", "w") as taken:
+        fcntl.flock(taken, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        assert claim_cpu_slot(2, tmp_path) == 1
+        # Held for the life of the process
+        assert claim_cpu_slot(2, tmp_path) == 1
+        runtime_config._slot_lock.close()
+
+
+def test_configure_runtime(monkeypatch, mocker):
+    configure_torch = mocker.patch.object(runtime_config, "configure_torch")
+    monkeypatch.setattr(runtime_config, "_settings", None)
+    monkeypatch.setattr(runtime_config, "available_cpus", lambda: list(range(8)))
+    monkeypatch.setattr(runtime_config, "cgroup_cpu_quota", lambda: None)
+    monkeypatch.setattr(runtime_config.config, "EMBEDDING_SERVER_WORKERS", 2)
+    for name in runtime_config.THREAD_ENV_VARS:
+        # Set first so monkeypatch restores the variable configure_runtime adds
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    # Set by the operator, so left alone
+    monkeypatch.setenv("MKL_NUM_THREADS", "3")
+
+    settings = configure_runtime()
+
+    assert settings.worker_cpus == 4 and settings.torch_threads == 2
+    assert os.environ["OMP_NUM_THREADS"] == "2"
+    assert os.environ["MKL_NUM_THREADS"] == "3"
+    assert get_runtime_settings() is settings
+    configure_torch.assert_called_once_with(settings)
+    assert settings.to_dict()["executor_workers"] == 2
@@ -11,11 +11,14 @@ from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from benchmarks.stand_in import build_stand_in_model
 from src.security.rateLimiter import FastAPILimiter
 
 os.environ["ENV_STATE"] = "test"
 
 from src.main import app  # noqa: E402
+from src.services.basis import get_basis_store  # noqa: E402
+from src.services.cache import get_embedding_cache  # noqa: E402
 
 
 class DummyBackend:
@@ -32,6 +35,19 @@ class DummyBackend:
         return "dummy_sha"
 
 
+class DummySharedCacheBackend:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def mset(self, items, ttl):
+        self.store.update(items)
+        self.ttls.update({key: ttl for key in items})
+
+
 async def dummy_identifier(request):
     return "test_identifier"
 
@@ -111,6 +127,16 @@ async def mock_rate_limiter():
         await FastAPILimiter.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_embedding_cache():
+    """Keep cached vectors, bases and counters from leaking between tests."""
+    get_embedding_cache.cache_clear()
+    get_basis_store.cache_clear()
+    yield
+    get_embedding_cache.cache_clear()
+    get_basis_store.cache_clear()
+
+
 @pytest.fixture
 def mock_env_state(monkeypatch):
     """Fixture to control environment state and variables for tests"""
@@ -133,6 +159,12 @@ def mock_env_state(monkeypatch):
     return _set_env
 
 
+@pytest.fixture(scope="session")
+def stand_in_model(tmp_path_factory) -> str:
+    """Path to a tiny offline sentence-transformers model."""
+    return build_stand_in_model(tmp_path_factory.mktemp("stand_in_model"))
+
+
 @pytest.fixture
 def mock_embeddings():
     return np.array([[0.1, 0.2, 0.3, 0.4], [0.5, 0.6, 0.7, 0.8], [0.9, 0.1, 0.2, 0.3]])
@@ -0,0 +1,106 @@
+import pytest
+from httpx import AsyncClient
+
+from src.main import app
+from src.routes.collections import get_collection_service, get_collections
+from src.services.index import CollectionStore
+from src.test.services.test_jobs import FakeService
+
+
+@pytest.fixture
+def collections(tmp_path):
+    store = CollectionStore(tmp_path)
+    service = FakeService()
+
+    async def get_service():
+        yield service
+
+    app.dependency_overrides[get_collections] = lambda: store
+    app.dependency_overrides[get_collection_service] = get_service
+    yield store
+    app.dependency_overrides.pop(get_collections)
+    app.dependency_overrides.pop(get_collection_service)
+
+
+@pytest.mark.anyio
+async def test_collection_lifecycle(async_client: AsyncClient, collections):
+    """Test creating a collection, adding, searching and deleting items."""
+    response = await async_client.put("/v1/collections/words?model=all-mpnet-base-v2")
+    assert response.status_code == 201
+    assert response.json() == {
+        "name": "words",
+        "model": "all-mpnet-base-v2",
+        "size": 0,
+        "dim": None,
+        "index": "exact",
+    }
+
+    items = [{"id": word, "text": word} for word in ["aa", "bb", "ab", "aab"]]
+    response = await async_client.post(
+        "/v1/collections/words/items", json={"items": items}
+    )
+    assert response.status_code == 200
+    assert response.json()["size"] == 4
+    assert response.json()["dim"] == 4
+
+    response = await async_client.post(
+        "/v1/collections/words/search", json={"queries": ["aaa"], "k": 2}
+    )
+    assert response.status_code == 200
+    hits = response.json()["results"][0]
+    assert [hit["id"] for hit in hits] == ["aa", "aab"]
+    assert hits[0]["score"] >= hits[1]["score"]
+
+    response = await async_client.post(
+        "/v1/collections/words/items/delete", json={"ids": ["aa"]}
+    )
+    assert response.json()["size"] == 3
+
+    response = await async_client.get("/v1/collections")
+    assert [collection["name"] for collection in response.json()] == ["words"]
+
+    response = await async_client.delete("/v1/collections/words")
+    assert response.status_code == 204
+    response = await async_client.get("/v1/collections/words")
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_collection_model_conflict(async_client: AsyncClient, collections):
+    """Test re-creating a collection for another model is a conflict."""
+    await async_client.put("/v1/collections/words?model=all-mpnet-base-v2")
+
+    response = await async_client.put("/v1/collections/words?model=all-MiniLM-L6-v2")
+
+    assert response.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_invalid_collection_name(async_client: AsyncClient, collections):
+    """Test collection names are restricted to safe path characters."""
+    response = await async_client.put("/v1/collections/bad.name")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_add_items_trains_on_model_executor(
+    async_client: AsyncClient, collections, mocker
+):
+    """Test the IVF index is trained through the model's executor."""
+    collections.ivf_min_size = 3
+    await async_client.put("/v1/collections/words")
+    service = FakeService()
+    run = mocker.spy(service.executor, "run")
+
+    async def get_service():
+        yield service
+
+    app.dependency_overrides[get_collection_service] = get_service
+    items = [{"id": word, "text": word} for word in ["aa", "bb", "ab"]]
+    response = await async_client.post(
+        "/v1/collections/words/items", json={"items": items}
+    )
+
+    assert response.json()["index"] == "ivf"
+    assert run.call_args.args[0] == collections.get("words").train
@@ -1,8 +1,16 @@
+import base64
+import io
+import json
+import threading
+
 import numpy as np
 import pytest
 from httpx import AsyncClient
 
-from src.models.embedding import Keywords
+from src.main import app
+from src.models.embedding import Keywords, ModelName
+from src.routes.embedding import get_embedding_service, lease_embedding_service
+from src.services.registry import ModelRegistry
 
 
 @pytest.mark.anyio
@@ -134,3 +142,343 @@ async def test_processing_sentence_success(async_client: AsyncClient):
         assert "word" in keyword
         assert "x" in keyword
         assert "y" in keyword
+
+
+@pytest.fixture
+def override_embedding_service(mock_sentence_transformer):
+    """Serve the routes from a service whose model is a cheap fake encoder."""
+    from src.services.embedding import EmbeddingService
+
+    mock_sentence_transformer.encode.side_effect = lambda texts: np.array(
+        [[len(text), text.count("e"), 1.0] for text in texts]
+    )
+    service = EmbeddingService(ModelName.MINI_L6)
+
+    async def get_service():
+        yield service
+
+    app.dependency_overrides[get_embedding_service] = get_service
+    yield service
+    app.dependency_overrides.pop(get_embedding_service)
+    service.close()
+
+
+@pytest.mark.anyio
+async def test_stream_embeddings(async_client: AsyncClient, override_embedding_service):
+    """Test streaming NDJSON keywords in and projected points out."""
+    words = [f"tree{'e' * (i % 7)}{'s' * (i % 5)}" for i in range(600)]
+    body = "\n".join(json.dumps(word) for word in words) + "\n"
+
+    response = await async_client.post(
+        "/v1/embedding/keywords/stream",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/x-ndjson"
+    points = [json.loads(line) for line in response.text.splitlines()]
+    assert [point["word"] for point in points] == words
+    assert all(0 <= point["x"] <= 1 and 0 <= point["y"] <= 1 for point in points)
+
+
+@pytest.mark.anyio
+async def test_stream_embeddings_invalid_line(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test a malformed NDJSON line is rejected before anything is streamed."""
+    response = await async_client.post(
+        "/v1/embedding/keywords/stream", content=b'"ok"\nnot json\n'
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid JSON line")
+
+
+@pytest.mark.anyio
+async def test_create_vectors_npy(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test raw vectors come back as float16 npy with the keyword order header."""
+    keywords = ["tree", "trees", "tree"]
+    response = await async_client.post(
+        "/v1/embedding/vectors?dtype=float16",
+        json={"keywords": keywords},
+        headers={"Accept": "application/x-npy"},
+    )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/x-npy"
+    assert json.loads(response.headers["x-keywords"]) == keywords
+    vectors = np.load(io.BytesIO(response.content))
+    assert vectors.dtype == np.float16
+    np.testing.assert_array_equal(vectors, [[4, 2, 1], [5, 2, 1], [4, 2, 1]])
+
+
+@pytest.mark.anyio
+async def test_create_vectors_arrow(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test raw vectors come back as an Arrow IPC stream with a keyword column."""
+    pa = pytest.importorskip("pyarrow")
+    response = await async_client.post(
+        "/v1/embedding/vectors",
+        json={"keywords": ["tree", "trees"]},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+
+    assert response.status_code == 201
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("keyword").to_pylist() == ["tree", "trees"]
+    assert table.column("vector").to_pylist() == [[4, 2, 1], [5, 2, 1]]
+
+
+@pytest.mark.anyio
+async def test_create_vectors_binary_truncated(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test truncated binary vectors come back bit-packed."""
+    response = await async_client.post(
+        "/v1/embedding/vectors?dtype=binary&dimensions=2",
+        json={"keywords": ["tree", "trees"]},
+    )
+
+    assert response.status_code == 201
+    vectors = np.load(io.BytesIO(response.content))
+    assert vectors.dtype == np.uint8
+    assert vectors.tolist() == [[0b11000000], [0b11000000]]
+
+
+@pytest.mark.anyio
+async def test_create_vectors_not_acceptable(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test an unsupported Accept header is rejected with 406."""
+    response = await async_client.post(
+        "/v1/embedding/vectors",
+        json={"keywords": ["tree", "trees"]},
+        headers={"Accept": "application/json"},
+    )
+
+    assert response.status_code == 406
+
+
+@pytest.mark.anyio
+async def test_create_embeddings_fast_path(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test the fast path returns the same payload as the Pydantic models."""
+    keywords = ["tree", "trees", "forest"]
+    response = await async_client.post(
+        "/v1/embedding/keywords", json={"keywords": keywords}
+    )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    points = await override_embedding_service.project_keywords(keywords)
+    expected = override_embedding_service.get_embeddings(points, keywords)
+    assert response.json() == expected.model_dump()
+
+
+@pytest.mark.anyio
+async def test_create_embeddings_columnar_formats(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test the columnar and base64 formats carry the same points as objects."""
+    keywords = ["tree", "trees", "forest"]
+    objects = await async_client.post(
+        "/v1/embedding/keywords", json={"keywords": keywords}
+    )
+    columnar = await async_client.post(
+        "/v1/embedding/keywords?format=columnar", json={"keywords": keywords}
+    )
+    packed = await async_client.post(
+        "/v1/embedding/keywords?format=base64", json={"keywords": keywords}
+    )
+
+    assert objects.status_code == columnar.status_code == packed.status_code == 201
+    expected = objects.json()["keywords"]
+    assert columnar.json() == {
+        "words": keywords,
+        "x": [point["x"] for point in expected],
+        "y": [point["y"] for point in expected],
+    }
+    body = packed.json()
+    assert body["words"] == keywords
+    x = np.frombuffer(base64.b64decode(body["x"]), dtype="<f4")
+    np.testing.assert_allclose(x, [point["x"] for point in expected], rtol=1e-6)
+
+
+@pytest.mark.anyio
+async def test_create_embeddings_on_stable_basis(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test the basis projection keeps a keyword's point across requests."""
+    first = await async_client.post(
+        "/v1/embedding/keywords?projection=basis",
+        json={"keywords": ["tree", "trees", "forest"]},
+    )
+    second = await async_client.post(
+        "/v1/embedding/keywords?projection=basis",
+        json={"keywords": ["forest", "leaves"]},
+    )
+
+    assert first.status_code == second.status_code == 201
+    assert first.json()["keywords"][2] == second.json()["keywords"][0]
+
+
+@pytest.mark.anyio
+async def test_similarity_dense_and_sparse(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test the similarity matrix as float16 npy and as thresholded pairs."""
+    keywords = ["tree", "trees", "forest", "green"]
+    dense = await async_client.post(
+        "/v1/embedding/similarity", json={"keywords": keywords}
+    )
+    sparse = await async_client.post(
+        "/v1/embedding/similarity", json={"keywords": keywords, "threshold": 0.99}
+    )
+
+    assert dense.status_code == sparse.status_code == 201
+    assert dense.headers["content-type"] == "application/x-npy"
+    matrix = np.load(io.BytesIO(dense.content))
+    assert matrix.shape == (4, 4) and matrix.dtype == np.float16
+    np.testing.assert_allclose(np.diag(matrix), 1, atol=1e-3)
+    pairs = sparse.json()
+    i, j = np.nonzero(np.triu(matrix >= 0.99, k=1))
+    assert list(zip(pairs["rows"], pairs["cols"])) == list(zip(i, j))
+
+
+@pytest.mark.anyio
+async def test_similarity_rejects_too_many_pairs(
+    async_client: AsyncClient, override_embedding_service, monkeypatch
+):
+    """Test sparse requests over EMBEDDING_SIMILARITY_MAX_PAIRS get a 422."""
+    monkeypatch.setattr("src.routes.embedding.config.EMBEDDING_SIMILARITY_MAX_PAIRS", 2)
+    keywords = ["tree", "trees", "forest", "green"]
+    low_threshold = await async_client.post(
+        "/v1/embedding/similarity", json={"keywords": keywords, "threshold": -1}
+    )
+    large_top_k = await async_client.post(
+        "/v1/embedding/similarity", json={"keywords": keywords, "top_k": 3}
+    )
+
+    assert low_threshold.status_code == large_top_k.status_code == 422
+    assert "raise it or set top_k" in low_threshold.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_sentence_document_mode(
+    async_client: AsyncClient,
+    override_embedding_service,
+    mock_sentence_transformer,
+    monkeypatch,
+):
+    """Test document mode returns chunk points and the pooled embedding."""
+    monkeypatch.setattr(
+        "src.services.embedding.config.EMBEDDING_DOCUMENT_OVERLAP_TOKENS", 1
+    )
+    mock_sentence_transformer.max_seq_length = 5
+    mock_sentence_transformer.tokenizer = None
+    override_embedding_service.model = mock_sentence_transformer
+    text = "the quick brown fox jumps over the lazy dog"
+
+    response = await async_client.post(
+        "/v1/embedding/sentence?mode=document", json={"text": text}
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [point["word"] for point in body["keywords"]][:2] == [
+        "the quick brown",
+        "brown fox jumps",
+    ]
+    assert len(body["embedding"]) == 3
+    assert np.linalg.norm(body["embedding"]) == pytest.approx(1.0, rel=1e-5)
+
+
+@pytest.mark.anyio
+async def test_create_embeddings_unknown_format(
+    async_client: AsyncClient, override_embedding_service
+):
+    """Test an unknown format is rejected before any work is done."""
+    response = await async_client.post(
+        "/v1/embedding/keywords?format=xml", json={"keywords": ["tree", "trees"]}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_openapi_documents_fast_path_bodies(async_client: AsyncClient):
+    """Test the raw-body routes still publish their request and response schemas."""
+    schema = (await async_client.get("/openapi.json")).json()
+    operation = schema["paths"]["/v1/embedding/keywords"]["post"]
+
+    body = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert body["properties"]["keywords"]["maxItems"] == 100
+    response = operation["responses"]["201"]["content"]["application/json"]
+    assert response["schema"] == {"$ref": "#/components/schemas/Embeddings"}
+
+
+def test_runtime_settings(client):
+    response = client.get("/v1/embedding/runtime")
+
+    assert response.status_code == 200
+    assert {"worker_cpus", "torch_threads", "executor_workers"} <= set(response.json())
+
+
+def test_stats_of_a_model_that_is_not_loaded(client, monkeypatch, mocker):
+    factory = mocker.Mock()
+    registry = ModelRegistry(budget_bytes=2**30, factory=factory)
+    monkeypatch.setattr("src.routes.embedding.get_model_registry", lambda: registry)
+
+    response = client.get("/v1/embedding/stats?model=all-mpnet-base-v2")
+
+    assert response.status_code == 404
+    factory.assert_not_called()
+
+
+def test_stats_of_a_loaded_model(client, monkeypatch):
+    class StatsService:
+        def get_stats(self):
+            return {"model": "all-mpnet-base-v2"}
+
+    service = StatsService()
+    registry = ModelRegistry(budget_bytes=2**30, factory=lambda model: service)
+    registry.acquire(ModelName.MPNET)
+    registry.release(ModelName.MPNET)
+    monkeypatch.setattr("src.routes.embedding.get_model_registry", lambda: registry)
+
+    response = client.get("/v1/embedding/stats?model=all-mpnet-base-v2")
+
+    assert response.status_code == 200
+    assert response.json()["model"] == "all-mpnet-base-v2"
+    assert "admission" in response.json()
+    assert registry.get_stats()["resident"]["all-mpnet-base-v2"]["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_lease_evicts_off_the_event_loop(monkeypatch):
+    """Test a model evicted on release is closed in a worker thread."""
+    closed_in = []
+
+    rss = {"value": 0}
+
+    class ClosingService:
+        def __init__(self, model):
+            rss["value"] += 100
+
+        def close(self):
+            closed_in.append(threading.current_thread())
+
+    monkeypatch.setattr("src.services.registry.rss_bytes", lambda: rss["value"])
+    registry = ModelRegistry(budget_bytes=0, factory=ClosingService)
+    monkeypatch.setattr("src.routes.embedding.get_model_registry", lambda: registry)
+
+    async with lease_embedding_service(ModelName.MINI_L6):
+        async with lease_embedding_service(ModelName.MPNET):
+            pass
+
+    assert len(closed_in) == 1 and closed_in[0] is not threading.main_thread()
@@ -0,0 +1,77 @@
+import io
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from src.main import app
+from src.models.jobs import JobStatus
+from src.routes.jobs import get_queue
+from src.services.jobs import JobQueue, JobRunner
+from src.test.services.test_jobs import FakeService
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = JobQueue(tmp_path, chunk_size=2)
+    app.dependency_overrides[get_queue] = lambda: queue
+    yield queue
+    app.dependency_overrides.pop(get_queue)
+    queue.close()
+
+
+@pytest.mark.anyio
+async def test_jobs_disabled(async_client: AsyncClient):
+    """Test the job routes answer 503 when no job directory is configured."""
+    response = await async_client.get("/v1/jobs/unknown")
+
+    assert response.status_code == 503
+
+
+@pytest.mark.anyio
+async def test_create_and_download_job(async_client: AsyncClient, job_queue):
+    """Test uploading a CSV corpus, polling it and downloading its results."""
+    upload = {"file": ("corpus.csv", b"keyword\na\nab\nbb\naab\nbba\n", "text/csv")}
+    response = await async_client.post("/v1/jobs?model=all-MiniLM-L6-v2", files=upload)
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == JobStatus.QUEUED
+    assert job["total"] == 5
+
+    response = await async_client.get(f"/v1/jobs/{job['id']}/results/vectors.npy")
+    assert response.status_code == 409
+
+    runner = JobRunner(job_queue, lambda model: FakeService(), lambda model: None)
+    await runner.run_job(job_queue.claim())
+    job_queue.finish(job["id"], JobStatus.COMPLETED)
+
+    response = await async_client.get(f"/v1/jobs/{job['id']}")
+    assert response.json()["processed"] == 5
+    assert "coordinates.npy" in response.json()["results"]
+
+    response = await async_client.get(f"/v1/jobs/{job['id']}/results/coordinates.npy")
+    assert response.status_code == 200
+    coordinates = np.load(io.BytesIO(response.content))
+    assert coordinates.shape == (5, 2)
+
+    response = await async_client.get(f"/v1/jobs/{job['id']}/results/keywords.jsonl")
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_create_job_invalid_corpus(async_client: AsyncClient, job_queue):
+    """Test a malformed JSONL corpus is rejected with 400."""
+    upload = {"file": ("corpus.jsonl", b'"a"\nnot json\n', "application/jsonl")}
+    response = await async_client.post("/v1/jobs", files=upload)
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid JSON line")
+
+
+@pytest.mark.anyio
+async def test_unknown_job(async_client: AsyncClient, job_queue):
+    """Test polling an unknown job id returns 404."""
+    response = await async_client.get("/v1/jobs/missing")
+
+    assert response.status_code == 404
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.security.admission import AdmissionController, admit, get_admission_controller
+
+
+def make_controller(**kwargs):
+    options = {"max_concurrency": 1, "max_queue": 1, "max_wait_s": 1.0}
+    return AdmissionController("test", **{**options, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_admits_up_to_concurrency():
+    controller = make_controller(max_concurrency=2)
+
+    await controller.acquire()
+    await controller.acquire()
+
+    assert controller.running == 2
+    assert controller.admitted == 2
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full_with_retry_after():
+    controller = make_controller(initial_service_s=2.0)
+    await controller.acquire()
+    waiting = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await controller.acquire()
+
+    assert exc_info.value.status_code == 503
+    # One running, one queued, plus this request, at 2s each on one slot
+    assert exc_info.value.headers == {"Retry-After": "6"}
+    assert controller.rejected == 1
+
+    controller.release(2.0)
+    await waiting
+
+
+@pytest.mark.asyncio
+async def test_release_hands_slot_to_waiter_in_order():
+    controller = make_controller(max_queue=2)
+    await controller.acquire()
+    first = asyncio.create_task(controller.acquire())
+    second = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+
+    controller.release(0.1)
+    await first
+
+    assert not second.done()
+    assert controller.running == 1
+    assert controller.queued == 1
+
+    controller.release(0.1)
+    await second
+    controller.release(0.1)
+
+    assert controller.running == 0
+    assert controller.admitted == 3
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_times_out():
+    controller = make_controller(max_wait_s=0.01)
+    await controller.acquire()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await controller.acquire()
+
+    assert exc_info.value.status_code == 503
+    assert controller.timed_out == 1
+    assert controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    controller = make_controller()
+    await controller.acquire()
+    waiting = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    controller.release(0.1)
+
+    assert controller.queued == 0
+    assert controller.running == 0
+
+
+def test_release_updates_service_time_ewma():
+    controller = make_controller(alpha=0.5, initial_service_s=1.0)
+    controller.running = 1
+
+    controller.release(3.0)
+
+    assert controller.service_s == pytest.approx(2.0)
+    assert controller.get_stats()["service_ms"] == pytest.approx(2000.0)
+
+
+def test_admit_dependency_sheds_load(monkeypatch):
+    monkeypatch.setattr("src.security.admission.config.EMBEDDING_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr("src.security.admission.config.EMBEDDING_MAX_QUEUE", 0)
+    get_admission_controller.cache_clear()
+    test_app = FastAPI()
+
+    async def admission():
+        async with admit("test-model"):
+            yield
+
+    @test_app.get("/test")
+    async def test_route(admitted: None = Depends(admission)):
+        return {"status": "ok"}
+
+    client = TestClient(test_app)
+    assert client.get("/test").status_code == 200
+
+    controller = get_admission_controller("test-model")
+    controller.running = 1
+    response = client.get("/test")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    get_admission_controller.cache_clear()
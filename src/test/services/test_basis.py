@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.services.basis import BasisStore, ProjectionBasis, reference_texts
+from src.services.quantization import CALIBRATION_TEXTS
+from src.services.reduction import NumpyReducer
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    latent = rng.standard_normal((200, 3)) * np.array([6.0, 3.0, 1.0])
+    return latent @ rng.standard_normal((3, 16))
+
+
+def test_fit_matches_per_request_projection(vectors):
+    basis = ProjectionBasis.fit(vectors)
+    reducer = NumpyReducer()
+
+    expected = reducer.normalize(reducer.reduce(vectors))
+
+    np.testing.assert_allclose(basis.transform(vectors), expected, atol=1e-9)
+
+
+def test_transform_is_stable_across_requests(vectors):
+    basis = ProjectionBasis.fit(vectors)
+
+    first = basis.transform(vectors[:10])
+    second = basis.transform(vectors[5:20])
+
+    np.testing.assert_array_equal(first[5:], second[:5])
+
+
+def test_transform_clips_outside_reference_bounds(vectors):
+    basis = ProjectionBasis.fit(vectors)
+
+    points = basis.transform(vectors * 10, value_range=(-1, 1))
+
+    assert points.min() == -1 and points.max() == 1
+
+
+def test_margin_keeps_nearby_points_apart(vectors):
+    basis = ProjectionBasis.fit(vectors, margin=0.5)
+
+    points = basis.transform(vectors)
+    outside = basis.transform(vectors * 1.2)
+
+    assert points.min() > 0 and points.max() < 1
+    assert len(np.unique(outside[:, 0])) == len(vectors)
+
+
+def test_reference_texts(tmp_path):
+    vocabulary = tmp_path / "vocabulary.txt"
+    vocabulary.write_text("alpha\n\n beta \n")
+
+    assert reference_texts() == list(CALIBRATION_TEXTS)
+    assert reference_texts(str(vocabulary)) == ["alpha", "beta"]
+    vocabulary.write_text("\n")
+    with pytest.raises(ValueError):
+        reference_texts(str(vocabulary))
+
+
+def test_basis_store_persists(tmp_path, vectors):
+    basis = ProjectionBasis.fit(vectors)
+    BasisStore(tmp_path).put("model", basis)
+
+    loaded = BasisStore(tmp_path).get("model")
+
+    np.testing.assert_allclose(loaded.transform(vectors), basis.transform(vectors))
+    # Written through a temporary file that is renamed into place
+    assert [path.name for path in tmp_path.iterdir()] == ["model.basis.json"]
+    assert BasisStore().get("model") is None
@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.services.batching import MicroBatcher
+
+
+def fake_encode(calls):
+    async def encode(texts):
+        calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+    return encode
+
+
+class TestMicroBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_encode(self):
+        calls = []
+        batcher = MicroBatcher(fake_encode(calls), max_wait_ms=20, max_batch_size=64)
+
+        first, second = await asyncio.gather(
+            batcher.submit(["a", "bb"]), batcher.submit(["ccc"])
+        )
+
+        assert calls == [["a", "bb", "ccc"]]
+        assert first[:, 0].tolist() == [1.0, 2.0]
+        assert second[:, 0].tolist() == [3.0]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_splits_batches(self):
+        calls = []
+        batcher = MicroBatcher(fake_encode(calls), max_wait_ms=50, max_batch_size=3)
+
+        results = await asyncio.gather(
+            batcher.submit(["a", "b"]),
+            batcher.submit(["c", "d"]),
+            batcher.submit(["e"]),
+        )
+
+        assert sorted(len(call) for call in calls) == [1, 2, 2]
+        assert [len(result) for result in results] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_runs_alone(self):
+        calls = []
+        batcher = MicroBatcher(fake_encode(calls), max_wait_ms=50, max_batch_size=2)
+
+        result = await batcher.submit(["a", "b", "c", "d"])
+
+        assert calls == [["a", "b", "c", "d"]]
+        assert len(result) == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_every_caller(self):
+        async def failing_encode(texts):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(failing_encode, max_wait_ms=10)
+
+        results = await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        batcher = MicroBatcher(fake_encode([]), max_wait_ms=10)
+
+        await asyncio.gather(batcher.submit(["a", "b"]), batcher.submit(["c"]))
+        stats = batcher.get_stats()
+
+        assert stats["batch_size"]["count"] == 1
+        assert stats["batch_size"]["sum"] == 3
+        assert stats["wait_ms"]["count"] == 2
+        assert stats["batch_size"]["buckets"]["+Inf"] == 1
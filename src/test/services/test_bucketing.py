@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src.services.bucketing import encode_bucketed, length_buckets
+
+
+@pytest.fixture
+def tokenizer(tmp_path):
+    from transformers import BertTokenizerFast
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "the", "fox", "run", "##s", ","]
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab))
+    return BertTokenizerFast(vocab_file=str(vocab_file))
+
+
+class FakeModel:
+    """Embeds a text as (token count, sum of token ids) and records batch widths."""
+
+    max_seq_length = 16
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.widths = []
+
+    def __call__(self, features):
+        import torch
+
+        mask = features["attention_mask"]
+        self.widths.append(mask.shape[1])
+        ids = (features["input_ids"] * mask).sum(dim=1)
+        return {"sentence_embedding": torch.stack([mask.sum(dim=1), ids], dim=1)}
+
+    def encode(self, texts):
+        encoding = self.tokenizer(texts, truncation=True, max_length=16)
+        return np.array(
+            [[len(ids), sum(ids)] for ids in encoding["input_ids"]], dtype=np.float32
+        )
+
+
+def test_length_buckets():
+    lengths = [3, 30, 4, 2, 17, 3, 5]
+
+    buckets = length_buckets(lengths, max_batch_size=2)
+
+    assert [bucket.tolist() for bucket in buckets] == [[3], [0, 5], [2], [6], [4, 1]]
+    assert sorted(np.concatenate(buckets).tolist()) == list(range(len(lengths)))
+
+
+def test_encode_restores_order_with_tight_padding(tokenizer):
+    model = FakeModel(tokenizer)
+    texts = ["the fox " * 6, "fox", "the runs", "the", "fox , fox , fox"]
+
+    vectors = encode_bucketed(model, texts, batch_size=8)
+
+    np.testing.assert_array_equal(vectors, model.encode(texts))
+    # With [CLS] and [SEP]: 3 and 3, 5 and 7, then 14 tokens
+    assert model.widths == [3, 7, 14]
+
+
+def test_encode_caps_sequence_length(tokenizer):
+    model = FakeModel(tokenizer)
+
+    vectors = encode_bucketed(model, ["the fox " * 6, "fox"], max_seq_length=4)
+
+    assert vectors[:, 0].tolist() == [4, 3]
+    assert model.widths == [4]
+
+
+def test_encode_falls_back_without_fast_tokenizer(mocker):
+    model = mocker.Mock()
+    model.tokenizer = None
+    model.encode.return_value = np.ones((2, 3))
+
+    vectors = encode_bucketed(model, ["a", "b"])
+
+    model.encode.assert_called_once_with(["a", "b"])
+    assert vectors.shape == (2, 3)
@@ -0,0 +1,71 @@
+import numpy as np
+
+from src.models.embedding import ModelName
+from src.services.cache import EmbeddingCache
+
+
+def vectors(n, dim=4):
+    return np.arange(n * dim, dtype=np.float32).reshape(n, dim)
+
+
+class TestEmbeddingCache:
+    def test_get_many_hits_and_misses(self):
+        cache = EmbeddingCache(max_bytes=1024)
+        cache.put_many(ModelName.MINI_L6, ["a", "b"], vectors(2))
+
+        found = cache.get_many(ModelName.MINI_L6, ["a", "c", "b"])
+
+        assert found[1] is None
+        np.testing.assert_array_equal(found[0], vectors(2)[0])
+        np.testing.assert_array_equal(found[2], vectors(2)[1])
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_keys_are_scoped_by_model(self):
+        cache = EmbeddingCache(max_bytes=1024)
+        cache.put_many(ModelName.MINI_L6, ["a"], vectors(1))
+
+        assert cache.get_many(ModelName.MPNET, ["a"]) == [None]
+
+    def test_stored_vectors_are_read_only_copies(self):
+        cache = EmbeddingCache(max_bytes=1024)
+        source = vectors(1)
+        cache.put_many(ModelName.MINI_L6, ["a"], source)
+        source[0, 0] = 99
+
+        (stored,) = cache.get_many(ModelName.MINI_L6, ["a"])
+
+        assert stored[0] == 0
+        assert not stored.flags.writeable
+
+    def test_evicts_least_recently_used_over_budget(self):
+        # Each 4-dim float32 vector is 16 bytes
+        cache = EmbeddingCache(max_bytes=32)
+        cache.put_many(ModelName.MINI_L6, ["a", "b"], vectors(2))
+        cache.get_many(ModelName.MINI_L6, ["a"])
+        cache.put_many(ModelName.MINI_L6, ["c"], vectors(1))
+
+        assert cache.get_many(ModelName.MINI_L6, ["b"]) == [None]
+        assert cache.get_many(ModelName.MINI_L6, ["a"])[0] is not None
+        assert cache.evictions == 1
+        assert cache.current_bytes == 32
+
+    def test_zero_budget_disables_cache(self):
+        cache = EmbeddingCache(max_bytes=0)
+        cache.put_many(ModelName.MINI_L6, ["a"], vectors(1))
+
+        assert len(cache) == 0
+
+    def test_stats(self):
+        cache = EmbeddingCache(max_bytes=1024)
+        cache.put_many(ModelName.MINI_L6, ["a"], vectors(1))
+        cache.get_many(ModelName.MINI_L6, ["a", "b"])
+
+        assert cache.get_stats() == {
+            "entries": 1,
+            "bytes": 16,
+            "max_bytes": 1024,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+        }
@@ -0,0 +1,58 @@
+import pytest
+
+from src.services.chunking import DocumentChunker, iter_text_pieces
+
+
+@pytest.fixture
+def tokenizer(tmp_path):
+    from transformers import BertTokenizerFast
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "the", "fox", "run", "##s", ","]
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab))
+    return BertTokenizerFast(vocab_file=str(vocab_file))
+
+
+def test_whitespace_windows_overlap():
+    text = " ".join(f"w{i}" for i in range(10))
+    chunker = DocumentChunker(max_tokens=4, overlap=1)
+
+    chunks = list(chunker.iter_chunks([text]))
+
+    assert chunks == [
+        ("w0 w1 w2 w3", 4),
+        ("w3 w4 w5 w6", 4),
+        ("w6 w7 w8 w9", 4),
+    ]
+
+
+@pytest.mark.parametrize("piece_size", [1, 3, 17, 1000])
+def test_pieces_match_whole_text(piece_size):
+    text = "  ".join(f"word{i}\n" for i in range(200))
+    chunker = DocumentChunker(max_tokens=16, overlap=4)
+
+    whole = list(chunker.iter_chunks([text]))
+    pieces = list(chunker.iter_chunks(iter_text_pieces(text, piece_size)))
+
+    assert pieces == whole
+    assert whole[0][0].startswith("word0") and whole[-1][0].endswith("word199")
+
+
+@pytest.mark.parametrize("piece_size", [5, 64, 10_000])
+def test_tokenizer_windows(tokenizer, piece_size):
+    text = "the fox runs, " * 100
+    chunker = DocumentChunker(tokenizer, max_tokens=12, overlap=3)
+
+    chunks = list(chunker.iter_chunks(iter_text_pieces(text, piece_size)))
+
+    assert chunks == list(chunker.iter_chunks([text]))
+    for chunk, n_tokens in chunks:
+        assert n_tokens <= 12
+        assert len(tokenizer(chunk, add_special_tokens=False)["input_ids"]) == n_tokens
+        # Windows after the first start on a word
+        assert chunk.startswith(("the", "fox", "runs", ","))
+
+
+def test_invalid_overlap():
+    with pytest.raises(ValueError, match="overlap"):
+        DocumentChunker(max_tokens=4, overlap=4)
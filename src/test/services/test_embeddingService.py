@@ -3,8 +3,11 @@ import pytest
 import pytest_asyncio
 from fastapi import HTTPException
 
-from src.models.embedding import ModelName
+from src.models.embedding import ModelName, ProjectionMode, VectorDType
 from src.services.embedding import EmbeddingService
+from src.services.sharedCache import SharedEmbeddingCache
+from src.services.store import EmbeddingStore
+from src.test.conftest import DummySharedCacheBackend
 
 
 @pytest_asyncio.fixture
@@ -69,6 +72,12 @@ class TestEmbeddingService:
         assert result.keywords[0].x == 0.1
         assert result.keywords[0].y == 0.2
 
+    def test_get_stats(self, embedding_service):
+        stats = embedding_service.get_stats()
+
+        assert stats["model"] == ModelName.MPNET
+        assert stats["batching"]["batch_size"]["count"] == 0
+
     @pytest_asyncio.fixture(autouse=True)
     async def _setup(self, embedding_service):
         self.service = embedding_service
@@ -82,6 +91,280 @@ class TestEmbeddingService:
         assert all(0 <= k.x <= 1 and 0 <= k.y <= 1 for k in result.keywords)
         assert [k.word for k in result.keywords] == keywords
 
+    @pytest.mark.asyncio
+    async def test_embed_deduplicates_and_caches(self, mock_sentence_transformer):
+        mock_sentence_transformer.encode.return_value = np.array(
+            [[0.1, 0.2], [0.3, 0.4]]
+        )
+
+        result = await self.service.embed(["a", "b", "a"])
+        again = await self.service.embed(["b", "a"])
+
+        mock_sentence_transformer.encode.assert_called_once_with(["a", "b"])
+        np.testing.assert_array_equal(result[0], result[2])
+        np.testing.assert_array_equal(again, result[[1, 0]])
+        assert self.service.cache.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_embed_uses_shared_cache(self, mock_sentence_transformer):
+        mock_sentence_transformer.encode.return_value = np.array([[0.5, 0.25]])
+        await SharedEmbeddingCache.init(DummySharedCacheBackend())
+        try:
+            await SharedEmbeddingCache.put_many(
+                self.service.vector_key, ["a"], np.array([[1.0, 2.0]])
+            )
+            result = await self.service.embed(["a", "b"])
+        finally:
+            await SharedEmbeddingCache.close()
+
+        mock_sentence_transformer.encode.assert_called_once_with(["b"])
+        np.testing.assert_allclose(result, [[1.0, 2.0], [0.5, 0.25]])
+
+    @pytest.mark.asyncio
+    async def test_embed_reads_and_fills_store(
+        self, mock_sentence_transformer, tmp_path
+    ):
+        mock_sentence_transformer.encode.return_value = np.array([[0.5, 0.25]])
+        self.service.store = EmbeddingStore(tmp_path)
+        self.service.store.append(["a"], np.array([[1.0, 2.0]]))
+
+        result = await self.service.embed(["a", "b"])
+
+        mock_sentence_transformer.encode.assert_called_once_with(["b"])
+        np.testing.assert_allclose(result, [[1.0, 2.0], [0.5, 0.25]])
+        assert len(EmbeddingStore(tmp_path)) == 2
+
+    @pytest.mark.asyncio
+    async def test_embed_bulk_leaves_caches_and_store_alone(
+        self, mock_sentence_transformer, tmp_path
+    ):
+        mock_sentence_transformer.encode.return_value = np.array([[0.5, 0.25]])
+        self.service.store = EmbeddingStore(tmp_path)
+        self.service.cache.put_many(
+            self.service.vector_key, ["a"], np.array([[1.0, 2.0]])
+        )
+
+        result = await self.service.embed_bulk(["a", "b", "a"])
+
+        mock_sentence_transformer.encode.assert_called_once_with(["b"])
+        np.testing.assert_allclose(result, [[1.0, 2.0], [0.5, 0.25], [1.0, 2.0]])
+        assert self.service.cache.get_many(self.service.vector_key, ["b"]) == [None]
+        assert len(EmbeddingStore(tmp_path)) == 0
+
+    @pytest.mark.asyncio
+    async def test_process_keywords_runs_on_model_executor(self):
+        await self.service.process_keywords(["test1", "test2", "test3"])
+
+        stats = self.service.get_stats()["executor"]
+        # One encode job plus one fused reduce + normalize job
+        assert stats["completed"] == 2
+        assert stats["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_keywords_use_sequence_cap(
+        self, mock_sentence_transformer, mocker, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_KEYWORD_MAX_SEQ_LENGTH", 8
+        )
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_STORE_DIR", str(tmp_path)
+        )
+        monkeypatch.setattr(
+            "sentence_transformers.SentenceTransformer.max_seq_length", 384
+        )
+        service = EmbeddingService(ModelName.MPNET)
+        encode = mocker.patch(
+            "src.services.embedding.encode_bucketed", return_value=np.ones((1, 4))
+        )
+
+        await service.embed(["a"])
+        await service.encode_batch(["b"])
+
+        assert encode.call_args_list[0].args[1:] == (["a"], 8)
+        assert encode.call_args_list[1].args[1:] == (["b"], None)
+        # Capped vectors never mix with full-length ones
+        assert service.vector_key == "all-mpnet-base-v2@torch@seq8"
+        assert service.store.directory == tmp_path / "all-mpnet-base-v2@torch@seq8"
+        assert service.cache.get_many(ModelName.MPNET, ["a"]) == [None]
+        assert service.cache.get_many(service.vector_key, ["a"])[0] is not None
+
+    def test_sequence_cap_above_model_limit_is_ignored(
+        self, mock_sentence_transformer, monkeypatch
+    ):
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_KEYWORD_MAX_SEQ_LENGTH", 512
+        )
+        monkeypatch.setattr(
+            "sentence_transformers.SentenceTransformer.max_seq_length", 384
+        )
+
+        service = EmbeddingService(ModelName.MPNET)
+
+        assert service.keyword_max_seq_length is None
+        assert service.vector_key == "all-mpnet-base-v2@torch"
+
+    def test_backend_is_part_of_vector_key(
+        self, mock_sentence_transformer, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_STORE_DIR", str(tmp_path)
+        )
+        monkeypatch.setattr("src.services.embedding.get_backend", lambda name: "int8")
+        monkeypatch.setattr(
+            "src.services.embedding.load_model", lambda name, backend: object()
+        )
+
+        service = EmbeddingService(ModelName.MPNET)
+
+        assert service.vector_key == "all-mpnet-base-v2@int8"
+        assert service.store.directory == tmp_path / "all-mpnet-base-v2@int8"
+        assert SharedEmbeddingCache.key(service.vector_key, "a") != (
+            SharedEmbeddingCache.key("all-mpnet-base-v2@torch", "a")
+        )
+
+    @pytest.mark.asyncio
+    async def test_encode_batch_uses_process_pool(
+        self, mock_sentence_transformer, mocker
+    ):
+        pool = mocker.Mock()
+        pool.encode = mocker.AsyncMock(return_value=np.ones((2, 4)))
+        self.service.process_pool = pool
+
+        result = await self.service.encode_batch(["a", "b"])
+
+        pool.encode.assert_awaited_once_with(["a", "b"], None)
+        mock_sentence_transformer.encode.assert_not_called()
+        assert result.shape == (2, 4)
+
+    @pytest.mark.asyncio
+    async def test_embed_output_modes(self, mock_sentence_transformer):
+        mock_sentence_transformer.encode.side_effect = lambda texts: np.array(
+            [[len(text) - 5, text.count("a") - 1, 1.0, -1.0] for text in texts]
+        )
+        keywords = ["banana", "apples", "kiwi"]
+
+        binary = await self.service.embed_output(keywords, VectorDType.BINARY)
+        int8 = await self.service.embed_output(keywords, VectorDType.INT8)
+        truncated = await self.service.embed_output(keywords, dimensions=2)
+
+        assert binary.tolist() == [[0b11100000], [0b10100000], [0b00100000]]
+        assert int8.dtype == np.int8 and int8.shape == (3, 4)
+        assert truncated.shape == (3, 2)
+        np.testing.assert_allclose(np.linalg.norm(truncated, axis=1), 1, rtol=1e-6)
+        # Calibrated once on the built-in corpus, then reused
+        assert (
+            self.service.calibrations.get(f"{self.service.vector_key}-4d") is not None
+        )
+
+    @pytest.mark.asyncio
+    async def test_project_points_on_stable_basis(self, mock_sentence_transformer):
+        mock_sentence_transformer.encode.side_effect = lambda texts: np.array(
+            [[len(text), text.count("a"), text.count("e")] for text in texts]
+        )
+
+        first = await self.service.project_points(
+            ["banana", "apples", "kiwi"], ProjectionMode.BASIS
+        )
+        second = await self.service.project_points(
+            ["kiwi", "pear", "banana"], ProjectionMode.BASIS
+        )
+
+        np.testing.assert_array_equal(first[[2, 0]], second[[0, 2]])
+        assert self.service.bases.get(self.service.vector_key) is not None
+        assert self.service.bases.get(ModelName.MPNET) is None
+        # Per-request fitting is still the default
+        fitted = await self.service.project_points(["kiwi", "pear", "banana"])
+        assert not np.allclose(fitted, second)
+
+    @pytest.mark.asyncio
+    async def test_embed_document(self, mock_sentence_transformer, monkeypatch):
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_DOCUMENT_BATCH_SIZE", 2
+        )
+        mock_sentence_transformer.max_seq_length = 6
+        mock_sentence_transformer.tokenizer = None
+        self.service.model = mock_sentence_transformer
+        mock_sentence_transformer.encode.side_effect = lambda texts: np.array(
+            [[len(text), text.count("a"), 1.0] for text in texts]
+        )
+        text = " ".join(["banana", "kiwi", "apple", "pear", "fig"] * 4)
+
+        embedding, chunks, points = await self.service.embed_document(text)
+
+        # Windows of 4 words sharing 3 with the next one
+        assert chunks[0] == "banana kiwi apple pear"
+        assert chunks[1] == "kiwi apple pear fig"
+        assert len(chunks) == 17 and points.shape == (17, 2)
+        # The chunks are projected in one exact fit, like a keyword request
+        np.testing.assert_allclose(
+            points, self.service.project(mock_sentence_transformer.encode(chunks))
+        )
+        assert embedding.shape == (3,)
+        assert np.linalg.norm(embedding) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_embed_document_short_and_empty(self, mock_sentence_transformer):
+        mock_sentence_transformer.encode.side_effect = lambda texts: np.array(
+            [[len(text), 1.0] for text in texts]
+        )
+        mock_sentence_transformer.tokenizer = None
+        self.service.model = mock_sentence_transformer
+
+        embedding, chunks, points = await self.service.embed_document("a short text")
+
+        assert chunks == ["a short text"]
+        assert points.tolist() == [[0.0, 0.0]]
+        with pytest.raises(HTTPException) as exc_info:
+            await self.service.embed_document("   ")
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_stream_keywords(self, mock_sentence_transformer, monkeypatch):
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_STREAM_CHUNK_SIZE", 4
+        )
+        mock_sentence_transformer.encode.side_effect = lambda texts: np.array(
+            [[len(text), text.count("a"), 1.0] for text in texts]
+        )
+
+        async def keywords():
+            for word in ["a", "bb", "aaa", "b", "aa", "bbbb", "ab"]:
+                yield word
+
+        projection = await self.service.stream_keywords(keywords())
+        rows = [row for chunk in projection.iter_rows() for row in chunk]
+        projection.close()
+
+        assert projection.count == 7
+        assert [word for word, _, _ in rows] == [
+            "a",
+            "bb",
+            "aaa",
+            "b",
+            "aa",
+            "bbbb",
+            "ab",
+        ]
+        assert all(0 <= x <= 1 and 0 <= y <= 1 for _, x, y in rows)
+        # One-off streamed keywords are not cached
+        assert self.service.cache.get_many(self.service.vector_key, ["a"]) == [None]
+
+    @pytest.mark.asyncio
+    async def test_stream_keywords_rejects_bad_input(self, monkeypatch):
+        monkeypatch.setattr(
+            "src.services.embedding.config.EMBEDDING_STREAM_MAX_KEYWORDS", 2
+        )
+
+        async def keywords():
+            for word in ["a", "b", "c"]:
+                yield word
+
+        with pytest.raises(HTTPException) as exc_info:
+            await self.service.stream_keywords(keywords())
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "At most 2 keywords can be streamed"
+
     @pytest.mark.asyncio
     async def test_process_keywords_failure(self, mock_sentence_transformer):
         mock_sentence_transformer.encode.side_effect = Exception("Processing failed")
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.services.executor import InferenceExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor("test", max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+class TestInferenceExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_threads(self, executor):
+        name = await executor.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("test")
+
+    @pytest.mark.asyncio
+    async def test_passes_arguments_and_exceptions(self, executor):
+        def fail():
+            raise ValueError("boom")
+
+        assert await executor.run(pow, 2, 5) == 32
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+        assert executor.completed == 2
+
+    @pytest.mark.asyncio
+    async def test_reports_queue_depth(self, executor):
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        first = asyncio.ensure_future(executor.run(block))
+        second = asyncio.ensure_future(executor.run(block))
+        await asyncio.to_thread(started.wait, 5)
+
+        stats = executor.get_stats()
+        assert stats["running"] == 1
+        assert stats["queue_depth"] == 1
+
+        release.set()
+        await asyncio.gather(first, second)
+        stats = executor.get_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["wait_ms"]["count"] == 2
+        assert stats["run_ms"]["count"] == 2
@@ -0,0 +1,238 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.models.embedding import ModelName
+from src.services.index import (
+    CollectionStore,
+    VectorCollection,
+    exact_search,
+    normalize_rows,
+)
+
+
+def clustered_vectors(n_samples, n_features=32, n_clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, n_features))
+    labels = rng.integers(n_clusters, size=n_samples)
+    return centers[labels] + 0.3 * rng.standard_normal((n_samples, n_features))
+
+
+def test_exact_search_across_blocks():
+    vectors = normalize_rows(clustered_vectors(500))
+    queries = normalize_rows(clustered_vectors(7, seed=1))
+
+    scores, rows = exact_search(queries, vectors, k=5, block_size=64)
+
+    expected = np.argsort(-(queries @ vectors.T), axis=1, kind="stable")[:, :5]
+    np.testing.assert_array_equal(rows, expected)
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+
+def test_exact_search_with_fewer_items_than_k():
+    vectors = normalize_rows(clustered_vectors(3))
+
+    scores, rows = exact_search(vectors[:1], vectors, k=10)
+
+    assert rows.shape == (1, 3)
+    assert rows[0, 0] == 0 and scores[0, 0] == pytest.approx(1.0)
+
+
+class TestVectorCollection:
+    def test_add_replace_and_delete(self):
+        collection = VectorCollection("docs", ModelName.MINI_L6)
+        vectors = np.eye(3)
+
+        assert collection.add(["a", "b", "c"], ["x", "y", "z"], vectors) == 3
+        assert collection.add(["b"], ["y2"], [[1.0, 1.0, 0.0]]) == 3
+        hits = collection.search([[0.0, 1.0, 0.0]], k=2)[0]
+        assert [hit[:2] for hit in hits] == [("b", "y2"), ("a", "x")]
+        assert hits[0][2] == pytest.approx(np.sqrt(0.5))
+
+        assert collection.delete(["a", "unknown"]) == 1
+        assert len(collection) == 2
+        assert [hit[0] for hit in collection.search([[1.0, 0.0, 0.0]], k=5)[0]] == [
+            "b",
+            "c",
+        ]
+
+    def test_rejects_other_dimensions(self):
+        collection = VectorCollection("docs", ModelName.MINI_L6)
+        collection.add(["a"], ["x"], [[1.0, 0.0]])
+
+        with pytest.raises(ValueError, match="2-dimensional"):
+            collection.add(["b"], ["y"], [[1.0, 0.0, 0.0]])
+        with pytest.raises(ValueError, match="2-dimensional"):
+            collection.search([[1.0, 0.0, 0.0]], k=1)
+
+    def test_ivf_recall(self):
+        vectors = clustered_vectors(4000)
+        queries = clustered_vectors(50, seed=1)
+        collection = VectorCollection(
+            "docs", ModelName.MINI_L6, ivf_min_size=1000, nprobe=8
+        )
+        ids = [str(i) for i in range(len(vectors))]
+        collection.add(ids, ids, vectors)
+
+        assert collection.index == "exact" and collection.needs_training
+        assert collection.train()
+        assert collection.index == "ivf" and not collection.needs_training
+        _, expected = exact_search(normalize_rows(queries), normalize_rows(vectors), 10)
+        hits = collection.search(queries, k=10)
+        recall = np.mean(
+            [
+                len({int(hit[0]) for hit in row} & set(truth)) / 10
+                for row, truth in zip(hits, expected.tolist())
+            ]
+        )
+        assert recall >= 0.9
+
+    def test_persists_and_loads_lazily(self, tmp_path):
+        vectors = clustered_vectors(300)
+        ids = [f"item-{i}" for i in range(300)]
+        collection = VectorCollection(
+            "docs", ModelName.MINI_L6, tmp_path, ivf_min_size=100
+        )
+        collection.add(ids, ids, vectors)
+        collection.train()
+        collection.delete(ids[:10])
+        expected = collection.search(vectors[:3], k=5)
+
+        reloaded = VectorCollection(
+            "docs", ModelName.MINI_L6, tmp_path, ivf_min_size=100
+        )
+        assert reloaded._vectors is None
+        assert reloaded.search(vectors[:3], k=5) == expected
+        assert isinstance(reloaded._vectors, np.memmap)
+        assert len(reloaded) == 290 and reloaded.index == "ivf"
+
+    def test_writes_append_and_compact_when_sparse(self, tmp_path):
+        collection = VectorCollection("docs", ModelName.MINI_L6, tmp_path)
+        vectors = np.eye(4)
+        collection.add(["a", "b", "c", "d"], list("wxyz"), vectors)
+        vectors_file = tmp_path / "vectors-0.f32"
+        written = vectors_file.read_bytes()
+
+        collection.add(["a"], ["w2"], [[0.0, 1.0, 1.0, 0.0]])
+        assert collection.delete(["b"]) == 1
+        # Appended after the untouched rows, with the old "a" left as a dead row
+        assert vectors_file.read_bytes()[: len(written)] == written
+        hits = collection.search([[1.0, 0.0, 0.0, 0.0]], k=5)[0]
+        # The dead row matching the query exactly is never returned
+        assert sorted(hit[0] for hit in hits) == ["a", "c", "d"]
+        assert max(hit[2] for hit in hits) == pytest.approx(0.0)
+        assert len(collection) == 3
+
+        # Dead rows now outnumber live ones: the live rows move to generation 1
+        collection.delete(["c"])
+        assert not vectors_file.exists()
+        assert (tmp_path / "vectors-1.f32").stat().st_size == 2 * 4 * 4
+        reloaded = VectorCollection("docs", ModelName.MINI_L6, tmp_path)
+        hits = reloaded.search([[0.0, 0.0, 0.0, 1.0]], k=5)[0]
+        assert [hit[:2] for hit in hits] == [("d", "z"), ("a", "w2")]
+
+    def test_reload_drops_torn_writes(self, tmp_path):
+        collection = VectorCollection("docs", ModelName.MINI_L6, tmp_path)
+        collection.add(["a", "b"], ["x", "y"], np.eye(2))
+        # A worker died after writing a vector but before logging its item
+        with open(tmp_path / "vectors-0.f32", "ab") as f:
+            f.write(np.ones(2, dtype=np.float32).tobytes())
+        with open(tmp_path / "items-0.jsonl", "a") as f:
+            f.write('{"id": "c", "te')
+
+        reloaded = VectorCollection("docs", ModelName.MINI_L6, tmp_path)
+        assert len(reloaded) == 2
+        reloaded.add(["c"], ["z"], [[1.0, 1.0]])
+        assert (tmp_path / "vectors-0.f32").stat().st_size == 3 * 2 * 4
+        hits = VectorCollection("docs", ModelName.MINI_L6, tmp_path).search(
+            [[1.0, 1.0]], k=1
+        )
+        assert hits[0][0][:2] == ("c", "z")
+
+    def test_workers_share_the_files(self, tmp_path):
+        # Two instances on one directory stand for two worker processes
+        first = VectorCollection("docs", ModelName.MINI_L6, tmp_path)
+        second = VectorCollection("docs", ModelName.MINI_L6, tmp_path)
+        first.add(["a"], ["x"], [[1.0, 0.0]])
+        second.add(["b"], ["y"], [[0.0, 1.0]])
+        first.add(["c"], ["z"], [[1.0, 1.0]])
+
+        for collection in (first, second):
+            hits = collection.search([[0.0, 1.0]], k=3)[0]
+            assert [hit[:2] for hit in hits] == [("b", "y"), ("c", "z"), ("a", "x")]
+
+        # A compaction by one worker moves the other to the new generation
+        second.delete(["a", "b"])
+        assert (tmp_path / "vectors-1.f32").exists()
+        assert [hit[0] for hit in first.search([[1.0, 0.0]], k=3)[0]] == ["c"]
+
+        # So does emptying the collection, before it is refilled
+        first.delete(["c"])
+        assert len(second) == 0 and second.dim is None
+        second.add(["d"], ["w"], [[1.0, 0.0, 0.0]])
+        assert first.dim == 3 and len(first) == 1
+
+
+class TestCollectionStore:
+    def test_create_get_and_drop(self, tmp_path):
+        store = CollectionStore(tmp_path)
+        store.create("docs", ModelName.MPNET).add(["a"], ["x"], [[1.0, 0.0]])
+
+        with pytest.raises(ValueError, match="already exists"):
+            store.create("docs", ModelName.MINI_L6)
+        with pytest.raises(ValueError, match="Invalid collection name"):
+            store.create("../docs", ModelName.MINI_L6)
+
+        reopened = CollectionStore(tmp_path)
+        assert reopened.names() == ["docs"]
+        assert reopened.get("docs").model == ModelName.MPNET
+        assert len(reopened.get("docs")) == 1
+        assert reopened.drop("docs")
+        assert reopened.get("docs") is None
+        assert not reopened.drop("docs")
+
+    def test_concurrent_creates_for_different_models(self, tmp_path, monkeypatch):
+        store = CollectionStore(tmp_path)
+        find = store._find
+
+        def slow_find(name):
+            found = find(name)
+            time.sleep(0.05)
+            return found
+
+        monkeypatch.setattr(store, "_find", slow_find)
+        created = []
+
+        def create(model):
+            try:
+                created.append(store.create("docs", model).model)
+            except ValueError:
+                created.append(None)
+
+        threads = [
+            threading.Thread(target=create, args=(model,))
+            for model in (ModelName.MPNET, ModelName.MINI_L6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert created.count(None) == 1
+        assert CollectionStore(tmp_path).get("docs").model in created
+
+    def test_drop_by_another_worker(self, tmp_path):
+        store, other = CollectionStore(tmp_path), CollectionStore(tmp_path)
+        store.create("docs", ModelName.MINI_L6)
+        assert other.get("docs") is not None
+        assert store.drop("docs")
+        assert other.get("docs") is None
+
+    def test_in_memory_store(self):
+        store = CollectionStore()
+        store.create("docs", ModelName.MINI_L6)
+
+        assert store.names() == ["docs"]
+        assert store.get("other") is None
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from src.configs.env_config import config
+from src.models.embedding import ModelName
+from src.services.inference import (
+    check_backends,
+    get_backend,
+    load_model,
+    onnx_export_dir,
+)
+
+# Minimum per-text cosine similarity to the fp32 embedding
+PARITY_TOLERANCE = {"int8": 0.98, "onnx": 0.999}
+
+SAMPLE_TEXTS = [
+    "the cat",
+    "machine learning",
+    "a long keyword phrase with several words",
+    "x",
+    "embedding 42",
+]
+
+
+def cosine_rows(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+@pytest.fixture(scope="module")
+def fp32_embeddings(stand_in_model):
+    return load_model(stand_in_model, "torch").encode(SAMPLE_TEXTS)
+
+
+@pytest.fixture(autouse=True)
+def onnx_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "EMBEDDING_ONNX_CACHE_DIR", str(tmp_path / "onnx"))
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_backend_parity_with_fp32(stand_in_model, fp32_embeddings, backend):
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("optimum")
+
+    embeddings = load_model(stand_in_model, backend).encode(SAMPLE_TEXTS)
+
+    assert embeddings.shape == fp32_embeddings.shape
+    assert cosine_rows(embeddings, fp32_embeddings).min() >= PARITY_TOLERANCE[backend]
+
+
+def test_onnx_export_is_saved_and_reused(stand_in_model, mocker):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("optimum")
+    from sentence_transformers import SentenceTransformer
+
+    first = load_model(stand_in_model, "onnx").encode(SAMPLE_TEXTS)
+    export_dir = onnx_export_dir(stand_in_model)
+    assert (export_dir / "onnx" / "model.onnx").exists()
+
+    init = mocker.spy(SentenceTransformer, "__init__")
+    second = load_model(stand_in_model, "onnx").encode(SAMPLE_TEXTS)
+
+    assert init.call_args.args[1] == str(export_dir)
+    np.testing.assert_allclose(second, first, atol=1e-6)
+    assert [path.name for path in export_dir.parent.iterdir()] == [export_dir.name]
+
+
+def test_load_model_unknown_backend(stand_in_model):
+    with pytest.raises(ValueError):
+        load_model(stand_in_model, "tensorrt")
+
+
+def test_get_backend(monkeypatch):
+    monkeypatch.setattr(config, "EMBEDDING_BACKENDS", {"all-MiniLM-L6-v2": "int8"})
+
+    assert get_backend(ModelName.MINI_L6) == "int8"
+    assert get_backend(ModelName.MPNET) == config.EMBEDDING_DEFAULT_BACKEND
+
+    monkeypatch.setattr(config, "EMBEDDING_BACKENDS", {"all-MiniLM-L6-v2": "gpu"})
+    with pytest.raises(ValueError):
+        get_backend(ModelName.MINI_L6)
+
+
+def test_check_backends(monkeypatch, mocker):
+    monkeypatch.setattr(config, "EMBEDDING_DEFAULT_BACKEND", "torch")
+    monkeypatch.setattr(config, "EMBEDDING_BACKENDS", {"all-MiniLM-L6-v2": "onnx"})
+    find_spec = mocker.patch("src.services.inference.importlib.util.find_spec")
+
+    check_backends()
+
+    find_spec.side_effect = lambda name: None if name == "onnxruntime" else object()
+    with pytest.raises(RuntimeError, match="--extras onnx"):
+        check_backends()
+
+    monkeypatch.setattr(config, "EMBEDDING_BACKENDS", {"all-MiniLM-L6-v2": "gpu"})
+    with pytest.raises(ValueError):
+        check_backends()
@@ -0,0 +1,226 @@
+import asyncio
+import io
+import time
+
+import numpy as np
+import pytest
+
+from src.models.embedding import ModelName
+from src.models.jobs import JobStatus
+from src.services.jobs import JobQueue, JobRunner, iter_corpus
+from src.services.results import JobResults
+
+
+class FakeExecutor:
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+class FakeService:
+    """Deterministic low-rank vectors so projections are stable."""
+
+    def __init__(self):
+        self.executor = FakeExecutor()
+        self.embedded = []
+
+    async def embed(self, keywords):
+        self.embedded.extend(keywords)
+        return np.array(
+            [[len(word), word.count("a"), word.count("b"), 1.0] for word in keywords],
+            dtype=np.float32,
+        )
+
+    embed_bulk = embed
+
+
+def corpus(*keywords):
+    return io.BytesIO("".join(f'"{keyword}"\n' for keyword in keywords).encode())
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path, chunk_size=3)
+    yield queue
+    queue.close()
+
+
+def test_iter_corpus_formats():
+    assert list(iter_corpus(['"a"\n', "\n", '{"keyword": "b"}\n'], False)) == ["a", "b"]
+    assert list(iter_corpus(["id,keyword\n", "1,a\n", "2,b\n"], True)) == ["a", "b"]
+    assert list(iter_corpus(["a,1\n", "b,2\n"], True)) == ["a", "b"]
+
+
+class TestJobQueue:
+    def test_submit_and_claim(self, queue):
+        job = queue.submit(ModelName.MINI_L6, corpus("a", "b", "c"), False, 100)
+
+        assert job.status == JobStatus.QUEUED
+        assert job.total == 3
+        assert (queue.job_dir(job.id) / "keywords.jsonl").read_text().count("\n") == 3
+
+        row = queue.claim()
+        assert row["id"] == job.id
+        assert queue.get(job.id).status == JobStatus.RUNNING
+        assert queue.claim() is None
+
+    def test_submit_rejects_bad_corpus(self, queue, tmp_path):
+        with pytest.raises(ValueError, match="At least 2 keywords"):
+            queue.submit(ModelName.MINI_L6, corpus("a"), False, 100)
+        with pytest.raises(ValueError, match="At most 2 keywords"):
+            queue.submit(ModelName.MINI_L6, corpus("a", "b", "c"), False, 2)
+
+        assert [path.name for path in tmp_path.iterdir() if path.is_dir()] == []
+
+    def test_progress_survives_reopen(self, queue, tmp_path, mocker):
+        job = queue.submit(ModelName.MINI_L6, corpus(*"abcdefg"), False, 100)
+        queue.claim()
+        queue.advance(job.id, 2)
+        queue.close()
+
+        reopened = JobQueue(tmp_path, chunk_size=3)
+        # The dead worker's lease has to run out first
+        assert reopened.requeue_expired() == 0
+        mocker.patch("src.services.jobs.time.time", return_value=time.time() + 61)
+        assert reopened.requeue_expired() == 1
+        job = reopened.get(job.id)
+        reopened.close()
+
+        assert job.status == JobStatus.QUEUED
+        assert job.processed == 6
+
+    def test_live_lease_is_not_taken_over(self, queue, tmp_path, mocker):
+        job = queue.submit(ModelName.MINI_L6, corpus(*"abcdefg"), False, 100)
+        queue.claim()
+        other = JobQueue(tmp_path, chunk_size=3)
+
+        assert other.requeue_expired() == 0
+        assert other.claim() is None
+
+        mocker.patch("src.services.jobs.time.time", return_value=time.time() + 61)
+        assert other.claim()["id"] == job.id
+        assert not queue.advance(job.id, 1)
+        assert not queue.renew(job.id)
+        other.close()
+
+
+class TestJobRunner:
+    @pytest.mark.asyncio
+    async def test_run_job_writes_results(self, queue):
+        words = ["a", "ab", "bb", "aab", "bba", "abab", "b"]
+        job = queue.submit(ModelName.MINI_L6, corpus(*words), False, 100)
+        service = FakeService()
+        runner = JobRunner(queue, lambda model: service, lambda model: None)
+
+        await runner.run_job(queue.claim())
+        queue.finish(job.id, JobStatus.COMPLETED)
+
+        directory = queue.job_dir(job.id)
+        vectors = np.load(directory / "vectors.npy")
+        coordinates = np.load(directory / "coordinates.npy")
+        assert service.embedded == words
+        np.testing.assert_array_equal(vectors, await FakeService().embed_bulk(words))
+        assert coordinates.shape == (7, 2)
+        assert coordinates.min() == 0.0 and coordinates.max() == 1.0
+        job = queue.get(job.id)
+        assert job.processed == 7
+        assert {"vectors.npy", "coordinates.npy"} <= set(job.results)
+
+    @pytest.mark.asyncio
+    async def test_run_job_resumes_after_last_chunk(self, queue):
+        words = ["a", "ab", "bb", "aab", "bba", "abab", "b"]
+        job = queue.submit(ModelName.MINI_L6, corpus(*words), False, 100)
+        first = FakeService()
+        runner = JobRunner(queue, lambda model: first, lambda model: None)
+        # Simulate a run interrupted after the first chunk
+        queue.claim()
+        vectors = await first.embed_bulk(words[:3])
+        JobResults(queue.job_dir(job.id), 7).write_vectors(0, vectors)
+        queue.advance(job.id, 1)
+        queue.release_claims()
+
+        second = FakeService()
+        runner.acquire = lambda model: second
+        row = queue.claim()
+        await runner.run_job(row)
+
+        assert second.embedded == words[3:]
+        np.testing.assert_array_equal(
+            np.load(queue.job_dir(job.id) / "vectors.npy"),
+            await FakeService().embed_bulk(words),
+        )
+
+    @pytest.mark.asyncio
+    async def test_workers_complete_and_fail_jobs(self, queue):
+        done = queue.submit(ModelName.MINI_L6, corpus("a", "ab", "b"), False, 100)
+        failed = queue.submit(ModelName.MPNET, corpus("a", "b"), False, 100)
+
+        def acquire(model):
+            if model == ModelName.MPNET:
+                raise RuntimeError("model unavailable")
+            return FakeService()
+
+        runner = JobRunner(queue, acquire, lambda model: None, poll_interval_s=0.01)
+        runner.start()
+        for _ in range(200):
+            if queue.get(failed.id).status == JobStatus.FAILED:
+                break
+            await asyncio.sleep(0.01)
+        await runner.stop()
+
+        assert queue.get(done.id).status == JobStatus.COMPLETED
+        assert queue.get(failed.id).error == "model unavailable"
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_queue_errors(self, queue, monkeypatch, mocker):
+        failed = queue.submit(ModelName.MPNET, corpus("a", "b"), False, 100)
+        done = queue.submit(ModelName.MINI_L6, corpus("a", "ab", "b"), False, 100)
+
+        def fail_once(method, error):
+            errors = [error]
+
+            def call(*args):
+                if errors:
+                    raise errors.pop()
+                return method(*args)
+
+            return call
+
+        monkeypatch.setattr(
+            queue, "claim", fail_once(queue.claim, OSError("database is locked"))
+        )
+        # Reporting the first job's failure fails as well
+        monkeypatch.setattr(
+            queue, "finish", fail_once(queue.finish, OSError("disk full"))
+        )
+        logger = mocker.patch("src.services.jobs.logger")
+
+        def acquire(model):
+            if model == ModelName.MPNET:
+                raise RuntimeError("model unavailable")
+            return FakeService()
+
+        runner = JobRunner(queue, acquire, lambda model: None, poll_interval_s=0.001)
+        runner.start()
+        for _ in range(200):
+            if queue.get(done.id).status == JobStatus.COMPLETED:
+                break
+            await asyncio.sleep(0.01)
+        await runner.stop()
+
+        assert queue.get(done.id).status == JobStatus.COMPLETED
+        assert queue.get(failed.id).status == JobStatus.QUEUED
+        errors = " ".join(call.args[0] for call in logger.error.call_args_list)
+        assert "database is locked" in errors and "disk full" in errors
+
+    @pytest.mark.asyncio
+    async def test_parquet_results(self, queue):
+        pq = pytest.importorskip("pyarrow.parquet")
+        words = ["a", "ab", "bb", "aab"]
+        job = queue.submit(ModelName.MINI_L6, corpus(*words), False, 100)
+        runner = JobRunner(queue, lambda model: FakeService(), lambda model: None)
+
+        await runner.run_job(queue.claim())
+
+        table = pq.read_table(queue.job_dir(job.id) / "results.parquet")
+        assert table.column("keyword").to_pylist() == words
+        assert len(table.column("vector")[0]) == 4
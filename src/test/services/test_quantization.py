@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.services.quantization import (
+    CalibrationStore,
+    calibrate,
+    hamming_distances,
+    quantize_binary,
+    quantize_int8,
+    truncate,
+)
+
+
+@pytest.fixture
+def vectors():
+    vectors = np.random.default_rng(0).standard_normal((50, 16)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_quantize_int8_uses_full_range(vectors):
+    ranges = calibrate(vectors)
+
+    quantized = quantize_int8(vectors, ranges)
+
+    assert quantized.dtype == np.int8
+    assert quantized.min(axis=0).tolist() == [-128] * 16
+    assert quantized.max(axis=0).tolist() == [127] * 16
+    # Dequantizing is accurate to half a step
+    steps = (ranges[1] - ranges[0]) / 255
+    restored = (quantized.astype(np.float32) + 128) * steps + ranges[0]
+    assert np.all(np.abs(restored - vectors) <= steps / 2 + 1e-6)
+
+
+def test_quantize_int8_clips_out_of_range(vectors):
+    ranges = calibrate(vectors[:10])
+
+    quantized = quantize_int8(vectors * 10, ranges)
+
+    assert quantized.min() == -128 and quantized.max() == 127
+
+
+def test_quantize_binary_packs_sign_bits():
+    vectors = np.array([[1.0, -1, 0.5, -0.5, 2, 0, 0, 3, -1, 1]])
+
+    packed = quantize_binary(vectors)
+
+    assert packed.dtype == np.uint8
+    assert packed.tolist() == [[0b10101001, 0b01000000]]
+
+
+def test_hamming_distances(vectors):
+    packed = quantize_binary(vectors)
+
+    distances = hamming_distances(packed[:3], packed)
+
+    expected = [[int(np.sum((a > 0) != (b > 0))) for b in vectors] for a in vectors[:3]]
+    assert distances.tolist() == expected
+
+
+def test_truncate_renormalizes(vectors):
+    truncated = truncate(vectors, 4)
+
+    assert truncated.shape == (50, 4)
+    np.testing.assert_allclose(np.linalg.norm(truncated, axis=1), 1, rtol=1e-6)
+    assert truncate(vectors, None) is vectors
+    assert truncate(vectors, 64) is vectors
+
+
+def test_calibration_store_persists(tmp_path, vectors):
+    ranges = calibrate(vectors)
+    CalibrationStore(tmp_path).put("model-16d", ranges)
+
+    loaded = CalibrationStore(tmp_path).get("model-16d")
+
+    np.testing.assert_array_equal(loaded, ranges)
+    assert CalibrationStore().get("model-16d") is None
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from src.services.reduction import (
+    IncrementalPCA,
+    NumpyReducer,
+    Reducer,
+    RunningMinMax,
+    SklearnReducer,
+    get_reducer,
+    randomized_components,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(42)
+
+
+def structured_embeddings(rng, shape, dtype):
+    """Low-rank data with well separated leading components, like real embeddings."""
+    n_samples, n_features = shape
+    rank = min(4, n_features)
+    latent = (
+        rng.standard_normal((n_samples, rank)) * np.array([8.0, 4.0, 2.0, 1.0])[:rank]
+    )
+    basis = np.linalg.qr(rng.standard_normal((n_features, rank)))[0].T
+    noise = 0.01 * rng.standard_normal(shape)
+    return (latent @ basis + noise).astype(dtype)
+
+
+class TestNumpyReducer:
+    @pytest.mark.parametrize(
+        "shape,dtype",
+        [
+            ((2, 384), np.float32),
+            ((3, 4), np.float64),
+            ((100, 384), np.float32),
+            ((100, 768), np.float64),
+            # Tall inputs take the covariance path
+            ((500, 16), np.float64),
+            ((384, 384), np.float32),
+            ((1000, 384), np.float32),
+        ],
+    )
+    def test_matches_sklearn(self, rng, shape, dtype):
+        embeddings = structured_embeddings(rng, shape, dtype)
+        numpy_reducer, sklearn_reducer = NumpyReducer(), SklearnReducer()
+        # Two centered points span a single direction, the second axis is noise
+        columns = slice(0, 1) if shape[0] == 2 else slice(0, 2)
+
+        reduced = numpy_reducer.reduce(embeddings)
+        expected = sklearn_reducer.reduce(embeddings)
+        atol = 1e-4 if dtype == np.float32 else 1e-6
+
+        assert reduced.dtype == expected.dtype
+        np.testing.assert_allclose(reduced[:, columns], expected[:, columns], atol=atol)
+        np.testing.assert_allclose(
+            numpy_reducer.normalize(reduced)[:, columns],
+            sklearn_reducer.normalize(expected)[:, columns],
+            atol=atol,
+        )
+
+    def test_normalize_value_range_and_constant_columns(self):
+        values = np.array([[1.0, 5.0], [3.0, 5.0], [2.0, 5.0]])
+
+        normalized = NumpyReducer().normalize(values, value_range=(-1, 1))
+
+        np.testing.assert_allclose(normalized[:, 0], [-1.0, 1.0, 0.0])
+        np.testing.assert_allclose(normalized[:, 1], [-1.0, -1.0, -1.0])
+        assert values[0, 0] == 1.0
+
+    def test_normalize_integer_input(self):
+        normalized = NumpyReducer().normalize(np.array([[1, 2], [3, 4], [5, 6]]))
+
+        np.testing.assert_allclose(normalized, [[0, 0], [0.5, 0.5], [1, 1]])
+
+    def test_too_few_samples(self):
+        with pytest.raises(ValueError):
+            NumpyReducer().reduce(np.ones((1, 8)))
+
+    def test_randomized_path_for_large_inputs(self, rng):
+        embeddings = rng.standard_normal((400, 64))
+        embeddings[:, 0] *= 10
+        embeddings[:, 1] *= 5
+
+        reduced = NumpyReducer(randomized_min_dim=1).reduce(embeddings)
+        expected = SklearnReducer().reduce(embeddings)
+
+        np.testing.assert_allclose(reduced, expected, atol=1e-5)
+
+    def test_randomized_components_are_deterministic(self, rng):
+        centered = rng.standard_normal((50, 20))
+
+        np.testing.assert_array_equal(
+            randomized_components(centered, 2), randomized_components(centered, 2)
+        )
+
+
+class TestIncrementalPCA:
+    def test_matches_exact_pca(self, rng):
+        embeddings = structured_embeddings(rng, (1000, 64), np.float64)
+        pca = IncrementalPCA(n_components=2)
+        for start in range(0, len(embeddings), 97):
+            pca.partial_fit(embeddings[start : start + 97])
+
+        expected = SklearnReducer().reduce(embeddings)
+
+        np.testing.assert_allclose(pca.transform(embeddings), expected, atol=1e-6)
+        np.testing.assert_allclose(pca.mean, embeddings.mean(axis=0), atol=1e-12)
+
+    def test_first_batch_smaller_than_n_components(self, rng):
+        embeddings = structured_embeddings(rng, (50, 16), np.float64)
+        pca = IncrementalPCA(n_components=2).partial_fit(embeddings[:1])
+        pca.partial_fit(embeddings[1:])
+
+        assert pca.transform(embeddings).shape == (50, 2)
+
+    def test_transform_before_enough_samples(self, rng):
+        pca = IncrementalPCA(n_components=2).partial_fit(np.ones((1, 4)))
+
+        with pytest.raises(ValueError, match="n_components=2"):
+            pca.transform(np.ones((1, 4)))
+
+
+def test_running_min_max_matches_batch_normalize(rng):
+    values = rng.standard_normal((100, 2))
+    bounds = RunningMinMax()
+    for start in range(0, 100, 30):
+        bounds.update(values[start : start + 30])
+
+    np.testing.assert_allclose(
+        bounds.normalize(values), NumpyReducer().normalize(values)
+    )
+
+
+def test_get_reducer():
+    assert isinstance(get_reducer("numpy"), NumpyReducer)
+    assert isinstance(get_reducer("sklearn"), SklearnReducer)
+    with pytest.raises(ValueError):
+        get_reducer("unknown")
+
+
+def test_reducer_is_abstract():
+    with pytest.raises(TypeError):
+        Reducer()
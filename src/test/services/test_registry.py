@@ -0,0 +1,126 @@
+import pytest
+
+from src.models.embedding import ModelName
+from src.services.registry import ModelRegistry
+
+
+class FakeService:
+    def __init__(self, model):
+        self.model_name = model
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def use(registry, model):
+    """Acquire and release the model, as one request would."""
+    service = registry.acquire(model)
+    registry.release(model)
+    return service
+
+
+@pytest.fixture
+def footprints(monkeypatch):
+    """Make every load grow RSS by the configured number of bytes."""
+    sizes = {ModelName.MINI_L6: 100, ModelName.MINI_L12: 200, ModelName.MPNET: 400}
+    rss = {"value": 0}
+    loading = {}
+
+    def factory(model):
+        rss["value"] += sizes[model]
+        loading[model] = FakeService(model)
+        return loading[model]
+
+    monkeypatch.setattr("src.services.registry.rss_bytes", lambda: rss["value"])
+    return factory
+
+
+class TestModelRegistry:
+    def test_loads_once_and_tracks_footprint(self, footprints):
+        registry = ModelRegistry(budget_bytes=1000, factory=footprints)
+
+        first = use(registry, ModelName.MINI_L6)
+        second = use(registry, ModelName.MINI_L6)
+
+        assert first is second
+        stats = registry.get_stats()
+        assert stats["loads"] == 1
+        assert stats["resident"]["all-MiniLM-L6-v2"]["footprint_bytes"] == 100
+
+    def test_evicts_least_recently_used_over_budget(self, footprints):
+        registry = ModelRegistry(budget_bytes=350, factory=footprints)
+
+        l6 = use(registry, ModelName.MINI_L6)
+        use(registry, ModelName.MINI_L12)
+        use(registry, ModelName.MINI_L6)
+        use(registry, ModelName.MPNET)
+
+        stats = registry.get_stats()
+        assert list(stats["resident"]) == ["all-mpnet-base-v2"]
+        assert stats["evictions"] == 2
+        assert l6.closed
+
+    def test_busy_model_is_not_evicted_until_released(self, footprints):
+        registry = ModelRegistry(budget_bytes=450, factory=footprints)
+
+        l6 = registry.acquire(ModelName.MINI_L6)
+        use(registry, ModelName.MPNET)
+
+        assert not l6.closed
+        assert "all-MiniLM-L6-v2" in registry.get_stats()["resident"]
+
+        registry.release(ModelName.MINI_L6)
+
+        assert l6.closed
+        assert list(registry.get_stats()["resident"]) == ["all-mpnet-base-v2"]
+
+    def test_reload_after_eviction(self, footprints):
+        registry = ModelRegistry(budget_bytes=100, factory=footprints)
+
+        first = use(registry, ModelName.MINI_L6)
+        use(registry, ModelName.MINI_L12)
+        second = use(registry, ModelName.MINI_L6)
+
+        assert first is not second
+        assert registry.loads == 3
+
+    def test_acquire_loaded_never_loads(self, footprints):
+        registry = ModelRegistry(budget_bytes=1000, factory=footprints)
+
+        assert registry.acquire_loaded(ModelName.MINI_L6) is None
+        assert registry.loads == 0
+
+        service = use(registry, ModelName.MINI_L6)
+        assert registry.acquire_loaded(ModelName.MINI_L6) is service
+        assert registry.get_stats()["resident"]["all-MiniLM-L6-v2"]["in_flight"] == 1
+        registry.release(ModelName.MINI_L6)
+
+    def test_clear_closes_everything(self, footprints):
+        registry = ModelRegistry(budget_bytes=1000, factory=footprints)
+        service = use(registry, ModelName.MINI_L6)
+
+        registry.clear()
+
+        assert service.closed
+        assert registry.get_stats()["resident"] == {}
+
+    def test_concurrent_acquire_cannot_evict_a_model_being_loaded(self, footprints):
+        registry = ModelRegistry(budget_bytes=0, factory=footprints)
+        load = registry._load
+
+        def load_then_race(model):
+            entry = load(model)
+            # Another request lands between the load and the caller's return
+            if model == ModelName.MINI_L6:
+                use(registry, ModelName.MINI_L12)
+            return entry
+
+        registry._load = load_then_race
+
+        l6 = registry.acquire(ModelName.MINI_L6)
+
+        assert not l6.closed
+        assert registry.get_stats()["resident"]["all-MiniLM-L6-v2"]["in_flight"] == 1
+        registry.release(ModelName.MINI_L6)
+        assert l6.closed
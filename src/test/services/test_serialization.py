@@ -0,0 +1,113 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.models.embedding import EmbeddedKeyword, Embeddings, Keywords
+from src.services import serialization
+from src.services.serialization import (
+    JSONBody,
+    dumps,
+    render_columnar,
+    render_embeddings,
+    render_packed,
+)
+
+
+def test_render_embeddings_matches_pydantic_schema():
+    keywords = ["tree", "forest", "leaf"]
+    points = [[0.0, 1.0], [0.25, 0.5], [1.0, 0.0]]
+
+    rendered = json.loads(render_embeddings(keywords, points))
+
+    expected = Embeddings(
+        keywords=[
+            EmbeddedKeyword(word=word, x=x, y=y)
+            for word, (x, y) in zip(keywords, points)
+        ]
+    ).model_dump()
+    assert rendered == expected
+    assert Embeddings.model_validate(rendered) == Embeddings.model_validate(expected)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_with_and_without_orjson(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert json.loads(dumps({"word": "café", "x": 0.5})) == {"word": "café", "x": 0.5}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_render_columnar(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    points = np.array([[0.0, 1.0], [0.25, 0.5], [1.0, 1 / 3]])
+
+    rendered = json.loads(render_columnar(["tree", "forest", "leaf"], points))
+
+    assert rendered == {
+        "words": ["tree", "forest", "leaf"],
+        "x": [0.0, 0.25, 1.0],
+        "y": [1.0, 0.5, 1 / 3],
+    }
+
+
+def test_render_packed_round_trips_as_float32():
+    points = np.array([[0.0, 1.0], [0.25, 0.5], [1.0, 1 / 3]])
+
+    rendered = json.loads(render_packed(["tree", "forest", "leaf"], points))
+
+    assert rendered["words"] == ["tree", "forest", "leaf"]
+    assert rendered["dtype"] == "float32"
+    for key, column in (("x", points[:, 0]), ("y", points[:, 1])):
+        decoded = np.frombuffer(base64.b64decode(rendered[key]), dtype="<f4")
+        np.testing.assert_array_equal(decoded, column.astype(np.float32))
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"keywords": []}',
+        b'{"keywords": "not a list"}',
+        b'{"keywords": [1, 2]}',
+        b'{"other": 1}',
+    ],
+)
+def test_json_body_errors_match_fastapi(body):
+    keywords_body = JSONBody(Keywords)
+    app = FastAPI()
+
+    @app.post("/fast")
+    async def fast_route(request: Request):
+        keywords_body.parse(await request.body())
+
+    @app.post("/pydantic")
+    async def pydantic_route(keywords: Keywords):
+        pass
+
+    client = TestClient(app)
+    fast = client.post("/fast", content=body)
+    reference = client.post("/pydantic", content=body)
+
+    assert fast.status_code == reference.status_code == 422
+    # JSON-mode messages may word things differently ("array" vs "list")
+    assert [
+        (error["loc"], error["type"], error["input"]) for error in fast.json()["detail"]
+    ] == [
+        (error["loc"], error["type"], error["input"])
+        for error in reference.json()["detail"]
+    ]
+
+
+def test_json_body_parses_valid_input():
+    parsed = JSONBody(Keywords).parse(b'{"keywords": ["a", "b"]}')
+
+    assert parsed == Keywords(keywords=["a", "b"])
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from src.models.embedding import ModelName
+from src.services.sharedCache import SharedEmbeddingCache
+from src.services.sharedCache.backends import (
+    RedisSharedCacheBackend,
+    SharedCacheBackend,
+    ValkeySharedCacheBackend,
+)
+from src.test.conftest import DummySharedCacheBackend
+
+
+class FailingBackend(SharedCacheBackend):
+    async def mget(self, keys):
+        raise ConnectionError("down")
+
+    async def mset(self, items, ttl):
+        raise ConnectionError("down")
+
+
+@pytest_asyncio.fixture
+async def shared_cache():
+    backend = DummySharedCacheBackend()
+    await SharedEmbeddingCache.init(backend, namespace="test-v1", ttl=60)
+    yield backend
+    await SharedEmbeddingCache.close()
+
+
+@pytest.mark.asyncio
+async def test_round_trip_as_float16(shared_cache):
+    vectors = np.array([[0.1, 0.2, 0.3], [1.0, -1.0, 0.5]], dtype=np.float32)
+    await SharedEmbeddingCache.put_many(ModelName.MINI_L6, ["a", "b"], vectors)
+
+    found = await SharedEmbeddingCache.get_many(ModelName.MINI_L6, ["b", "c", "a"])
+
+    assert found[1] is None
+    assert found[0].dtype == np.float32
+    np.testing.assert_allclose(found[0], vectors[1], atol=1e-3)
+    np.testing.assert_allclose(found[2], vectors[0], atol=1e-3)
+    assert all(len(blob) == 3 * 2 for blob in shared_cache.store.values())
+    assert set(shared_cache.ttls.values()) == {60}
+    assert SharedEmbeddingCache.hits == 2
+    assert SharedEmbeddingCache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_key_is_namespaced_by_version_and_model(shared_cache):
+    key = SharedEmbeddingCache.key(ModelName.MINI_L6, "hello")
+
+    assert key.startswith("embedding:test-v1:all-MiniLM-L6-v2:")
+    assert key != SharedEmbeddingCache.key(ModelName.MPNET, "hello")
+
+
+@pytest.mark.asyncio
+async def test_disabled_without_backend():
+    assert SharedEmbeddingCache.backend is None
+    assert await SharedEmbeddingCache.get_many(ModelName.MINI_L6, ["a"]) == [None]
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_treated_as_misses():
+    await SharedEmbeddingCache.init(FailingBackend())
+    try:
+        found = await SharedEmbeddingCache.get_many(ModelName.MINI_L6, ["a"])
+        await SharedEmbeddingCache.put_many(
+            ModelName.MINI_L6, ["a"], np.zeros((1, 2), dtype=np.float32)
+        )
+    finally:
+        errors = SharedEmbeddingCache.errors
+        await SharedEmbeddingCache.close()
+
+    assert found == [None]
+    assert errors == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_pipelines_writes(mocker):
+    redis_mock = mocker.MagicMock()
+    redis_mock.mget = mocker.AsyncMock(return_value=[b"x", None])
+    pipe = mocker.MagicMock()
+    pipe.execute = mocker.AsyncMock()
+    redis_mock.pipeline.return_value.__aenter__ = mocker.AsyncMock(return_value=pipe)
+    redis_mock.pipeline.return_value.__aexit__ = mocker.AsyncMock(return_value=None)
+    backend = RedisSharedCacheBackend(redis_mock)
+
+    assert await backend.mget(["k1", "k2"]) == [b"x", None]
+    await backend.mset({"k1": b"a", "k2": b"b"}, ttl=30)
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    pipe.set.assert_any_call("k1", b"a", ex=30)
+    pipe.set.assert_any_call("k2", b"b", ex=30)
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_valkey_backend_pipelines_writes(mocker):
+    valkey_mock = mocker.Mock()
+    valkey_mock.mget.return_value = [None]
+    backend = ValkeySharedCacheBackend(valkey_mock)
+
+    assert await backend.mget(["k1"]) == [None]
+    await backend.mset({"k1": b"a"}, ttl=30)
+
+    pipe = valkey_mock.pipeline.return_value
+    pipe.set.assert_called_once_with("k1", b"a", ex=30)
+    pipe.execute.assert_called_once()
@@ -0,0 +1,79 @@
+import io
+
+import numpy as np
+import pytest
+
+from src.services.similarity import (
+    block_rows,
+    dense_similarity,
+    iter_similarity_blocks,
+    sparse_similarity,
+)
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).standard_normal((50, 8))
+
+
+@pytest.fixture
+def expected(vectors):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return normalized @ normalized.T
+
+
+def test_block_rows_respects_budget():
+    assert block_rows(1000, 64 * 4000) == 64
+    assert block_rows(10**6, 1) == 1
+
+
+def test_blocks_cover_all_rows(vectors):
+    blocks = list(iter_similarity_blocks(vectors, block_bytes=7 * 4 * 50))
+
+    assert [start for start, _ in blocks] == list(range(0, 50, 7))
+    assert all(block.dtype == np.float32 for _, block in blocks)
+
+
+def test_dense_similarity(vectors, expected):
+    body = dense_similarity(vectors, block_bytes=4 * 4 * 50)
+
+    matrix = np.load(io.BytesIO(body))
+    assert matrix.dtype == np.float16
+    np.testing.assert_allclose(matrix, expected, atol=1e-3)
+
+
+def test_sparse_similarity_threshold(vectors, expected):
+    rows, cols, scores = sparse_similarity(vectors, threshold=0.5, block_bytes=400)
+
+    i, j = np.nonzero(np.triu(expected >= 0.5, k=1))
+    assert sorted(zip(rows, cols)) == sorted(zip(i, j))
+    np.testing.assert_allclose(scores, expected[rows, cols], rtol=1e-5)
+
+
+def test_sparse_similarity_top_k(vectors, expected):
+    rows, cols, scores = sparse_similarity(vectors, top_k=3, block_bytes=400)
+
+    np.fill_diagonal(expected, -np.inf)
+    best = np.argsort(-expected, axis=1)[:, :3]
+    np.testing.assert_array_equal(rows, np.repeat(np.arange(50), 3))
+    np.testing.assert_array_equal(cols.reshape(50, 3), best)
+    assert np.all(np.diff(scores.reshape(50, 3), axis=1) <= 0)
+
+
+def test_sparse_similarity_top_k_above_threshold(vectors, expected):
+    rows, cols, scores = sparse_similarity(vectors, threshold=0.6, top_k=3)
+
+    assert np.all(scores >= 0.6)
+    assert np.all(np.bincount(rows, minlength=50) <= 3)
+    assert not np.any(rows == cols)
+
+
+def test_sparse_similarity_max_pairs(vectors, expected):
+    kept = int(np.triu(expected >= 0.0, k=1).sum())
+
+    rows, _, _ = sparse_similarity(vectors, threshold=0.0, max_pairs=kept)
+    assert len(rows) == kept
+    with pytest.raises(ValueError, match="raise it or set top_k"):
+        sparse_similarity(vectors, threshold=0.0, block_bytes=400, max_pairs=kept - 1)
+    with pytest.raises(ValueError, match="top_k=3"):
+        sparse_similarity(vectors, top_k=3, max_pairs=149)
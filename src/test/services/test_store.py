@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from src.services.store import EmbeddingStore
+
+
+def vectors(n, dim=3):
+    return np.arange(n * dim, dtype=np.float32).reshape(n, dim)
+
+
+class TestEmbeddingStore:
+    def test_empty_store_misses(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+
+        assert store.get_many(["a"]) == [None]
+
+    def test_append_and_lookup(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.append(["a", "b"], vectors(2))
+
+        found = store.get_many(["b", "missing", "a"])
+
+        assert found[1] is None
+        np.testing.assert_array_equal(found[0], vectors(2)[1])
+        np.testing.assert_array_equal(found[2], vectors(2)[0])
+        assert isinstance(found[0].base, np.memmap) or isinstance(found[0], np.memmap)
+
+    def test_survives_reopen(self, tmp_path):
+        EmbeddingStore(tmp_path).append(["a", "b"], vectors(2))
+
+        reopened = EmbeddingStore(tmp_path)
+
+        np.testing.assert_array_equal(reopened.get_many(["b"])[0], vectors(2)[1])
+        assert len(reopened) == 2
+        assert reopened.dim == 3
+
+    def test_sees_appends_from_other_instances(self, tmp_path):
+        reader = EmbeddingStore(tmp_path)
+        writer = EmbeddingStore(tmp_path)
+        writer.append(["a"], vectors(1))
+        reader.get_many(["a"])
+        writer.append(["b"], vectors(2)[1:])
+
+        np.testing.assert_array_equal(reader.get_many(["b"])[0], vectors(2)[1])
+
+    def test_skips_known_and_duplicate_texts(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.append(["a", "a"], vectors(2))
+        store.append(["a", "b"], vectors(2) + 10)
+
+        assert len(store) == 2
+        np.testing.assert_array_equal(store.get_many(["a"])[0], vectors(1)[0])
+        assert store.vectors_path.stat().st_size == 2 * 3 * 4
+
+    def test_recovers_from_partial_write(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.append(["a"], vectors(1))
+        # Simulate a writer dying between the vector and index writes
+        with open(store.vectors_path, "ab") as f:
+            f.write(b"\x00" * 12)
+
+        store.append(["b"], vectors(2)[1:])
+
+        np.testing.assert_array_equal(store.get_many(["b"])[0], vectors(2)[1])
+
+    def test_lookups_across_merges(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        texts = [f"text-{i}" for i in range(300)]
+        for start in range(0, 300, 7):
+            store.append(texts[start : start + 7], vectors(300)[start : start + 7])
+            assert len(store._tail_rows) * 8 <= len(store._rows)
+
+        reopened = EmbeddingStore(tmp_path)
+        for found in (store.get_many(texts), reopened.get_many(texts)):
+            np.testing.assert_array_equal(np.stack(found), vectors(300))
+        assert store.get_many(["text-300"]) == [None]
+
+    def test_first_row_wins_for_a_repeated_hash(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.append(["a", "b"], vectors(2))
+        # A duplicate hash, as a colliding text would leave behind
+        with open(store.vectors_path, "ab") as f:
+            f.write(vectors(3)[2].tobytes())
+        with open(store.index_path, "ab") as f:
+            f.write(np.fromfile(store.index_path, dtype="<u8")[:1].tobytes())
+
+        np.testing.assert_array_equal(store.get_many(["a"])[0], vectors(1)[0])
+        assert len(EmbeddingStore(tmp_path)) == 3
+
+    def test_rejects_dimension_mismatch(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.append(["a"], vectors(1))
+
+        with pytest.raises(ValueError):
+            store.append(["b"], vectors(1, dim=4))
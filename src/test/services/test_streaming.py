@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from src.services.basis import ProjectionBasis
+from src.services.ndjson import iter_ndjson_keywords, parse_keyword
+from src.services.reduction import NumpyReducer
+from src.services.streaming import StreamingProjection, iter_ndjson_points
+
+
+async def as_stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def low_rank_vectors(n_samples, n_features=32, seed=0):
+    rng = np.random.default_rng(seed)
+    latent = rng.standard_normal((n_samples, 3)) * np.array([6.0, 3.0, 1.0])
+    return latent @ rng.standard_normal((3, n_features))
+
+
+def test_parse_keyword():
+    assert parse_keyword(b'"apple"') == "apple"
+    assert parse_keyword(b'{"keyword": "pear"}') == "pear"
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        parse_keyword(b"apple")
+    with pytest.raises(ValueError, match="must be a string"):
+        parse_keyword(b'{"word": "pear"}')
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_keywords_across_chunk_boundaries():
+    stream = as_stream(b'"ap', b'ple"\n\n{"keyword": ', b'"pear"}\n"fig"')
+
+    keywords = [keyword async for keyword in iter_ndjson_keywords(stream)]
+
+    assert keywords == ["apple", "pear", "fig"]
+
+
+class TestStreamingProjection:
+    def test_matches_in_memory_projection(self):
+        vectors = low_rank_vectors(1000)
+        keywords = [f"keyword\n{i}" for i in range(1000)]
+        projection = StreamingProjection(chunk_size=64)
+        for start in range(0, 1000, 64):
+            projection.add(keywords[start : start + 64], vectors[start : start + 64])
+        projection.finish()
+
+        rows = [row for chunk in projection.iter_rows() for row in chunk]
+        projection.close()
+
+        reducer = NumpyReducer()
+        expected = reducer.normalize(reducer.reduce(vectors.astype(np.float32)))
+        assert [word for word, _, _ in rows] == keywords
+        np.testing.assert_allclose([(x, y) for _, x, y in rows], expected, atol=1e-4)
+
+    def test_projects_onto_fixed_basis(self):
+        vectors = low_rank_vectors(300)
+        basis = ProjectionBasis.fit(vectors[:100])
+        keywords = [f"keyword {i}" for i in range(300)]
+        projection = StreamingProjection(chunk_size=64, basis=basis)
+        for start in range(0, 300, 64):
+            projection.add(keywords[start : start + 64], vectors[start : start + 64])
+        projection.finish()
+
+        rows = [row for chunk in projection.iter_rows() for row in chunk]
+        projection.close()
+
+        expected = basis.transform(vectors.astype(np.float32))
+        np.testing.assert_allclose([(x, y) for _, x, y in rows], expected, atol=1e-6)
+
+    def test_too_few_keywords(self):
+        projection = StreamingProjection(chunk_size=8)
+        projection.add(["only"], np.ones((1, 4)))
+
+        with pytest.raises(ValueError, match="At least 2 keywords"):
+            projection.finish()
+        projection.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_ndjson_points_closes_spool(self):
+        projection = StreamingProjection(chunk_size=2)
+        projection.add(["a", "b", "c"], low_rank_vectors(3, n_features=4))
+        projection.finish()
+
+        body = b"".join([chunk async for chunk in iter_ndjson_points(projection)])
+
+        lines = body.decode().splitlines()
+        assert len(lines) == 3
+        assert lines[0].startswith('{"word": "a", "x": ')
+        assert projection._points.closed
@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pytest
+
+from src.services.vectors import (
+    ARROW_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+    encode_arrow,
+    encode_npy,
+    negotiate_media_type,
+)
+
+
+@pytest.mark.parametrize(
+    "accept,expected",
+    [
+        (None, NPY_MEDIA_TYPE),
+        ("*/*", NPY_MEDIA_TYPE),
+        ("application/vnd.apache.arrow.stream", ARROW_MEDIA_TYPE),
+        (
+            "application/x-npy;q=0.5, application/vnd.apache.arrow.stream",
+            ARROW_MEDIA_TYPE,
+        ),
+        ("text/html, application/x-npy;q=0.9, */*;q=0.1", NPY_MEDIA_TYPE),
+    ],
+)
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+def test_negotiate_media_type_unsupported():
+    with pytest.raises(ValueError, match="Supported media types"):
+        negotiate_media_type("application/json")
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_encode_npy_round_trip(dtype):
+    vectors = np.random.default_rng(0).standard_normal((5, 8)).astype(np.float32)
+
+    decoded = np.load(io.BytesIO(encode_npy(vectors, dtype)))
+
+    assert decoded.dtype == np.dtype(dtype)
+    np.testing.assert_array_equal(decoded, vectors.astype(dtype))
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_encode_arrow_round_trip(dtype):
+    pa = pytest.importorskip("pyarrow")
+    vectors = np.random.default_rng(0).standard_normal((3, 4)).astype(np.float32)
+
+    table = pa.ipc.open_stream(encode_arrow(["a", "b", "c"], vectors, dtype)).read_all()
+
+    assert table.column("keyword").to_pylist() == ["a", "b", "c"]
+    decoded = np.array(table.column("vector").to_pylist(), dtype=dtype)
+    np.testing.assert_array_equal(decoded, vectors.astype(dtype))
@@ -0,0 +1,77 @@
+import pytest
+
+from src.models.embedding import ModelName
+from src.services.registry import ModelRegistry
+from src.services.warmup import warmup_models
+
+
+class FakeService:
+    def __init__(self, registry, model):
+        self.registry = registry
+        self.model = model
+        self.batches = []
+        self.pinned = []
+
+    async def encode_batch(self, texts):
+        stats = self.registry.get_stats()["resident"]
+        self.pinned.append(stats[self.model.value]["in_flight"])
+        self.batches.append(len(texts))
+
+    def close(self):
+        pass
+
+
+def fake_registry(monkeypatch, budget_bytes, sizes):
+    rss = {"value": 0}
+    services = {}
+
+    def factory(model):
+        rss["value"] += sizes[model]
+        services[model] = FakeService(registry, model)
+        return services[model]
+
+    monkeypatch.setattr("src.services.registry.rss_bytes", lambda: rss["value"])
+    registry = ModelRegistry(budget_bytes=budget_bytes, factory=factory)
+    return registry, services
+
+
+@pytest.mark.asyncio
+async def test_warmup_models_encodes_each_batch_size(monkeypatch):
+    registry, services = fake_registry(
+        monkeypatch, 2**30, {ModelName.MINI_L6: 2**20, ModelName.MPNET: 2**21}
+    )
+
+    timings = await warmup_models(
+        [ModelName.MINI_L6, ModelName.MPNET], [1, 4], registry
+    )
+
+    assert set(timings) == {"all-MiniLM-L6-v2", "all-mpnet-base-v2"}
+    assert set(timings["all-MiniLM-L6-v2"]) == {"load_s", "warmup_s", "footprint_mb"}
+    assert timings["all-mpnet-base-v2"]["footprint_mb"] == 2.0
+    assert services[ModelName.MINI_L6].batches == [1, 4]
+    assert services[ModelName.MPNET].batches == [1, 4]
+    # Pinned while warming up, released afterwards
+    assert services[ModelName.MINI_L6].pinned == [1, 1]
+    assert registry.get_stats()["resident"]["all-MiniLM-L6-v2"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_warmup_models_warns_over_budget(monkeypatch, mocker):
+    registry, _ = fake_registry(
+        monkeypatch, 250, {ModelName.MINI_L6: 200, ModelName.MPNET: 100}
+    )
+    logger = mocker.patch("src.services.warmup.logger")
+
+    await warmup_models([ModelName.MINI_L6, ModelName.MPNET], [1], registry)
+
+    assert "EMBEDDING_MODEL_MEMORY_BUDGET_MB" in logger.warning.call_args.args[0]
+    assert registry.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_models_propagates_load_failure():
+    def factory(model):
+        raise RuntimeError("load failed")
+
+    with pytest.raises(RuntimeError):
+        await warmup_models([ModelName.MINI_L6], [1], ModelRegistry(100, factory))
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src.services.workers import ProcessInferencePool
+
+
+class FakeModel:
+    def encode(self, texts):
+        return np.array([[len(text), 0.5] for text in texts], dtype=np.float64)
+
+
+def load_fake_model(model_name, backend):
+    return FakeModel()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProcessInferencePool(
+        "fake", processes=2, threads_per_process=1, loader=load_fake_model
+    )
+    yield pool
+    pool.shutdown()
+
+
+class TestProcessInferencePool:
+    @pytest.mark.asyncio
+    async def test_encode_round_trips_through_shared_memory(self, pool):
+        vectors = await pool.encode(["a", "bbb"])
+
+        assert vectors.dtype == np.float32
+        np.testing.assert_array_equal(vectors, [[1, 0.5], [3, 0.5]])
+
+    @pytest.mark.asyncio
+    async def test_encode_empty_batch(self, pool):
+        vectors = await pool.encode([])
+
+        assert vectors.shape[0] == 0
+
+    def test_stats(self, pool):
+        assert pool.get_stats() == {"processes": 2}
@@ -2,7 +2,18 @@ import pytest
 from fastapi import status
 from httpx import ASGITransport, AsyncClient
 
+from benchmarks.startup import measure_once
 from src.configs.env_config import config
+from src.main import app, get_shared_cache_backend, warmup
+from src.models.embedding import ModelName
+from src.security.rateLimiter.backends import (
+    RedisRateLimiterBackend,
+    ValkeyRateLimiterBackend,
+)
+from src.services.sharedCache.backends import (
+    RedisSharedCacheBackend,
+    ValkeySharedCacheBackend,
+)
 
 
 @pytest.mark.asyncio
@@ -83,3 +94,51 @@ async def test_error_handling(async_client):
     """Test custom error handling for non-existent endpoint"""
     response = await async_client.get("/non-existent-endpoint")
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_shared_cache_backend_reuses_limiter_connection(mocker):
+    """Test the shared embedding cache rides on the rate limiter connection"""
+    redis_client = mocker.Mock()
+    valkey_client = mocker.Mock()
+
+    redis_backend = get_shared_cache_backend(RedisRateLimiterBackend(redis_client))
+    valkey_backend = get_shared_cache_backend(ValkeyRateLimiterBackend(valkey_client))
+
+    assert isinstance(redis_backend, RedisSharedCacheBackend)
+    assert redis_backend.redis is redis_client
+    assert isinstance(valkey_backend, ValkeySharedCacheBackend)
+    assert valkey_backend.client is valkey_client
+
+
+@pytest.mark.asyncio
+async def test_ready_before_warmup(async_client, monkeypatch):
+    """Test readiness reports 503 until models are warmed up"""
+    monkeypatch.setattr(app.state, "ready", False, raising=False)
+    response = await async_client.get("/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"status": "starting"}
+
+
+@pytest.mark.asyncio
+async def test_ready_after_warmup(async_client, monkeypatch, mocker):
+    """Test warmup flags the app ready and reports model timings"""
+    monkeypatch.setattr(app.state, "ready", False, raising=False)
+    monkeypatch.setattr(config, "EMBEDDING_PRELOAD_MODELS", "all-MiniLM-L6-v2")
+    timings = {"all-MiniLM-L6-v2": {"load_s": 1.0, "warmup_s": 0.5}}
+    warmup_mock = mocker.patch(
+        "src.main.warmup_models", mocker.AsyncMock(return_value=timings)
+    )
+
+    await warmup(app)
+    response = await async_client.get("/ready")
+
+    assert warmup_mock.await_args.args[0] == [ModelName.MINI_L6]
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ready", "models": timings}
+
+
+def test_import_does_not_load_ml_stack():
+    """Test importing the app leaves torch and friends for the first model load"""
+    result = measure_once()
+
+    assert result["heavy"] == []